@@ -0,0 +1,152 @@
+# backend/app/core/executor.py
+
+import os
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import status
+
+logger = logging.getLogger(__name__)
+
+# Threads for work that releases the GIL (Arrow parsing, NumPy/pandas kernels, codecs)
+EXECUTOR_THREADS = int(os.getenv("EXECUTOR_THREADS", min(32, (os.cpu_count() or 1) + 4)))
+# Processes for pure-Python-heavy work that holds the GIL; 0 runs it on the thread pool.
+# Arguments and results are pickled across, so pass only what the task needs
+EXECUTOR_PROCESSES = int(os.getenv("EXECUTOR_PROCESSES", min(4, os.cpu_count() or 1)))
+EXECUTOR_QUEUE_SIZE = int(os.getenv("EXECUTOR_QUEUE_SIZE", 64))  # Tasks allowed to wait per pool before rejecting
+EXECUTOR_TIMEOUT = float(os.getenv("EXECUTOR_TIMEOUT", 120))  # Default per-task timeout in seconds
+
+
+class ExecutorError(Exception):
+    """Raised when a task is rejected, times out or loses its worker process."""
+    def __init__(
+        self,
+        message: str,
+        status_code: int = status.HTTP_503_SERVICE_UNAVAILABLE,
+        code: str = "SERVER_BUSY",
+        details: Optional[Dict] = None
+    ):
+        self.message = message
+        self.status_code = status_code
+        self.code = code
+        self.details = details
+        super().__init__(self.message)
+
+
+class _BoundedPool:
+    """
+    A lazily created executor that admits at most max_workers + queue_size tasks.
+    Slots are released when a task actually finishes, so timed-out tasks that are
+    still running keep counting against the bound.
+    """
+
+    def __init__(self, name: str, max_workers: int, factory: Callable[[], Executor]):
+        self.name = name
+        self.capacity = max_workers + EXECUTOR_QUEUE_SIZE
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._factory()
+        return self._executor
+
+    def _release(self, _: Future):
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, fn: Callable) -> Future:
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise ExecutorError(
+                    "Server is busy, please retry shortly",
+                    details={"pool": self.name, "pending": self._pending}
+                )
+            self._pending += 1
+        try:
+            future = self._get().submit(fn)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def reset(self):
+        """Shut down the executor (e.g. a broken process pool); the next task creates a fresh one."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": self._pending, "capacity": self.capacity}
+
+
+_threads = _BoundedPool(
+    "threads",
+    EXECUTOR_THREADS,
+    lambda: ThreadPoolExecutor(max_workers=EXECUTOR_THREADS, thread_name_prefix="worker")
+)
+_processes = _BoundedPool(
+    "processes",
+    EXECUTOR_PROCESSES,
+    # spawn: forking a process that runs threads and an event loop is unsafe
+    lambda: ProcessPoolExecutor(max_workers=EXECUTOR_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+)
+
+
+async def _run(pool: _BoundedPool, fn: Callable, args, kwargs, timeout: Optional[float]) -> Any:
+    future = pool.submit(functools.partial(fn, *args, **kwargs))
+    timeout = EXECUTOR_TIMEOUT if timeout is None else timeout
+    try:
+        # On timeout this cancels the task if it has not started; a running task keeps its slot
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Task {getattr(fn, '__qualname__', fn)} timed out after {timeout}s on {pool.name}")
+        raise ExecutorError(
+            "Processing took too long",
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            code="TASK_TIMEOUT",
+            details={"timeout_seconds": timeout}
+        )
+    except BrokenProcessPool:
+        pool.reset()
+        raise ExecutorError(
+            "Worker process crashed while processing the request",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            code="WORKER_CRASHED"
+        )
+
+
+async def run_in_thread(fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """Run fn(*args, **kwargs) on the shared thread pool, off the event loop."""
+    return await _run(_threads, fn, args, kwargs, timeout)
+
+
+async def run_in_process(fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Run fn(*args, **kwargs) in a worker process. fn, its arguments and its result
+    must be picklable. Falls back to the thread pool if EXECUTOR_PROCESSES is 0.
+    """
+    if EXECUTOR_PROCESSES <= 0:
+        return await run_in_thread(fn, *args, timeout=timeout, **kwargs)
+    return await _run(_processes, fn, args, kwargs, timeout)
+
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    """Pending task counts per pool."""
+    return {pool.name: pool.stats() for pool in (_threads, _processes)}
+
+
+async def close_executors():
+    """Shut down both pools. Called once at app shutdown."""
+    for pool in (_threads, _processes):
+        pool.reset()
@@ -2,20 +2,17 @@
 
 import os
 import openai
-import pandas as pd
 from dotenv import load_dotenv
 from app.schemas.shared import GPTFunctionCall, GPTSummaryResponse
+from app.utils.helpers import get_file_extension
+from app.utils.parsers import parse_dataframe_from_path
 
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
 
 def gpt_response(message: str, file_path: str) -> str:
-    df = (
-        pd.read_csv(file_path)
-        if file_path.endswith(".csv")
-        else pd.read_parquet(file_path)
-    )
+    df = parse_dataframe_from_path(file_path, get_file_extension(file_path))
     prompt = f"""
     The user uploaded a dataset with the following summary:
     Columns: {df.columns.tolist()}
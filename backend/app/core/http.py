@@ -0,0 +1,49 @@
+# backend/app/core/http.py
+
+import os
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 10))  # Seconds to establish a connection
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 30))  # Max seconds between received chunks
+HTTP_TOTAL_TIMEOUT = float(os.getenv("HTTP_TOTAL_TIMEOUT", 300))  # Max seconds for a whole download
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 20))
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def _create_session() -> aiohttp.ClientSession:
+    global _session
+    _session = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(
+            total=HTTP_TOTAL_TIMEOUT,
+            connect=HTTP_CONNECT_TIMEOUT,
+            sock_read=HTTP_READ_TIMEOUT
+        ),
+        connector=aiohttp.TCPConnector(limit=HTTP_MAX_CONNECTIONS)
+    )
+    return _session
+
+
+async def init_http() -> aiohttp.ClientSession:
+    """Create the shared HTTP client session. Called once at app startup."""
+    return get_http_session()
+
+
+async def close_http():
+    """Close the shared HTTP client session. Called once at app shutdown."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it lazily if needed."""
+    if _session is None or _session.closed:
+        return _create_session()
+    return _session
@@ -1,4 +1,79 @@
 # backend/app/core/redis.py
- 
-# Placeholder for Redis connection/config
-# TODO: Implement Redis connection logic 
\ No newline at end of file
+
+import os
+import logging
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+try:
+    import fakeredis
+except ImportError:  # Optional dependency, only needed for CACHE_BACKEND=memory
+    fakeredis = None
+
+logger = logging.getLogger(__name__)
+
+# "redis" for a Redis server, "memory" for an in-process store (single worker, no server)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis").lower()
+
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+REDIS_DB = int(os.getenv("REDIS_DB", 0))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 5))  # Seconds to wait for a free connection
+
+_pool: Optional[aioredis.BlockingConnectionPool] = None
+_client: Optional[aioredis.Redis] = None
+
+
+def _create_client() -> aioredis.Redis:
+    global _pool, _client
+    if CACHE_BACKEND == "memory":
+        if fakeredis is None:
+            raise RuntimeError("CACHE_BACKEND=memory requires the 'fakeredis[lua]' package")
+        # Speaks the Redis protocol in-process, including the cache's Lua scripts
+        _client = fakeredis.aioredis.FakeRedis()
+        return _client
+    if CACHE_BACKEND != "redis":
+        raise RuntimeError(f"Unknown CACHE_BACKEND: {CACHE_BACKEND}")
+    _pool = aioredis.BlockingConnectionPool(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=REDIS_DB,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=5,
+        socket_connect_timeout=5,
+        decode_responses=False  # Keep binary for encoded payloads
+    )
+    _client = aioredis.Redis(connection_pool=_pool)
+    return _client
+
+
+async def init_redis() -> aioredis.Redis:
+    """Create the shared connection pool. Called once at app startup."""
+    client = _client or _create_client()
+    if CACHE_BACKEND == "memory":
+        logger.info("Using the in-memory cache backend")
+        return client
+    logger.info(
+        f"Redis pool ready ({REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}, "
+        f"max {REDIS_MAX_CONNECTIONS} connections)"
+    )
+    return client
+
+
+async def close_redis():
+    """Close the shared client and its pool. Called once at app shutdown."""
+    global _pool, _client
+    if _client is not None:
+        await _client.aclose()
+    if _pool is not None:
+        await _pool.aclose()
+    _pool = None
+    _client = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Return the shared async Redis client, creating the pool lazily if needed."""
+    return _client or _create_client()
@@ -1,10 +1,15 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from app.routers import analyze_routes, upload_routes, dataset_routes
 from app.utils.session_middleware import SessionMiddleware
 from app.middleware.error_handler import ErrorHandlerMiddleware
 from app.middleware.upload_limiter import UploadLimiterMiddleware
-import redis
-import os
+from app.utils.session_cache import SessionCache
+from app.core.redis import init_redis, close_redis, get_redis
+from app.core.http import init_http, close_http
+from app.core.executor import close_executors, executor_stats
+from app.services.ingest_service import init_ingest_workers, close_ingest_workers
+import asyncio
 import logging
 
 # Configure logging
@@ -13,10 +18,23 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One shared Redis connection pool, HTTP session and executor pools for the lifetime of the worker
+    await init_redis()
+    await init_http()
+    await init_ingest_workers()
+    yield
+    await close_ingest_workers()
+    await close_executors()
+    await close_http()
+    await close_redis()
+
 app = FastAPI(
     title="AI Data Insights Dashboard",
     description="Upload datasets, run analyses, and get AI-powered summaries.",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Register middlewares in order
@@ -33,13 +51,7 @@ app.include_router(upload_routes.router, prefix="/upload", tags=["File Uploads"]
 async def health_check():
     """Check service health including Redis connection."""
     try:
-        r = redis.Redis(
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=int(os.getenv("REDIS_PORT", 6379)),
-            db=int(os.getenv("REDIS_DB", 0)),
-            socket_timeout=2  # Short timeout for health check
-        )
-        r.ping()
+        await asyncio.wait_for(get_redis().ping(), timeout=2)  # Short timeout for health check
         redis_status = "ok"
     except Exception as e:
         redis_status = f"error: {str(e)}"
@@ -49,20 +61,22 @@ async def health_check():
         "services": {
             "api": "ok",
             "redis": redis_status
-        }
+        },
+        "executors": executor_stats()
     }
 
 @app.get("/session-debug", tags=["Debug"])
 async def session_debug(request: Request):
     """Debug endpoint to check session state and Redis keys."""
     session_id = getattr(request.state, "session_id", None)
-    r = redis.Redis(
-        host=os.getenv("REDIS_HOST", "localhost"),
-        port=int(os.getenv("REDIS_PORT", 6379)),
-        db=int(os.getenv("REDIS_DB", 0))
-    )
-    keys = r.keys(f"session:{session_id}:*") if session_id else []
+    keys = await SessionCache.list_keys(session_id) if session_id else []
     return {
         "session_id": session_id,
-        "redis_keys": [k.decode() for k in keys]
-    } 
\ No newline at end of file
+        "redis_keys": keys
+    } 
+
+@app.get("/cache-usage", tags=["Debug"])
+async def cache_usage(request: Request):
+    """Report session cache memory usage, quotas and the least recently used sessions."""
+    session_id = getattr(request.state, "session_id", None)
+    return await SessionCache.get_usage(session_id)
@@ -1,6 +1,7 @@
-from fastapi import Request, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.schemas.shared import ErrorResponse
 import os
 
@@ -8,42 +9,65 @@ import os
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 100 * 1024 * 1024))  # 100MB default
 MAX_MEMORY_USAGE = int(os.getenv("MAX_MEMORY_USAGE", 500 * 1024 * 1024))  # 500MB default
 
-class UploadLimiterMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, max_file_size: int = MAX_FILE_SIZE):
-        super().__init__(app)
+class UploadTooLargeError(Exception):
+    """Raised from the wrapped receive channel once an upload crosses the size limit."""
+
+class UploadLimiterMiddleware:
+    """
+    Pure ASGI middleware enforcing the upload size limit.
+    The request body is counted chunk by chunk as the route consumes it (the multipart
+    parser spools files to disk), so nothing is buffered here and the request is
+    rejected as soon as it crosses the limit.
+    """
+    def __init__(self, app: ASGIApp, max_file_size: int = MAX_FILE_SIZE):
+        self.app = app
         self.max_file_size = max_file_size
-        
-    async def dispatch(self, request: Request, call_next):
-        if request.method == "POST" and "/upload/" in request.url.path:
-            # Check content length header
-            content_length = request.headers.get("content-length")
-            if content_length and int(content_length) > self.max_file_size:
-                return JSONResponse(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    content=ErrorResponse(
-                        message="File size exceeds maximum allowed size",
-                        code="FILE_TOO_LARGE",
-                        details={
-                            "max_size": self.max_file_size,
-                            "content_length": content_length
-                        }
-                    ).dict()
-                )
-            
-            # For multipart form data, we need to check the body
-            if request.headers.get("content-type", "").startswith("multipart/form-data"):
-                body = await request.body()
-                if len(body) > self.max_file_size:
-                    return JSONResponse(
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        content=ErrorResponse(
-                            message="File size exceeds maximum allowed size",
-                            code="FILE_TOO_LARGE",
-                            details={
-                                "max_size": self.max_file_size,
-                                "body_size": len(body)
-                            }
-                        ).dict()
-                    )
-        
-        return await call_next(request) 
\ No newline at end of file
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or "/upload/" not in scope["path"]:
+            await self.app(scope, receive, send)
+            return
+
+        # Check content length header
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_file_size:
+            await self._too_large({"content_length": content_length})(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def counting_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_file_size:
+                    exceeded = True
+                    raise UploadTooLargeError()
+            return message
+
+        async def guarded_send(message: Message):
+            nonlocal response_started
+            if exceeded:
+                return  # The app's error response is replaced by the 413 below
+            response_started = response_started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, guarded_send)
+        except UploadTooLargeError:
+            pass
+        if exceeded and not response_started:
+            await self._too_large({"body_size": received})(scope, receive, send)
+
+    def _too_large(self, details: dict) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            content=ErrorResponse(
+                message="File size exceeds maximum allowed size",
+                code="FILE_TOO_LARGE",
+                details={"max_size": self.max_file_size, **details}
+            ).dict()
+        )
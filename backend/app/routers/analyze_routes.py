@@ -6,9 +6,11 @@ from app.services.analysis_service import (
     AnalysisError
 )
 from app.services.gpt_service import get_cached_gpt_insights, GPTError
-from app.services.dataset_service import get_session_dataset, DatasetProcessingError
+from app.services.dataset_service import get_session_meta, session_dataset_loader, DatasetProcessingError
 from app.utils.session_cache import RedisCacheError
+from app.core.executor import ExecutorError
 from app.schemas.shared import ErrorResponse, CacheInfo
+from typing import Optional
 import pandas as pd
 import numpy as np
 import logging
@@ -32,32 +34,38 @@ async def get_dataset_overview(
     correlation_threshold: float = Query(0.7, ge=0, le=1, description="Threshold for high correlations"),
     high_cardinality_threshold: int = Query(50, ge=10, description="Threshold for high cardinality"),
     outlier_zscore_threshold: float = Query(3.0, ge=1.0, description="Z-score threshold for outliers"),
-    include_gpt: bool = Query(True, description="Whether to include GPT insights")
+    include_gpt: bool = Query(True, description="Whether to include GPT insights"),
+    approximate: Optional[bool] = Query(
+        None,
+        description="Run normality/uniformity tests on a row sample; defaults to sampling only large datasets"
+    )
 ):
     """
     Get complete dataset analysis (no meta or data).
     """
     try:
-        # Get dataset from session
-        _, df = get_session_dataset(request.state.session_id)
+        # Ensure the session has a dataset; the frame itself is only loaded on a cache miss
+        meta = await get_session_meta(request.state.session_id)
+        load_df = session_dataset_loader(request.state.session_id)
         # Configure analysis
         config = AnalysisConfig(
             correlation_threshold=correlation_threshold,
             high_cardinality_threshold=high_cardinality_threshold,
-            outlier_zscore_threshold=outlier_zscore_threshold
+            outlier_zscore_threshold=outlier_zscore_threshold,
+            approximate=approximate
         )
         # Get analysis results (from cache if available)
-        analysis_results, from_cache = get_cached_analysis(
+        analysis_results, from_cache = await get_cached_analysis(
             request.state.session_id,
-            df,
+            load_df,
             config
         )
         # Get GPT insights if requested
         if include_gpt:
             try:
-                gpt_insights = get_cached_gpt_insights(
+                gpt_insights = await get_cached_gpt_insights(
                     request.state.session_id,
-                    df,
+                    load_df,
                     analysis_results
                 )
                 analysis_results["gpt_insights"] = gpt_insights
@@ -70,7 +78,7 @@ async def get_dataset_overview(
             analysis=DatasetAnalysis(**analysis_results),
             cache_info=CacheInfo(
                 cached=from_cache,
-                cache_key=f"session:{request.state.session_id}:overview",
+                cache_key=f"dataset:{meta.get('hash')}:analysis:overview:{config.cache_key()}",
                 ttl=None  # TODO: Get TTL from Redis
             ).dict()
         )
@@ -93,6 +101,15 @@ async def get_dataset_overview(
                 details=e.details
             ).dict()
         )
+    except ExecutorError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=ErrorResponse(
+                message=str(e),
+                code=e.code,
+                details=e.details
+            ).dict()
+        )
     except RedisCacheError as e:
         logger.warning(f"Cache error in analysis route: {str(e)}")
         # Continue without cache
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Request, Query, status
+from typing import List, Optional
 from app.schemas.dataset import DatasetData, DatasetMetaBase
 from app.schemas.shared import ErrorResponse
 from app.utils.session_cache import SessionCache, RedisCacheError
-from app.services.dataset_service import get_session_dataset as get_session_dataset_service, DatasetProcessingError
+from app.services.dataset_service import (
+    get_session_dataset_page,
+    get_session_meta,
+    DatasetProcessingError
+)
 from app.schemas.shared import PaginatedData
-import numpy as np
-import pandas as pd
+from app.core.executor import run_in_thread
+from app.utils.helpers import dataframe_to_records
 
 router = APIRouter()
 
@@ -20,18 +25,20 @@ router = APIRouter()
 async def get_session_dataset(
     request: Request,
     page: int = 1,
-    page_size: int = 50
+    page_size: int = 50,
+    columns: Optional[List[str]] = Query(None, description="Columns to return (all if omitted)")
 ):
     """Get paginated dataset data from session."""
     try:
-        meta, df = get_session_dataset_service(request.state.session_id)
-        df_clean = df.replace([np.inf, -np.inf], np.nan).where(pd.notnull(df), None)
-        total_rows = len(df_clean)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
+        meta, df, total_rows = await get_session_dataset_page(
+            request.state.session_id,
+            page,
+            page_size,
+            columns
+        )
         return DatasetData(
-            columns=df_clean.columns.tolist(),
-            rows=df_clean.iloc[start_idx:end_idx].to_dict(orient="records"),
+            columns=df.columns.tolist(),
+            rows=await run_in_thread(dataframe_to_records, df),
             pagination=PaginatedData(
                 total=total_rows,
                 page=page,
@@ -66,7 +73,7 @@ async def get_session_dataset(
 async def remove_session_dataset(request: Request):
     """Remove dataset from session cache."""
     try:
-        SessionCache.remove_dataset(request.state.session_id)
+        await SessionCache.remove_dataset(request.state.session_id)
         return {"status": "success"}
     except RedisCacheError as e:
         raise HTTPException(
@@ -86,7 +93,7 @@ async def remove_session_dataset(request: Request):
 async def get_session_dataset_active(request: Request):
     """Check if session has an active dataset."""
     try:
-        has_dataset = SessionCache.has_dataset(request.state.session_id)
+        has_dataset = await SessionCache.has_dataset(request.state.session_id)
         return {"has_dataset": has_dataset}
     except RedisCacheError as e:
         raise HTTPException(
@@ -109,8 +116,7 @@ async def get_session_dataset_active(request: Request):
 async def get_session_dataset_meta(request: Request):
     """Get only the meta for the current session's dataset."""
     try:
-        meta, _ = get_session_dataset_service(request.state.session_id)
-        return meta
+        return await get_session_meta(request.state.session_id)
     except DatasetProcessingError as e:
         raise HTTPException(
             status_code=e.status_code,
@@ -1,16 +1,25 @@
-from app.services.dataset_service import DatasetProcessingError, parse_and_process_file, process_dataframe, validate_and_cache_dataset
-from fastapi import APIRouter, HTTPException, UploadFile, File, Request, Form, status
+from app.services.dataset_service import DatasetProcessingError, load_saved_dataset, parse_and_process_file, validate_and_cache_dataset
+from fastapi import APIRouter, HTTPException, UploadFile, File, Request, Form, Header, status
 from fastapi.responses import JSONResponse
-from app.schemas.upload import UrlUploadResponse
+from app.schemas.upload import ChunkedUploadStatus, IngestJobAccepted, IngestJobStatus, UrlUploadResponse
 from app.schemas.dataset import DatasetSummary, DatasetSummaryList
 from app.schemas.shared import ErrorResponse
-from app.utils.helpers import get_file_extension, is_approved_domain, is_supported_extension
-from app.utils.parsers import parse_dataframe_from_path
+from app.utils.helpers import SUPPORTED_EXTENSIONS, get_file_extension, is_approved_domain, is_supported_extension
 from app.utils.session_cache import RedisCacheError
+from app.utils.uploads_catalog import SORT_COLUMNS, get_uploads_catalog
+from app.core.executor import ExecutorError, run_in_thread
 import os
-import aiohttp
-from typing import Optional
-from app.services.upload_service import save_session_dataset_to_uploads
+from typing import Optional, Union
+from app.services.upload_service import UrlDownloadError, download_to_tempfile, save_session_dataset_to_uploads
+from app.services.ingest_service import IngestJob, IngestJobError, enqueue_ingest_job, get_ingest_job, spool_upload_to_disk
+from app.services.chunked_upload_service import (
+    ChunkedUploadError,
+    abort_upload,
+    append_chunk,
+    finalize_upload,
+    get_upload,
+    start_upload
+)
 import uuid
 
 UPLOADS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../uploads'))
@@ -21,52 +30,39 @@ router = APIRouter()
     "/summary",
     response_model=DatasetSummaryList,
     responses={
+        400: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
         503: {"model": ErrorResponse}
     }
 )
 async def get_uploads_summary(
     page: int = 1,
-    page_size: int = 50
+    page_size: int = 50,
+    sort: str = "created_at",
+    order: str = "desc"
 ):
-    """Get paginated list of uploaded datasets."""
+    """Get paginated list of uploaded datasets, sorted by created_at, title, filename or size."""
+    if sort not in SORT_COLUMNS or order not in ("asc", "desc"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ErrorResponse(
+                message="Invalid sort",
+                code="INVALID_SORT",
+                details={"sort": list(SORT_COLUMNS), "order": ["asc", "desc"]}
+            ).dict()
+        )
     try:
-        # List all dataset files
-        datasets = []
-        for fname in os.listdir(UPLOADS_DIR):
-            if fname.endswith((".csv", ".tsv", ".xlsx")):
-                base = os.path.splitext(fname)[0]
-                summary_path = os.path.join(UPLOADS_DIR, f"{base}.summary.json")
-                
-                # Get file stats
-                file_path = os.path.join(UPLOADS_DIR, fname)
-                stats = os.stat(file_path)
-                
-                # Create basic metadata
-                meta = {
-                    "filename": fname,
-                    "size": stats.st_size,
-                    "created_at": stats.st_ctime
-                }
-                
-                # Add summary if exists
-                if os.path.exists(summary_path):
-                    import json
-                    try:
-                        with open(summary_path, "r") as f:
-                            meta.update(json.load(f))
-                    except json.JSONDecodeError:
-                        pass
-                
-                datasets.append(DatasetSummary(**meta))
-        
-        # Paginate results
-        total = len(datasets)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
+        page = max(page, 1)
+        datasets, total = await run_in_thread(
+            get_uploads_catalog(UPLOADS_DIR).list,
+            offset=(page - 1) * page_size,
+            limit=page_size,
+            sort=sort,
+            descending=order == "desc"
+        )
         
         return DatasetSummaryList(
-            data=datasets[start_idx:end_idx],
+            data=[DatasetSummary(**meta) for meta in datasets],
             pagination={
                 "total": total,
                 "page": page,
@@ -85,6 +81,18 @@ async def get_uploads_summary(
             ).dict()
         )
 
+async def _enqueue(request: Request, job: IngestJob) -> JSONResponse:
+    """Queue a background ingestion job and answer 202 with where to poll it."""
+    job_id = await enqueue_ingest_job(job)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=IngestJobAccepted(
+            job_id=job_id,
+            status="queued",
+            status_url=str(request.url_for("get_ingest_job_status", job_id=job_id).path)
+        ).dict()
+    )
+
 @router.post(
     "/session-file",
     response_model=UrlUploadResponse,
@@ -93,7 +101,8 @@ async def get_uploads_summary(
         409: {"model": ErrorResponse},
         413: {"model": ErrorResponse},
         422: {"model": ErrorResponse},
-        503: {"model": ErrorResponse}
+        503: {"model": ErrorResponse},
+        202: {"model": IngestJobAccepted}
     }
 )
 async def session_file(
@@ -101,11 +110,14 @@ async def session_file(
     mode: str = Form(...),
     title: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
-    url: Optional[str] = Form(None)
+    url: Optional[str] = Form(None),
+    background: bool = Form(False)
 ):
     """
     Upload dataset to session via file upload, URL, or selection from uploads.
-    Supports CSV, TSV, and Excel files.
+    Supports CSV, TSV, Excel, Parquet, Feather and JSON Lines files.
+    With background=true the dataset is ingested by a background job: the response
+    is a 202 with a job id to poll at /upload/jobs/{job_id}.
     """
     session_id = request.state.session_id
     
@@ -128,21 +140,33 @@ async def session_file(
                     detail=ErrorResponse(
                         message=f"Unsupported file type: {ext}",
                         code="INVALID_FILE_TYPE",
-                        details={"supported_types": list(is_supported_extension.SUPPORTED_EXTENSIONS)}
+                        details={"supported_types": sorted(SUPPORTED_EXTENSIONS)}
                     ).dict()
                 )
             
-            # Read and process file
-            data = await file.read()
-            df_clean, meta = parse_and_process_file(
-                data,
+            if background:
+                # The request's spooled file is closed when the response is sent, so the job gets a copy
+                path = await run_in_thread(spool_upload_to_disk, file.file, file.filename)
+                return await _enqueue(request, IngestJob(
+                    session_id,
+                    file.filename,
+                    title=title,
+                    path=path,
+                    delete_path=True,
+                    mime_type=file.content_type or "application/octet-stream"
+                ))
+            
+            # Parse straight from the spooled upload instead of reading it into memory
+            df_clean, meta = await run_in_thread(
+                parse_and_process_file,
+                file.file,
                 file.filename,
                 title=title,
-                size=len(data)
+                size=file.size
             )
             
             # Cache dataset
-            meta = validate_and_cache_dataset(session_id, df_clean, meta, meta["hash"])
+            meta = await validate_and_cache_dataset(session_id, df_clean, meta, meta["hash"])
             
             return UrlUploadResponse(
                 filename=meta["filename"],
@@ -176,44 +200,51 @@ async def session_file(
                     ).dict()
                 )
             
-            # Download file
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=ErrorResponse(
-                                message=f"Failed to download file (HTTP {response.status})",
-                                code="DOWNLOAD_ERROR"
-                            ).dict()
-                        )
-                    
-                    data = await response.read()
-                    filename = url.split("/")[-1]
-                    
-                    # Process downloaded file
-                    df_clean, meta = parse_and_process_file(
-                        data,
-                        filename,
-                        title=title,
-                        size=len(data)
-                    )
-                    
-                    # Cache dataset
-                    meta = validate_and_cache_dataset(session_id, df_clean, meta, meta["hash"])
-                    
-                    return UrlUploadResponse(
-                        filename=meta["filename"],
-                        title=meta.get("title"),
-                        created_at=meta["created_at"],
-                        size=meta["size"],
-                        num_rows=meta.get("num_rows"),
-                        columns=meta.get("columns"),
-                        preview=meta.get("preview"),
-                        summary=meta.get("summary"),
-                        mime_type=response.headers.get("content-type", "application/octet-stream"),
-                        message="File from URL uploaded to session and cached"
-                    )
+            if background:
+                return await _enqueue(request, IngestJob(
+                    session_id,
+                    os.path.basename(url),
+                    title=title,
+                    url=url,
+                    message="File from URL uploaded to session and cached"
+                ))
+            
+            # Stream the download into a size-capped temp file and parse from there
+            try:
+                tmp, download = await download_to_tempfile(url)
+            except UrlDownloadError as e:
+                raise HTTPException(
+                    status_code=e.status_code,
+                    detail=ErrorResponse(
+                        message=e.message,
+                        code="DOWNLOAD_ERROR",
+                        details=e.details
+                    ).dict()
+                )
+            with tmp:
+                df_clean, meta = await run_in_thread(
+                    parse_and_process_file,
+                    tmp,
+                    download["filename"],
+                    title=title,
+                    size=download["size"]
+                )
+            
+            # Cache dataset
+            meta = await validate_and_cache_dataset(session_id, df_clean, meta, meta["hash"])
+            
+            return UrlUploadResponse(
+                filename=meta["filename"],
+                title=meta.get("title"),
+                created_at=meta["created_at"],
+                size=meta["size"],
+                num_rows=meta.get("num_rows"),
+                columns=meta.get("columns"),
+                preview=meta.get("preview"),
+                summary=meta.get("summary"),
+                mime_type=download["mime_type"],
+                message="File from URL uploaded to session and cached"
+            )
         elif mode == "select":
             # This is the only place where id (S3 object name) should be used in meta
             if not title:  # Use title field for filename in select mode
@@ -235,22 +266,23 @@ async def session_file(
                     ).dict()
                 )
             
-            # Parse file from disk
-            ext = get_file_extension(title)
-            df = parse_dataframe_from_path(file_path, ext)
+            if background:
+                return await _enqueue(request, IngestJob(
+                    session_id,
+                    title,
+                    title=title,
+                    path=file_path,
+                    dataset_id=title,
+                    message="File from uploads folder loaded to session"
+                ))
             
-            # Process DataFrame
-            df_clean, meta, df_hash = process_dataframe(
-                df,
-                title,
-                title=title,
-                size=os.path.getsize(file_path)
-            )
+            # Load the saved Parquet copy, or parse and process the file if it has none yet
+            df_clean, meta, df_hash = await run_in_thread(load_saved_dataset, file_path, title, title=title)
             # Add id for select/S3 dataset
             meta["id"] = title
             
             # Cache dataset
-            meta = validate_and_cache_dataset(session_id, df_clean, meta, df_hash)
+            meta = await validate_and_cache_dataset(session_id, df_clean, meta, df_hash)
             
             return UrlUploadResponse(
                 filename=meta["filename"],
@@ -273,6 +305,8 @@ async def session_file(
                     details={"supported_modes": ["upload", "link", "select"]}
                 ).dict()
             )
+    except HTTPException:
+        raise
     except DatasetProcessingError as e:
         raise HTTPException(
             status_code=e.status_code,
@@ -282,6 +316,24 @@ async def session_file(
                 details=e.details
             ).dict()
         )
+    except IngestJobError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=ErrorResponse(
+                message=e.message,
+                code="INGEST_QUEUE_FULL",
+                details=e.details
+            ).dict()
+        )
+    except ExecutorError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=ErrorResponse(
+                message=e.message,
+                code=e.code,
+                details=e.details
+            ).dict()
+        )
     except RedisCacheError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -301,30 +353,254 @@ async def session_file(
             ).dict()
         )
 
-# @router.post("/save-session-dataset-to-uploads", response_model=dict, responses={503: {"model": ErrorResponse}})
-# async def save_session_dataset_to_uploads_route(request: Request):
-    """Save the current session's dataset to the uploads folder as CSV and JSON summary."""
+def _chunked_upload_http_error(e: Union[ChunkedUploadError, ExecutorError]) -> HTTPException:
+    return HTTPException(
+        status_code=e.status_code,
+        detail=ErrorResponse(
+            message=e.message,
+            code=e.code,
+            details=e.details
+        ).dict()
+    )
+
+@router.post(
+    "/chunked",
+    response_model=ChunkedUploadStatus,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse}
+    }
+)
+async def start_chunked_upload(
+    request: Request,
+    filename: str = Form(...),
+    title: Optional[str] = Form(None),
+    size: Optional[int] = Form(None)
+):
+    """
+    Start a resumable upload for files too large to send in one request.
+    Send the file with PUT /upload/chunked/{upload_id}?offset=N (raw bytes, optional
+    X-Chunk-SHA256 header), then POST /upload/chunked/{upload_id}/finalize.
+    """
     try:
-        session_id = request.state.session_id
-        # Fetch meta and df from session
-        from app.utils.session_cache import SessionCache
-        meta = SessionCache.get_dataset_meta(session_id)
-        df = SessionCache.get_dataset_data(session_id)
-        if meta is None or df is None:
-            raise HTTPException(status_code=404, detail={"message": "No dataset in session"})
-        # Ensure meta has an id
-        if not meta.get("id"):
-            meta["id"] = str(uuid.uuid4())
-        # Save to uploads
-        uploads_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../uploads'))
-        result = save_session_dataset_to_uploads(session_id, uploads_dir, title=meta.get("title"))
-        return {"status": "success", "meta": result}
-    except Exception as e:
+        return ChunkedUploadStatus(**await run_in_thread(
+            start_upload, request.state.session_id, filename, title=title, size=size
+        ))
+    except (ChunkedUploadError, ExecutorError) as e:
+        raise _chunked_upload_http_error(e)
+
+@router.get(
+    "/chunked/{upload_id}",
+    response_model=ChunkedUploadStatus,
+    responses={404: {"model": ErrorResponse}}
+)
+async def get_chunked_upload(request: Request, upload_id: str):
+    """Get an upload's progress; offset is where a resumed upload continues."""
+    try:
+        return ChunkedUploadStatus(**await run_in_thread(get_upload, request.state.session_id, upload_id))
+    except (ChunkedUploadError, ExecutorError) as e:
+        raise _chunked_upload_http_error(e)
+
+@router.put(
+    "/chunked/{upload_id}",
+    response_model=ChunkedUploadStatus,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        413: {"model": ErrorResponse}
+    }
+)
+async def append_chunked_upload(
+    request: Request,
+    upload_id: str,
+    offset: int,
+    chunk_sha256: Optional[str] = Header(None, alias="X-Chunk-SHA256")
+):
+    """
+    Append the request body at offset. A 409 OFFSET_MISMATCH carries the server's
+    offset in its details; resend from there.
+    """
+    try:
+        return ChunkedUploadStatus(**await append_chunk(
+            request.state.session_id,
+            upload_id,
+            offset,
+            request.stream(),
+            checksum=chunk_sha256
+        ))
+    except (ChunkedUploadError, ExecutorError) as e:
+        raise _chunked_upload_http_error(e)
+
+@router.post(
+    "/chunked/{upload_id}/finalize",
+    response_model=UrlUploadResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+        202: {"model": IngestJobAccepted}
+    }
+)
+async def finalize_chunked_upload(
+    request: Request,
+    upload_id: str,
+    checksum: Optional[str] = Form(None),
+    background: bool = Form(False)
+):
+    """
+    Complete an upload and load the assembled file into the session, like mode=upload
+    of /upload/session-file. checksum is the SHA-256 of the whole file, if given.
+    """
+    session_id = request.state.session_id
+    try:
+        upload = await run_in_thread(finalize_upload, session_id, upload_id, checksum)
+    except (ChunkedUploadError, ExecutorError) as e:
+        raise _chunked_upload_http_error(e)
+
+    try:
+        if background:
+            return await _enqueue(request, IngestJob(
+                session_id,
+                upload["filename"],
+                title=upload["title"],
+                path=upload["path"],
+                delete_path=True
+            ))
+
+        try:
+            with open(upload["path"], "rb") as f:
+                df_clean, meta = await run_in_thread(
+                    parse_and_process_file,
+                    f,
+                    upload["filename"],
+                    title=upload["title"],
+                    size=upload["size"]
+                )
+        finally:
+            os.remove(upload["path"])
+
+        meta = await validate_and_cache_dataset(session_id, df_clean, meta, meta["hash"])
+
+        return UrlUploadResponse(
+            filename=meta["filename"],
+            title=meta.get("title"),
+            created_at=meta["created_at"],
+            size=meta["size"],
+            num_rows=meta.get("num_rows"),
+            columns=meta.get("columns"),
+            preview=meta.get("preview"),
+            summary=meta.get("summary"),
+            mime_type="application/octet-stream",
+            message="File uploaded to session and cached"
+        )
+    except DatasetProcessingError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=ErrorResponse(
+                message=str(e),
+                code="DATASET_PROCESSING_ERROR",
+                details=e.details
+            ).dict()
+        )
+    except IngestJobError as e:
         raise HTTPException(
-            status_code=503,
+            status_code=e.status_code,
+            detail=ErrorResponse(
+                message=e.message,
+                code="INGEST_QUEUE_FULL",
+                details=e.details
+            ).dict()
+        )
+    except ExecutorError as e:
+        raise HTTPException(
+            status_code=e.status_code,
             detail=ErrorResponse(
-                message="Failed to save session dataset to uploads",
-                code="UPLOAD_SAVE_ERROR",
+                message=e.message,
+                code=e.code,
+                details=e.details
+            ).dict()
+        )
+    except RedisCacheError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorResponse(
+                message="Cache service unavailable",
+                code="CACHE_ERROR",
+                details={"error": str(e)}
+            ).dict()
+        )
+
+@router.delete(
+    "/chunked/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={404: {"model": ErrorResponse}}
+)
+async def abort_chunked_upload(request: Request, upload_id: str):
+    """Discard an unfinished upload."""
+    try:
+        await run_in_thread(abort_upload, request.state.session_id, upload_id)
+    except (ChunkedUploadError, ExecutorError) as e:
+        raise _chunked_upload_http_error(e)
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=IngestJobStatus,
+    responses={
+        404: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
+    }
+)
+async def get_ingest_job_status(request: Request, job_id: str):
+    """Get the stage and progress of a background ingestion job started by this session."""
+    try:
+        state = await get_ingest_job(job_id, request.state.session_id)
+    except RedisCacheError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorResponse(
+                message="Cache service unavailable",
+                code="CACHE_ERROR",
                 details={"error": str(e)}
             ).dict()
-        )
\ No newline at end of file
+        )
+    if state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ErrorResponse(
+                message="Job not found",
+                code="JOB_NOT_FOUND"
+            ).dict()
+        )
+    return IngestJobStatus(**state)
+
+# @router.post("/save-session-dataset-to-uploads", response_model=dict, responses={503: {"model": ErrorResponse}})
+# async def save_session_dataset_to_uploads_route(request: Request):
+#     """Save the current session's dataset to the uploads folder as CSV and JSON summary."""
+#     try:
+#         session_id = request.state.session_id
+#         # Fetch meta and df from session
+#         from app.utils.session_cache import SessionCache
+#         meta = await SessionCache.get_dataset_meta(session_id)
+#         df = await SessionCache.get_dataset_data(session_id)
+#         if meta is None or df is None:
+#             raise HTTPException(status_code=404, detail={"message": "No dataset in session"})
+#         # Ensure meta has an id
+#         if not meta.get("id"):
+#             meta["id"] = str(uuid.uuid4())
+#         # Save to uploads
+#         uploads_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../uploads'))
+#         result = await save_session_dataset_to_uploads(session_id, uploads_dir, title=meta.get("title"))
+#         return {"status": "success", "meta": result}
+#     except Exception as e:
+#         raise HTTPException(
+#             status_code=503,
+#             detail=ErrorResponse(
+#                 message="Failed to save session dataset to uploads",
+#                 code="UPLOAD_SAVE_ERROR",
+#                 details={"error": str(e)}
+#             ).dict()
+#         )
\ No newline at end of file
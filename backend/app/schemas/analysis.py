@@ -87,6 +87,17 @@ class GPTInsights(BaseModel):
         description="Suggested additional analyses"
     )
 
+class SamplingInfo(BaseModel):
+    """How the hypothesis tests were run on large datasets."""
+    enabled: bool = Field(..., description="Whether the tests ran on a row sample instead of every row")
+    num_rows: int = Field(..., description="Rows in the dataset")
+    sample_size: int = Field(..., description="Rows the tests ran on")
+    seed: Optional[int] = Field(None, description="Seed of the sample, which makes it reproducible")
+    estimated_fields: List[str] = Field(
+        default_factory=list,
+        description="Result fields computed from the sample (section.field)"
+    )
+
 class DatasetAnalysis(BaseModel):
     """Complete analysis results including statistical and GPT insights."""
     column_info: List[ColumnInfoResponse]
@@ -98,6 +109,7 @@ class DatasetAnalysis(BaseModel):
     highlights: List[str]
     gpt_insights: Optional[GPTInsights] = None
     data_dictionary: Optional[Dict[str, str]] = None
+    sampling: Optional[SamplingInfo] = None
 
 class AnalysisOverviewResponse(BaseModel):
     """Response for the analysis overview endpoint: only analysis and cache info."""
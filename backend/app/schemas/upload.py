@@ -35,4 +35,35 @@ class SessionUploadMode(BaseModel):
     title: Optional[constr(min_length=1, max_length=100)] = Field(
         None,
         description="Optional dataset title"
-    ) 
\ No newline at end of file
+    ) 
+class IngestJobAccepted(BaseModel):
+    """Response after queueing a background ingestion job."""
+    job_id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="Job status (queued)")
+    status_url: str = Field(..., description="URL to poll for progress")
+
+class IngestJobStatus(BaseModel):
+    """Progress of a background ingestion job."""
+    job_id: str = Field(..., description="Job identifier")
+    status: Literal["queued", "running", "done", "failed"] = Field(..., description="Job status")
+    stage: Literal["queued", "downloading", "parsing", "fingerprinting", "caching", "analyzing", "done"] = Field(
+        ...,
+        description="Current (or, for failed jobs, last) stage"
+    )
+    percent: int = Field(..., description="Approximate percent complete")
+    filename: Optional[str] = Field(None, description="Original filename")
+    created_at: datetime = Field(..., description="Time the job was queued")
+    updated_at: datetime = Field(..., description="Time of the last progress update")
+    error: Optional[Dict[str, Any]] = Field(None, description="Error details for failed jobs")
+    result: Optional[UrlUploadResponse] = Field(None, description="Dataset summary for finished jobs")
+
+class ChunkedUploadStatus(BaseModel):
+    """State of a resumable chunked upload."""
+    upload_id: str = Field(..., description="Upload identifier")
+    filename: str = Field(..., description="Original filename")
+    title: Optional[str] = Field(None, description="User-provided title")
+    size: Optional[int] = Field(None, description="Declared total size in bytes")
+    offset: int = Field(..., description="Bytes received so far; the next chunk must start here")
+    chunks: int = Field(..., description="Number of chunks received")
+    max_chunk_size: int = Field(..., description="Largest chunk accepted per request, in bytes")
+    created_at: datetime = Field(..., description="Time the upload was started")
@@ -1,10 +1,15 @@
 import pandas as pd
 import numpy as np
 from scipy import stats
-from typing import List, Dict, Optional, Tuple, Any
-from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple, Any
+from dataclasses import dataclass, asdict
+import hashlib
 import logging
 from app.utils.session_cache import SessionCache, RedisCacheError
+from app.services.dataset_service import DatasetProcessingError
+from app.core.executor import ExecutorError, run_in_thread
+from app.utils.dtypes import clean_dataframe
+from app.utils.profiling import DatasetProfile, numeric_profile, sample_rows
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +28,21 @@ class AnalysisConfig:
     outlier_zscore_threshold: float = 3.0
     max_categories_for_chi2: int = 20
     sample_size_for_tests: int = 10000
+    sampling_threshold_rows: int = 100000  # Hypothesis tests run on a sample above this many rows
+    sample_seed: int = 0
+    approximate: Optional[bool] = None  # None: sample above sampling_threshold_rows; True/False: always/never
+
+    def use_sampling(self, num_rows: int) -> bool:
+        """Whether the hypothesis tests of a num_rows frame run on a sample."""
+        if num_rows <= self.sample_size_for_tests:
+            return False
+        if self.approximate is None:
+            return num_rows > self.sampling_threshold_rows
+        return self.approximate
+
+    def cache_key(self) -> str:
+        """Stable key for caching results computed with this configuration."""
+        return hashlib.sha256(repr(sorted(asdict(self).items())).encode("utf-8")).hexdigest()[:16]
 
 class AnalysisService:
     """Service for running dataset analyses."""
@@ -38,12 +58,16 @@ class AnalysisService:
         try:
             # Clean data first
             df_clean = self._clean_dataframe(df)
+            # Null, distinct and value counts are computed once per column and shared by all sections
+            profile = DatasetProfile(df_clean)
+            # Rows the normality and uniformity tests run on; None means all of them
+            test_rows = self._get_test_rows(len(df_clean))
             
             # Run all analyses
-            column_info = self._get_column_info(df_clean)
-            numeric_summary = self._get_numeric_summary(df_clean)
-            categorical_summary = self._get_categorical_summary(df_clean)
-            missing_data = self._get_missing_data(df_clean)
+            column_info = self._get_column_info(df_clean, profile)
+            numeric_summary = self._get_numeric_summary(df_clean, test_rows)
+            categorical_summary = self._get_categorical_summary(df_clean, profile, test_rows)
+            missing_data = self._get_missing_data(df_clean, profile)
             correlation_matrix = self._get_correlation_matrix(df_clean)
             
             # Extract insights
@@ -65,7 +89,8 @@ class AnalysisService:
                 "target": None,  # Will be set by ML pipeline
                 "highlights": highlights,
                 "gpt_summary": None,  # Will be set by GPT service
-                "data_dictionary": None  # Optional feature
+                "data_dictionary": None,  # Optional feature
+                "sampling": self._get_sampling_info(len(df_clean), test_rows)
             }
             
         except Exception as e:
@@ -74,128 +99,127 @@ class AnalysisService:
     
     def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean DataFrame for analysis."""
-        return df.replace([np.inf, -np.inf], np.nan).where(pd.notnull(df), None)
+        return clean_dataframe(df)
+    
+    def _get_test_rows(self, num_rows: int) -> Optional[np.ndarray]:
+        """Seeded sample of row positions for the hypothesis tests, or None to test on every row."""
+        if not self.config.use_sampling(num_rows):
+            return None
+        return sample_rows(num_rows, self.config.sample_size_for_tests, self.config.sample_seed)
+    
+    def _get_sampling_info(self, num_rows: int, test_rows: Optional[np.ndarray]) -> Dict[str, Any]:
+        """Describe how the hypothesis tests were run, and which result fields are estimates."""
+        if test_rows is None:
+            return {
+                "enabled": False,
+                "num_rows": num_rows,
+                "sample_size": num_rows,
+                "seed": None,
+                "estimated_fields": []
+            }
+        return {
+            "enabled": True,
+            "num_rows": num_rows,
+            "sample_size": len(test_rows),
+            "seed": self.config.sample_seed,
+            "estimated_fields": ["numeric_summary.is_normal", "categorical_summary.is_uniform"]
+        }
     
-    def _get_column_info(self, df: pd.DataFrame) -> List[Dict]:
+    def _get_column_info(self, df: pd.DataFrame, profile: Optional[DatasetProfile] = None) -> List[Dict]:
         """Extract detailed information about each column."""
+        profile = profile or DatasetProfile(df)
         info = []
         for col in df.columns:
             series = df[col]
+            column = profile[col]
             dtype = str(series.dtype)
             is_numeric = pd.api.types.is_numeric_dtype(series)
-            is_categorical = pd.api.types.is_categorical_dtype(series) or (
-                pd.api.types.is_object_dtype(series) and 
-                series.nunique() < len(series) * 0.5
+            is_categorical = isinstance(series.dtype, pd.CategoricalDtype) or (
+                (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)) and 
+                column.distinct_count < len(series) * 0.5
             )
             is_datetime = pd.api.types.is_datetime64_any_dtype(series)
             
             info.append({
                 "name": col,
                 "dtype": dtype,
-                "sample_values": series.dropna().head(5).astype(str).tolist(),
-                "unique_count": int(series.nunique()),
+                "sample_values": column.sample_values,
+                "unique_count": column.distinct_count,
                 "is_numeric": is_numeric,
                 "is_categorical": is_categorical,
                 "is_datetime": is_datetime,
-                "is_constant": series.nunique() == 1,
-                "has_nulls": series.isnull().any()
+                "is_constant": column.distinct_count == 1,
+                "has_nulls": column.null_count > 0
             })
         
         return info
     
-    def _get_numeric_summary(self, df: pd.DataFrame) -> List[Dict]:
+    def _get_numeric_summary(self, df: pd.DataFrame, test_rows: Optional[np.ndarray] = None) -> List[Dict]:
         """Calculate summary statistics for numeric columns."""
         numeric_cols = df.select_dtypes(include=np.number).columns
-        summaries = []
-        
-        for col in numeric_cols:
-            series = df[col]
-            if series.isnull().all():
-                continue
-                
-            # Basic stats
-            stats_dict = {
-                "name": col,
-                "mean": float(series.mean()),
-                "std": float(series.std()),
-                "min": float(series.min()),
-                "max": float(series.max()),
-                "median": float(series.median()),
-                "q1": float(series.quantile(0.25)),
-                "q3": float(series.quantile(0.75)),
-                "iqr": float(series.quantile(0.75) - series.quantile(0.25)),
-                "skewness": float(series.skew()),
-                "kurtosis": float(series.kurtosis()),
-                "zero_count": int((series == 0).sum()),
-                "zero_percent": float((series == 0).mean() * 100)
-            }
-            
-            # Outlier detection
-            q1, q3 = stats_dict["q1"], stats_dict["q3"]
-            iqr = stats_dict["iqr"]
-            lower_bound = q1 - 1.5 * iqr
-            upper_bound = q3 + 1.5 * iqr
-            outliers = ((series < lower_bound) | (series > upper_bound))
-            stats_dict["outlier_count"] = int(outliers.sum())
-            stats_dict["outlier_percent"] = float(outliers.mean() * 100)
-            
-            # Distribution tests
-            if len(series) >= 8:  # Minimum sample size for normality test
-                _, p_value = stats.normaltest(series.dropna())
-                stats_dict["is_normal"] = float(p_value) > 0.05
-            
-            summaries.append(stats_dict)
-        
-        return summaries
+        # One vectorized pass over all numeric columns, in float64 (ingest may downcast)
+        return numeric_profile(df, numeric_cols, test_rows=test_rows)
     
-    def _get_categorical_summary(self, df: pd.DataFrame) -> List[Dict]:
+    def _get_categorical_summary(
+        self,
+        df: pd.DataFrame,
+        profile: Optional[DatasetProfile] = None,
+        test_rows: Optional[np.ndarray] = None
+    ) -> List[Dict]:
         """Analyze categorical columns."""
-        categorical_cols = df.select_dtypes(include=["object", "category"]).columns
+        profile = profile or DatasetProfile(df)
+        categorical_cols = df.select_dtypes(include=["object", "string", "category"]).columns
         categorical_cols = [
             col for col in categorical_cols 
-            if df[col].nunique() < len(df) * 0.5
+            if profile[col].distinct_count < len(df) * 0.5
         ]
         
         summaries = []
         for col in categorical_cols:
-            series = df[col]
-            if series.isnull().all():
+            column = profile[col]
+            if column.null_count == len(df):
                 continue
                 
-            value_counts = series.value_counts()
+            value_counts = column.value_counts
             top_values = value_counts.head(10)
             
             summary = {
                 "name": col,
-                "unique_count": int(series.nunique()),
+                "unique_count": column.distinct_count,
                 "top_values": [
                     {"value": str(k), "count": int(v)} 
                     for k, v in top_values.items()
                 ],
-                "high_cardinality": series.nunique() > self.config.high_cardinality_threshold,
+                "high_cardinality": column.distinct_count > self.config.high_cardinality_threshold,
                 "entropy": float(stats.entropy(value_counts.values) if len(value_counts) > 1 else 0)
             }
             
             # Chi-square test for uniformity if not too many categories
-            if series.nunique() <= self.config.max_categories_for_chi2:
-                _, p_value = stats.chisquare(value_counts.values)
+            if column.distinct_count <= self.config.max_categories_for_chi2:
+                if test_rows is None:
+                    observed = value_counts.values
+                else:
+                    # Same categories as the full counts, so ones missing from the sample count as 0
+                    observed = df[col].iloc[test_rows].value_counts().reindex(value_counts.index, fill_value=0).values
+                _, p_value = stats.chisquare(observed)
                 summary["is_uniform"] = float(p_value) > 0.05
             
             summaries.append(summary)
         
         return summaries
     
-    def _get_missing_data(self, df: pd.DataFrame) -> List[Dict]:
+    def _get_missing_data(self, df: pd.DataFrame, profile: Optional[DatasetProfile] = None) -> List[Dict]:
         """Analyze missing data patterns."""
+        profile = profile or DatasetProfile(df)
         missing = []
         total_rows = len(df)
         
         for col in df.columns:
-            null_count = df[col].isnull().sum()
+            null_count = profile[col].null_count
             if null_count > 0:
                 missing.append({
                     "column": col,
-                    "count": int(null_count),
+                    "count": null_count,
                     "percent": float(null_count / total_rows * 100)
                 })
         
@@ -314,27 +338,32 @@ class AnalysisService:
         
         return highlights
 
-def get_cached_analysis(
+async def get_cached_analysis(
     session_id: str,
-    df: pd.DataFrame,
+    load_df: Callable[[], Awaitable[pd.DataFrame]],
     config: Optional[AnalysisConfig] = None
 ) -> Tuple[Dict[str, Any], bool]:
     """
     Get analysis results from cache or compute new ones.
+    The DataFrame is only loaded (via load_df) on a cache miss.
     Returns (analysis_results, from_cache).
     """
+    config = config or AnalysisConfig()
+    # Results are shared across sessions with the same dataset, so key them by config too
+    analysis_type = f"overview:{config.cache_key()}"
     try:
         # Try to get from cache
-        cached = SessionCache.get_analysis_result(session_id, "overview")
+        cached = await SessionCache.get_analysis_result(session_id, analysis_type)
         if cached:
             return cached, True
         
-        # Compute new analysis
+        # Compute new analysis on the thread pool: the profiles are batched NumPy/SciPy
+        # kernels that release the GIL, and a worker process would need a pickled copy of the frame
         service = AnalysisService(config)
-        results = service.run_full_analysis(df)
+        results = await run_in_thread(service.run_full_analysis, await load_df())
         
         # Cache results
-        SessionCache.set_analysis_result(session_id, "overview", results)
+        await SessionCache.set_analysis_result(session_id, analysis_type, results)
         
         return results, False
         
@@ -342,7 +371,9 @@ def get_cached_analysis(
         logger.warning(f"Cache error in analysis: {str(e)}")
         # On cache error, compute but don't cache
         service = AnalysisService(config)
-        return service.run_full_analysis(df), False
+        return await run_in_thread(service.run_full_analysis, await load_df()), False
+    except (DatasetProcessingError, ExecutorError):
+        raise
     except Exception as e:
         logger.error(f"Analysis error: {str(e)}")
         raise AnalysisError("Failed to get analysis results", details={"error": str(e)}) 
\ No newline at end of file
@@ -0,0 +1,284 @@
+# backend/app/services/chunked_upload_service.py
+
+import os
+import re
+import json
+import time
+import uuid
+import fcntl
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import status
+
+from app.core.executor import run_in_thread
+from app.utils.helpers import get_file_extension, is_supported_extension
+
+logger = logging.getLogger(__name__)
+
+CHUNKED_UPLOAD_DIR = os.getenv(
+    "CHUNKED_UPLOAD_DIR", os.path.join(tempfile.gettempdir(), "ai-insights-uploads")
+)  # Must be shared by all workers behind the same load balancer
+CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_SIZE", 1024 * 1024 * 1024))  # 1GB per file
+CHUNK_MAX_SIZE = int(os.getenv("CHUNK_MAX_SIZE", 16 * 1024 * 1024))  # 16MB per append request
+CHUNKED_UPLOAD_TTL = int(os.getenv("CHUNKED_UPLOAD_TTL", 24 * 60 * 60))  # Unfinished uploads are removed after this
+HASH_BUFFER_SIZE = 1024 * 1024
+
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ChunkedUploadError(Exception):
+    """Custom exception for resumable upload errors."""
+    def __init__(
+        self,
+        message: str,
+        status_code: int = status.HTTP_400_BAD_REQUEST,
+        code: str = "UPLOAD_ERROR",
+        details: Optional[Dict] = None
+    ):
+        self.message = message
+        self.status_code = status_code
+        self.code = code
+        self.details = details
+        super().__init__(self.message)
+
+
+def _paths(upload_id: str):
+    """(data file, manifest file) of an upload."""
+    if not _UPLOAD_ID_RE.match(upload_id):
+        raise ChunkedUploadError("Upload not found", status.HTTP_404_NOT_FOUND, "UPLOAD_NOT_FOUND")
+    base = os.path.join(CHUNKED_UPLOAD_DIR, upload_id)
+    return base + ".part", base + ".json"
+
+
+def _write_manifest(path: str, manifest: Dict):
+    # Write a uniquely named temp file, then rename, so a concurrent reader never
+    # sees a partial manifest and concurrent writers never share a temp file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_manifest(upload_id: str, session_id: str) -> Dict:
+    _, manifest_path = _paths(upload_id)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = None
+    if manifest is None or manifest.get("session_id") != session_id:
+        raise ChunkedUploadError("Upload not found", status.HTTP_404_NOT_FOUND, "UPLOAD_NOT_FOUND")
+    return manifest
+
+
+def _lock(f):
+    """Take the upload's exclusive lock, which serializes appends across requests and workers."""
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        raise ChunkedUploadError(
+            "Another request is writing to this upload",
+            status.HTTP_409_CONFLICT,
+            "UPLOAD_BUSY"
+        )
+
+
+def _status(manifest: Dict, offset: int) -> Dict:
+    return {
+        "upload_id": manifest["upload_id"],
+        "filename": manifest["filename"],
+        "title": manifest.get("title"),
+        "size": manifest.get("size"),
+        "offset": offset,
+        "chunks": len(manifest["chunks"]),
+        "max_chunk_size": CHUNK_MAX_SIZE,
+        "created_at": manifest["created_at"]
+    }
+
+
+def sweep_stale_uploads() -> int:
+    """Remove uploads not appended to for CHUNKED_UPLOAD_TTL seconds; returns how many."""
+    cutoff = time.time() - CHUNKED_UPLOAD_TTL
+    removed = 0
+    try:
+        entries = list(os.scandir(CHUNKED_UPLOAD_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += entry.name.endswith(".json")
+        except FileNotFoundError:
+            pass
+    if removed:
+        logger.info(f"Removed {removed} stale chunked uploads")
+    return removed
+
+
+def start_upload(session_id: str, filename: str, title: Optional[str] = None, size: Optional[int] = None) -> Dict:
+    """Register a new resumable upload and return its status (offset 0)."""
+    ext = get_file_extension(filename)
+    if not is_supported_extension(ext):
+        raise ChunkedUploadError(f"Unsupported file type: {ext}", code="INVALID_FILE_TYPE")
+    if size is not None and size > CHUNKED_UPLOAD_MAX_SIZE:
+        raise ChunkedUploadError(
+            "File size exceeds maximum allowed size",
+            status.HTTP_413_CONTENT_TOO_LARGE,
+            "FILE_TOO_LARGE",
+            {"max_size": CHUNKED_UPLOAD_MAX_SIZE, "size": size}
+        )
+    sweep_stale_uploads()
+
+    os.makedirs(CHUNKED_UPLOAD_DIR, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    data_path, manifest_path = _paths(upload_id)
+    open(data_path, "wb").close()
+    manifest = {
+        "upload_id": upload_id,
+        "session_id": session_id,
+        "filename": filename,
+        "title": title,
+        "size": size,
+        "chunks": [],  # [offset, length, sha256] per appended chunk
+        "created_at": datetime.now().isoformat()
+    }
+    _write_manifest(manifest_path, manifest)
+    return _status(manifest, 0)
+
+
+def get_upload(session_id: str, upload_id: str) -> Dict:
+    """Status of an upload; offset is where the next chunk must start."""
+    manifest = _read_manifest(upload_id, session_id)
+    data_path, _ = _paths(upload_id)
+    return _status(manifest, os.path.getsize(data_path))
+
+
+def _write_chunk(session_id: str, upload_id: str, offset: int, data: bytes, checksum: Optional[str]) -> Dict:
+    """Blocking part of append_chunk: check, write and record a received chunk under the upload's lock."""
+    data_path, manifest_path = _paths(upload_id)
+    with open(data_path, "r+b") as f:
+        _lock(f)
+        manifest = _read_manifest(upload_id, session_id)  # Re-read under the lock
+        current = os.fstat(f.fileno()).st_size
+        if offset != current:
+            raise ChunkedUploadError(
+                "Chunk offset does not match the bytes received so far",
+                status.HTTP_409_CONFLICT,
+                "OFFSET_MISMATCH",
+                {"offset": current}
+            )
+        sha256 = hashlib.sha256(data).hexdigest()
+        if checksum and sha256 != checksum.lower():
+            raise ChunkedUploadError(
+                "Chunk checksum does not match",
+                code="CHECKSUM_MISMATCH",
+                details={"offset": offset, "sha256": sha256}
+            )
+
+        f.seek(offset)
+        try:
+            f.write(data)
+            f.flush()
+        except BaseException:
+            # Drop a partial write so the chunk can be resent
+            f.truncate(offset)
+            raise
+
+        manifest["chunks"].append([offset, len(data), sha256])
+        _write_manifest(manifest_path, manifest)
+        return _status(manifest, offset + len(data))
+
+
+async def append_chunk(
+    session_id: str,
+    upload_id: str,
+    offset: int,
+    body: AsyncIterator[bytes],
+    checksum: Optional[str] = None
+) -> Dict:
+    """
+    Append one chunk, streamed from body, at offset (which must equal the bytes
+    received so far). The chunk is received into memory (at most CHUNK_MAX_SIZE),
+    then checked against checksum (its SHA-256) when given, and written on the
+    thread pool. Nothing is written unless the whole chunk is accepted, so on
+    any failure the client can resend it.
+    """
+    # Fail fast, before receiving the body; checked again under the lock
+    upload = await run_in_thread(get_upload, session_id, upload_id)
+    if offset != upload["offset"]:
+        raise ChunkedUploadError(
+            "Chunk offset does not match the bytes received so far",
+            status.HTTP_409_CONFLICT,
+            "OFFSET_MISMATCH",
+            {"offset": upload["offset"]}
+        )
+    limit = CHUNKED_UPLOAD_MAX_SIZE if upload["size"] is None else upload["size"]
+
+    data = bytearray()
+    async for part in body:
+        if len(data) + len(part) > CHUNK_MAX_SIZE or offset + len(data) + len(part) > limit:
+            raise ChunkedUploadError(
+                "Chunk exceeds the allowed size",
+                status.HTTP_413_CONTENT_TOO_LARGE,
+                "CHUNK_TOO_LARGE",
+                {"max_chunk_size": CHUNK_MAX_SIZE, "max_size": limit, "offset": offset}
+            )
+        data += part
+    return await run_in_thread(_write_chunk, session_id, upload_id, offset, data, checksum)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def finalize_upload(session_id: str, upload_id: str, checksum: Optional[str] = None) -> Dict:
+    """
+    Check an upload is complete (declared size reached, whole-file SHA-256 matches
+    when given) and hand over its file: returns {path, filename, title, size}.
+    The manifest is removed; the caller owns (and must delete) the file afterwards.
+    """
+    _read_manifest(upload_id, session_id)
+    data_path, manifest_path = _paths(upload_id)
+    with open(data_path, "rb") as f:
+        _lock(f)
+        manifest = _read_manifest(upload_id, session_id)
+        size = os.fstat(f.fileno()).st_size
+        if manifest.get("size") is not None and size != manifest["size"]:
+            raise ChunkedUploadError(
+                "Upload is incomplete",
+                code="UPLOAD_INCOMPLETE",
+                details={"offset": size, "size": manifest["size"]}
+            )
+        if size == 0:
+            raise ChunkedUploadError("Upload is empty", code="UPLOAD_INCOMPLETE", details={"offset": 0})
+        if checksum and _file_sha256(data_path) != checksum.lower():
+            raise ChunkedUploadError("File checksum does not match", code="CHECKSUM_MISMATCH")
+
+        # Give the data file the upload's extension, which the parsers dispatch on
+        path = data_path[:-len(".part")] + get_file_extension(manifest["filename"])
+        os.replace(data_path, path)
+        os.remove(manifest_path)
+    return {"path": path, "filename": manifest["filename"], "title": manifest.get("title"), "size": size}
+
+
+def abort_upload(session_id: str, upload_id: str):
+    """Discard an unfinished upload."""
+    _read_manifest(upload_id, session_id)
+    for path in _paths(upload_id):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,13 +1,20 @@
-from typing import Dict, Optional, Tuple
+import os
+import time
+import logging
+from typing import Awaitable, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 import pandas as pd
-import numpy as np
-import hashlib
 from datetime import datetime
-from app.utils.helpers import get_dataframe_preview, sanitize_for_json
-from app.utils.parsers import parse_dataframe_from_bytes, parse_dataframe_from_path
-from app.utils.session_cache import SessionCache
+from app.utils.helpers import get_dataframe_preview, get_file_extension, sanitize_for_json
+from app.utils.dtypes import clean_dataframe, optimize_dtypes
+from app.utils.fingerprint import fingerprint_dataframe
+from app.utils.ingest_artifacts import load_ingest_artifacts, write_ingest_artifacts
+from app.utils.parsers import parse_dataframe_from_bytes, parse_dataframe_from_file, parse_dataframe_from_path
+from app.utils.session_cache import SessionCache, CacheQuotaError
+from app.core.executor import ExecutorError
 from fastapi import HTTPException, status
 
+logger = logging.getLogger(__name__)
+
 class DatasetProcessingError(Exception):
     """Custom exception for dataset processing errors."""
     def __init__(self, message: str, status_code: int = status.HTTP_400_BAD_REQUEST, details: Optional[Dict] = None):
@@ -28,10 +35,13 @@ def process_dataframe(
     """
     try:
         # Clean DataFrame
-        df_clean = df.replace([np.inf, -np.inf], np.nan).where(pd.notnull(df), None)
+        df_clean = clean_dataframe(df)
+        
+        # Downcast numerics and compact string columns
+        df_clean, memory = optimize_dtypes(df_clean)
         
-        # Generate hash
-        df_hash = hashlib.sha256(df_clean.to_csv(index=False).encode("utf-8")).hexdigest()
+        # Generate hash (per-column digests do not depend on the widths chosen above)
+        df_hash, column_hashes = fingerprint_dataframe(df_clean)
         
         # Generate preview
         preview = get_dataframe_preview(df_clean)
@@ -45,8 +55,11 @@ def process_dataframe(
             "created_at": datetime.now().isoformat(),
             "summary": None,  # Will be populated by GPT later
             "num_rows": len(df_clean),
-            "size": size or len(df_clean.to_csv(index=False).encode("utf-8")),
-            "hash": df_hash
+            "size": size or memory["before_bytes"],  # In-memory size when the file size is unknown
+            "hash": df_hash,
+            "column_hashes": column_hashes,
+            "parse_stats": df.attrs.get("parse_stats"),  # Engine and rows/sec, when parsed from a file
+            "memory": memory  # In-memory bytes before/after dtype optimization
         }
         
         return df_clean, meta, df_hash
@@ -57,7 +70,53 @@ def process_dataframe(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
         )
 
-def validate_and_cache_dataset(
+def load_saved_dataset(
+    file_path: str,
+    filename: str,
+    title: Optional[str] = None
+) -> Tuple[pd.DataFrame, Dict, str]:
+    """
+    Load a dataset saved in the uploads folder. Its Parquet copy and precomputed
+    metadata are used when current; otherwise the file is parsed and processed
+    as usual and the artifacts are written for the next load.
+    Returns: (cleaned_df, metadata_dict, df_hash)
+    """
+    start = time.perf_counter()
+    artifacts = load_ingest_artifacts(file_path)
+    if artifacts is None:
+        df = parse_dataframe_from_path(file_path, get_file_extension(file_path))
+        df_clean, meta, df_hash = process_dataframe(df, filename, title, os.path.getsize(file_path))
+        del df
+        try:
+            write_ingest_artifacts(file_path, df_clean, df_hash, meta["column_hashes"])
+        except OSError as e:
+            logger.warning(f"Failed to write ingest artifacts for {file_path}: {e}")
+        return df_clean, meta, df_hash
+
+    df_clean, sidecar = artifacts
+    seconds = time.perf_counter() - start
+    meta = {
+        "filename": filename,
+        "title": title or filename,
+        "columns": list(df_clean.columns),
+        "preview": sidecar["preview"],
+        "created_at": datetime.now().isoformat(),
+        "summary": None,
+        "num_rows": len(df_clean),
+        "size": os.path.getsize(file_path),
+        "hash": sidecar["hash"],
+        "column_hashes": sidecar["column_hashes"],
+        "parse_stats": {
+            "engine": "artifacts",
+            "rows": len(df_clean),
+            "seconds": round(seconds, 4),
+            "rows_per_sec": round(len(df_clean) / seconds) if seconds > 0 else len(df_clean)
+        },
+        "memory": {"before_bytes": sidecar["memory_bytes"], "after_bytes": sidecar["memory_bytes"], "converted": {}}
+    }
+    return df_clean, meta, sidecar["hash"]
+
+async def validate_and_cache_dataset(
     session_id: str,
     df_clean: pd.DataFrame,
     meta: Dict,
@@ -69,7 +128,7 @@ def validate_and_cache_dataset(
     """
     try:
         # Check for duplicates
-        duplicate_type = SessionCache.has_duplicate_dataset(session_id, df_hash, meta["title"])
+        duplicate_type = await SessionCache.has_duplicate_dataset(session_id, df_hash, meta["title"])
         if duplicate_type:
             raise DatasetProcessingError(
                 f"A dataset with the same {duplicate_type} already exists in your session.",
@@ -78,7 +137,13 @@ def validate_and_cache_dataset(
         
         # Cache dataset
         try:
-            SessionCache.add_dataset(session_id, meta, df_clean)
+            await SessionCache.add_dataset(session_id, meta, df_clean)
+        except CacheQuotaError as e:
+            raise DatasetProcessingError(
+                "Dataset is too large for the session cache",
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                details={"cache_bytes": e.nbytes, "quota_bytes": e.quota}
+            )
         except Exception as e:
             raise DatasetProcessingError(
                 "Failed to cache dataset",
@@ -96,30 +161,116 @@ def validate_and_cache_dataset(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-def get_session_dataset(session_id: str) -> Tuple[Dict, pd.DataFrame]:
+async def get_session_meta(session_id: str) -> Dict:
     """
-    Get dataset and metadata from session cache.
-    Returns: (metadata, dataframe)
+    Get only the dataset metadata from session cache.
+    Returns: metadata
     """
     try:
-        meta = SessionCache.get_dataset_meta(session_id)
+        meta = await SessionCache.get_dataset_meta(session_id)
         if not meta:
             raise DatasetProcessingError(
                 "No dataset found in session",
                 status_code=status.HTTP_404_NOT_FOUND
             )
+        return sanitize_for_json(meta)
+        
+    except DatasetProcessingError:
+        raise
+    except Exception as e:
+        raise DatasetProcessingError(
+            f"Failed to retrieve dataset meta: {str(e)}",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+def _validate_columns(meta: Dict, columns: Optional[List[str]]):
+    """Reject column projections that do not exist in the session dataset."""
+    if columns is None:
+        return
+    unknown = [c for c in columns if c not in (meta.get("columns") or [])]
+    if unknown:
+        raise DatasetProcessingError(
+            "Unknown columns requested",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            details={"unknown_columns": unknown}
+        )
+
+async def get_session_dataset(
+    session_id: str,
+    columns: Optional[List[str]] = None
+) -> Tuple[Dict, pd.DataFrame]:
+    """
+    Get dataset and metadata from session cache.
+    Only the requested columns are loaded; all columns if None.
+    Returns: (metadata, dataframe)
+    """
+    try:
+        meta = await get_session_meta(session_id)
+        _validate_columns(meta, columns)
         
-        df = SessionCache.get_dataset_data(session_id)
+        df = await SessionCache.get_dataset_data(session_id, columns)
         if df is None:
             raise DatasetProcessingError(
                 "Dataset data not found in cache",
                 status_code=status.HTTP_404_NOT_FOUND
             )
             
-        return sanitize_for_json(meta), df
+        return meta, df
+        
+    except DatasetProcessingError:
+        raise
+    except ExecutorError as e:
+        raise DatasetProcessingError(e.message, status_code=e.status_code, details=e.details)
+    except Exception as e:
+        raise DatasetProcessingError(
+            f"Failed to retrieve dataset: {str(e)}",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+def session_dataset_loader(session_id: str) -> Callable[[], Awaitable[pd.DataFrame]]:
+    """
+    Return an awaitable loader for the session DataFrame.
+    The frame is fetched on the first call only, so callers can defer loading until needed.
+    """
+    loaded: List[pd.DataFrame] = []
+
+    async def load() -> pd.DataFrame:
+        if not loaded:
+            _, df = await get_session_dataset(session_id)
+            loaded.append(df)
+        return loaded[0]
+
+    return load
+
+async def get_session_dataset_page(
+    session_id: str,
+    page: int,
+    page_size: int,
+    columns: Optional[List[str]] = None
+) -> Tuple[Dict, pd.DataFrame, int]:
+    """
+    Get one page of the session dataset, fetching only the row groups it covers.
+    Returns: (metadata, page_dataframe, total_rows)
+    """
+    try:
+        meta = await get_session_meta(session_id)
+        _validate_columns(meta, columns)
+        
+        start = (page - 1) * page_size
+        df = await SessionCache.get_dataset_rows(session_id, start, start + page_size, columns)
+        if df is None:
+            raise DatasetProcessingError(
+                "Dataset data not found in cache",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        
+        total_rows = meta.get("manifest", {}).get("num_rows", meta.get("num_rows", 0))
+        return meta, df, total_rows
         
     except DatasetProcessingError:
         raise
+    except ExecutorError as e:
+        raise DatasetProcessingError(e.message, status_code=e.status_code, details=e.details)
     except Exception as e:
         raise DatasetProcessingError(
             f"Failed to retrieve dataset: {str(e)}",
@@ -127,19 +278,23 @@ def get_session_dataset(session_id: str) -> Tuple[Dict, pd.DataFrame]:
         )
 
 def parse_and_process_file(
-    file_bytes: bytes,
+    source: Union[bytes, BinaryIO],
     filename: str,
     title: Optional[str] = None,
     size: Optional[int] = None
 ) -> Tuple[pd.DataFrame, Dict]:
     """
-    Parse file bytes into DataFrame and process it.
+    Parse file bytes or a binary file object (e.g. a spooled upload) into a
+    DataFrame and process it.
     Returns: (cleaned_df, metadata)
     """
     try:
         # Parse DataFrame
-        ext = filename.split(".")[-1].lower()
-        df = parse_dataframe_from_bytes(file_bytes, f".{ext}")
+        ext = get_file_extension(filename)
+        if isinstance(source, (bytes, bytearray)):
+            df = parse_dataframe_from_bytes(source, ext)
+        else:
+            df = parse_dataframe_from_file(source, ext)
         
         # Process DataFrame
         df_clean, meta, _ = process_dataframe(df, filename, title, size)
@@ -1,4 +1,4 @@
-from typing import Dict, Optional, List, Any
+from typing import Awaitable, Callable, Dict, Optional, List, Any
 import pandas as pd
 import logging
 from app.utils.session_cache import SessionCache, RedisCacheError
@@ -87,22 +87,24 @@ class GPTService:
             }
         ]
 
-def get_cached_gpt_insights(
+async def get_cached_gpt_insights(
     session_id: str,
-    df: pd.DataFrame,
+    load_df: Callable[[], Awaitable[pd.DataFrame]],
     analysis_results: Dict[str, Any]
 ) -> Dict[str, Any]:
     """
     Get GPT insights from cache or generate new ones.
+    The DataFrame is only loaded (via load_df) on a cache miss.
     Returns dict with all GPT-generated content.
     """
     try:
         # Try to get from cache
-        cached = SessionCache.get_analysis_result(session_id, "gpt_insights")
+        cached = await SessionCache.get_analysis_result(session_id, "gpt_insights")
         if cached:
             return cached
         
         # Generate new insights
+        df = await load_df()
         gpt = GPTService()
         insights = {
             "summary": gpt.generate_dataset_summary(df, analysis_results),
@@ -118,13 +120,14 @@ def get_cached_gpt_insights(
         }
         
         # Cache results
-        SessionCache.set_analysis_result(session_id, "gpt_insights", insights)
+        await SessionCache.set_analysis_result(session_id, "gpt_insights", insights)
         
         return insights
         
     except RedisCacheError as e:
         logger.warning(f"Cache error in GPT insights: {str(e)}")
         # On cache error, compute but don't cache
+        df = await load_df()
         gpt = GPTService()
         return {
             "summary": gpt.generate_dataset_summary(df, analysis_results),
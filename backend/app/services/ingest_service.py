@@ -0,0 +1,304 @@
+# backend/app/services/ingest_service.py
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+import shutil
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional
+
+import pandas as pd
+from fastapi import status
+
+from app.core.executor import ExecutorError, run_in_thread
+from app.services.analysis_service import AnalysisConfig, get_cached_analysis
+from app.services.dataset_service import (
+    DatasetProcessingError,
+    load_saved_dataset,
+    process_dataframe,
+    validate_and_cache_dataset
+)
+from app.services.upload_service import UrlDownloadError, download_to_tempfile
+from app.utils.helpers import get_file_extension, sanitize_for_json
+from app.utils.parsers import DataFrameParseError, parse_dataframe_from_path
+from app.utils.session_cache import SessionCache, RedisCacheError
+
+logger = logging.getLogger(__name__)
+
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", 2))  # Jobs processed at once per worker
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", 100))  # Jobs allowed to wait per worker
+INGEST_ANALYZE = os.getenv("INGEST_ANALYZE", "true").lower() == "true"  # Pre-compute the default overview
+
+# Percent complete when each stage starts; downloads advance within their own range
+STAGES = {
+    "queued": 0,
+    "downloading": 0,
+    "parsing": 20,
+    "fingerprinting": 50,
+    "caching": 70,
+    "analyzing": 85,
+    "done": 100
+}
+
+
+class IngestJobError(Exception):
+    """Custom exception for background ingestion errors."""
+    def __init__(self, message: str, status_code: int = status.HTTP_400_BAD_REQUEST, details: Optional[Dict] = None):
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+        super().__init__(self.message)
+
+
+@dataclass
+class IngestJob:
+    """
+    One queued ingestion. Exactly one of path (a file on disk) or url is set;
+    delete_path marks a temp copy the job owns and removes when it finishes.
+    """
+    session_id: str
+    filename: str
+    title: Optional[str] = None
+    path: Optional[str] = None
+    url: Optional[str] = None
+    delete_path: bool = False
+    dataset_id: Optional[str] = None  # Set for datasets selected from the uploads folder
+    mime_type: str = "application/octet-stream"
+    message: str = "File uploaded to session and cached"
+    job_id: str = ""
+
+    def __post_init__(self):
+        self.job_id = self.job_id or uuid.uuid4().hex
+
+
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+
+
+def spool_upload_to_disk(fileobj: BinaryIO, filename: str) -> str:
+    """Copy an upload to a temp file that outlives the request; returns its path."""
+    fileobj.seek(0)
+    fd, path = tempfile.mkstemp(prefix="ingest-", suffix=get_file_extension(filename))
+    with os.fdopen(fd, "wb") as out:
+        shutil.copyfileobj(fileobj, out, 1024 * 1024)
+    return path
+
+
+async def _set_state(job: IngestJob, **updates):
+    updates["updated_at"] = datetime.now().isoformat()
+    if "stage" in updates and "percent" not in updates:
+        updates["percent"] = STAGES[updates["stage"]]
+    await SessionCache.set_job_state(job.job_id, updates)
+
+
+def _job_error(e: Exception) -> Dict:
+    """Error payload stored in a failed job's state (same fields as ErrorResponse)."""
+    if isinstance(e, (DatasetProcessingError, UrlDownloadError, IngestJobError)):
+        code = "DOWNLOAD_ERROR" if isinstance(e, UrlDownloadError) else "DATASET_PROCESSING_ERROR"
+        return {"message": e.message, "code": code, "status_code": e.status_code, "details": e.details}
+    if isinstance(e, ExecutorError):
+        return {"message": e.message, "code": e.code, "status_code": e.status_code, "details": e.details}
+    if isinstance(e, RedisCacheError):
+        return {
+            "message": "Cache service unavailable",
+            "code": "CACHE_ERROR",
+            "status_code": status.HTTP_503_SERVICE_UNAVAILABLE,
+            "details": {"error": str(e)}
+        }
+    return {
+        "message": "Unexpected error processing dataset",
+        "code": "INTERNAL_ERROR",
+        "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "details": {"error": str(e)}
+    }
+
+
+async def _download(job: IngestJob):
+    """Download a link-mode job's file to disk, reporting progress within the downloading stage."""
+    reported = -1
+
+    async def progress(received: int, total: Optional[int]):
+        nonlocal reported
+        if not total:
+            return
+        percent = STAGES["parsing"] * min(received, total) // total
+        if percent > reported:
+            reported = percent
+            await _set_state(job, percent=percent)
+
+    tmp, download = await download_to_tempfile(job.url, progress=progress)
+    with tmp:
+        job.path = await run_in_thread(spool_upload_to_disk, tmp, download["filename"])
+    job.delete_path = True
+    job.filename = download["filename"]
+    job.mime_type = download["mime_type"]
+
+
+async def _run_job(job: IngestJob):
+    started = time.perf_counter()
+    try:
+        if job.url:
+            await _set_state(job, status="running", stage="downloading")
+            await _download(job)
+
+        await _set_state(job, status="running", stage="parsing")
+        if job.dataset_id:
+            # Saved datasets load from their precomputed artifacts when current
+            try:
+                df_clean, meta, df_hash = await run_in_thread(load_saved_dataset, job.path, job.filename, job.title)
+            except DataFrameParseError as e:
+                raise IngestJobError(str(e), status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+            meta["id"] = job.dataset_id
+        else:
+            try:
+                df = await run_in_thread(parse_dataframe_from_path, job.path, get_file_extension(job.filename))
+            except DataFrameParseError as e:
+                raise IngestJobError(str(e), status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+            await _set_state(job, stage="fingerprinting")
+            size = os.path.getsize(job.path)
+            df_clean, meta, df_hash = await run_in_thread(process_dataframe, df, job.filename, job.title, size)
+            del df
+
+        await _set_state(job, stage="caching")
+        meta = await validate_and_cache_dataset(job.session_id, df_clean, meta, df_hash)
+
+        if INGEST_ANALYZE:
+            await _set_state(job, stage="analyzing")
+
+            async def load_df() -> pd.DataFrame:
+                return df_clean
+
+            try:
+                await get_cached_analysis(job.session_id, load_df, AnalysisConfig())
+            except Exception as e:
+                # The dataset is usable without it; the overview is computed on first request instead
+                logger.warning(f"Pre-computing analysis for job {job.job_id} failed: {e}")
+
+        result = {
+            "filename": meta["filename"],
+            "title": meta.get("title"),
+            "created_at": meta["created_at"],
+            "size": meta["size"],
+            "num_rows": meta.get("num_rows"),
+            "columns": meta.get("columns"),
+            "preview": meta.get("preview"),
+            "summary": meta.get("summary"),
+            "mime_type": job.mime_type,
+            "message": job.message
+        }
+        await _set_state(job, status="done", stage="done", result=sanitize_for_json(result))
+        logger.info(f"Ingest job {job.job_id} finished in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        logger.warning(f"Ingest job {job.job_id} failed: {e}")
+        try:
+            await _set_state(job, status="failed", error=_job_error(e))
+        except RedisCacheError:
+            logger.error(f"Could not record failure of ingest job {job.job_id}")
+    finally:
+        _discard(job)
+
+
+async def _worker():
+    while True:
+        job = await _queue.get()
+        try:
+            await _run_job(job)
+        finally:
+            _queue.task_done()
+        if asyncio.current_task().cancelling():
+            # Stopped by close_ingest_workers while the cancellation was swallowed
+            # mid-job (the Redis client may absorb it during a command)
+            break
+
+
+def _ensure_workers():
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+    _workers[:] = [task for task in _workers if not task.done()]
+    while len(_workers) < INGEST_CONCURRENCY:
+        _workers.append(asyncio.create_task(_worker()))
+
+
+async def init_ingest_workers():
+    """Start the ingestion workers. Called once at app startup."""
+    _ensure_workers()
+
+
+async def close_ingest_workers():
+    """Stop the ingestion workers. Called once at app shutdown; queued jobs are dropped."""
+    global _queue
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    if _queue is not None:
+        while not _queue.empty():
+            _discard(_queue.get_nowait())
+    _queue = None
+
+
+def _discard(job: IngestJob):
+    if job.delete_path and job.path and os.path.exists(job.path):
+        os.remove(job.path)
+
+
+def _queue_full_error() -> IngestJobError:
+    return IngestJobError(
+        "Too many datasets are being processed, please retry shortly",
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        details={"queue_size": INGEST_QUEUE_SIZE}
+    )
+
+
+async def enqueue_ingest_job(job: IngestJob) -> str:
+    """
+    Queue a job for the ingestion workers and record its state.
+    Raises IngestJobError (503) if the queue is full; the job's file is removed
+    whenever it is not queued.
+    """
+    _ensure_workers()
+    if _queue.full():
+        _discard(job)
+        raise _queue_full_error()
+    now = datetime.now().isoformat()
+    try:
+        await SessionCache.set_job_state(job.job_id, {
+            "job_id": job.job_id,
+            "session_id": job.session_id,
+            "filename": job.filename,
+            "status": "queued",
+            "stage": "queued",
+            "percent": 0,
+            "created_at": now,
+            "updated_at": now,
+            "error": None,
+            "result": None
+        })
+    except Exception:
+        _discard(job)
+        raise
+    try:
+        _queue.put_nowait(job)
+    except asyncio.QueueFull:  # Filled up while the state was written
+        _discard(job)
+        error = _queue_full_error()
+        try:
+            await _set_state(job, status="failed", error=_job_error(error))
+        except RedisCacheError:
+            logger.error(f"Could not record rejection of ingest job {job.job_id}")
+        raise error
+    return job.job_id
+
+
+async def get_ingest_job(job_id: str, session_id: str) -> Optional[Dict]:
+    """Get a job's state, or None if it does not exist or belongs to another session."""
+    state = await SessionCache.get_job_state(job_id)
+    if state is None or state.get("session_id") != session_id:
+        return None
+    return state
@@ -1,45 +1,120 @@
 # backend/app/services/upload_service.py
 
-import hashlib
+import asyncio
 import os
+import tempfile
 import uuid
 import aiohttp
 import pandas as pd
 import json
 from datetime import datetime
-from typing import Tuple, Optional
+from typing import Awaitable, BinaryIO, Callable, Dict, Tuple, Optional
+from urllib.parse import urlparse
+from fastapi import status
+from app.core.executor import run_in_thread
+from app.core.http import get_http_session
+from app.utils.fingerprint import fingerprint_dataframe
 from app.utils.helpers import get_dataframe_preview, get_file_extension, is_supported_extension
+from app.utils.ingest_artifacts import write_ingest_artifacts
 from app.utils.session_cache import SessionCache
+from app.utils.uploads_catalog import get_uploads_catalog
 
+MAX_DOWNLOAD_SIZE = int(os.getenv("MAX_DOWNLOAD_SIZE", os.getenv("MAX_FILE_SIZE", 100 * 1024 * 1024)))  # 100MB default
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_SPOOL_SIZE = 1024 * 1024  # Downloads larger than this are spooled to disk
 
-async def download_and_validate_file(url: str) -> Tuple[Optional[bytes], dict]:
+
+class UrlDownloadError(Exception):
+    """Custom exception for URL download errors."""
+    def __init__(self, message: str, status_code: int = status.HTTP_400_BAD_REQUEST, details: Optional[Dict] = None):
+        self.message = message
+        self.status_code = status_code
+        self.details = details
+        super().__init__(self.message)
+
+
+async def download_to_tempfile(
+    url: str,
+    max_bytes: int = MAX_DOWNLOAD_SIZE,
+    accept: Optional[Callable[[str], bool]] = None,
+    progress: Optional[Callable[[int, Optional[int]], Awaitable[None]]] = None
+) -> Tuple[BinaryIO, dict]:
+    """
+    Stream a URL into a spooled temp file using the shared HTTP session.
+    The download is aborted once it exceeds max_bytes or the configured timeouts.
+    accept optionally validates the response content-type before the body is read.
+    progress, if given, is awaited after each chunk with (bytes received, Content-Length or None).
+    Returns (file positioned at the start, metadata); raises UrlDownloadError.
+    """
+    tmp = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_SIZE)
+    try:
+        async with get_http_session().get(url) as resp:
+            if resp.status != 200:
+                raise UrlDownloadError(f"Failed to download file (HTTP {resp.status})")
+            content_type = resp.headers.get("Content-Type", "application/octet-stream")
+            if accept is not None and not accept(content_type):
+                raise UrlDownloadError(f"Unsupported content-type: {content_type}")
+            too_large = UrlDownloadError(
+                "Remote file exceeds maximum allowed size",
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                details={"max_size": max_bytes}
+            )
+            if resp.content_length is not None and resp.content_length > max_bytes:
+                raise too_large
+            size = 0
+            async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise too_large
+                tmp.write(chunk)
+                if progress is not None:
+                    await progress(size, resp.content_length)
+    except UrlDownloadError:
+        tmp.close()
+        raise
+    except asyncio.TimeoutError:
+        tmp.close()
+        raise UrlDownloadError("Timed out downloading file", status_code=status.HTTP_504_GATEWAY_TIMEOUT)
+    except aiohttp.ClientError as e:
+        tmp.close()
+        raise UrlDownloadError(
+            "Failed to download file",
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            details={"error": str(e)}
+        )
+    except BaseException:
+        tmp.close()
+        raise
+
+    tmp.seek(0)
+    meta = {
+        "filename": os.path.basename(urlparse(url).path),
+        "size": size,
+        "mime_type": content_type,
+    }
+    return tmp, meta
+
+
+async def download_and_validate_file(url: str) -> Tuple[Optional[BinaryIO], dict]:
     """
     Download a file from a URL and validate its extension/content-type.
-    Returns (file_bytes, metadata) or (None, error dict).
+    Returns (spooled file, metadata) or (None, error dict).
     """
     ext = get_file_extension(url)
     if not is_supported_extension(ext):
         return None, {"error": f"Unsupported file extension: {ext}"}
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                return None, {"error": f"File not reachable (HTTP {resp.status})"}
-            content_type = resp.headers.get("Content-Type", "")
-            if not any(
-                t in content_type for t in ["csv", "tsv", "excel", "spreadsheet"]
-            ):
-                return None, {"error": f"Unsupported content-type: {content_type}"}
-            data = await resp.read()
-            filename = url.split("/")[-1]
-            size = len(data)
-            meta = {
-                "filename": filename,
-                "size": size,
-                "mime_type": content_type,
-            }
-            return data, meta
-
-def save_session_dataset_to_uploads(
+    try:
+        return await download_to_tempfile(
+            url,
+            accept=lambda content_type: any(
+                t in content_type
+                for t in ["csv", "tsv", "excel", "spreadsheet", "parquet", "json", "gzip", "zstd", "octet-stream"]
+            )
+        )
+    except UrlDownloadError as e:
+        return None, {"error": e.message}
+
+async def save_session_dataset_to_uploads(
     session_id: str,
     uploads_dir: str,
     title: str = None
@@ -49,30 +124,26 @@ def save_session_dataset_to_uploads(
     Prevents duplicates by content (hash) or title in uploads.
     """
     # Fetch DataFrame and meta
-    df = SessionCache.get_dataset_data(session_id)
-    meta = SessionCache.get_dataset_meta(session_id)
+    df = await SessionCache.get_dataset_data(session_id)
+    meta = await SessionCache.get_dataset_meta(session_id)
     if df is None or meta is None:
         raise Exception("Dataset not found in session.")
 
-    df_hash = meta.get("hash") or hashlib.sha256(df.to_csv(index=False).encode("utf-8")).hexdigest()
+    df_hash = meta.get("hash") or get_df_hash(df)
     # Check for duplicate in uploads dir
-    for fname in os.listdir(uploads_dir):
-        if fname.endswith(".summary.json"):
-            try:
-                with open(os.path.join(uploads_dir, fname), "r") as f:
-                    exist_meta = json.load(f)
-                if exist_meta.get("hash") == df_hash:
-                    raise Exception("A dataset with the same content already exists in uploads.")
-                if title and exist_meta.get("title") == title:
-                    raise Exception("A dataset with the same title already exists in uploads.")
-            except Exception:
-                continue
+    catalog = get_uploads_catalog(uploads_dir)
+    duplicate = await run_in_thread(catalog.find_duplicate, df_hash, title)
+    if duplicate is not None:
+        kind = "content" if duplicate[0] == "hash" else "title"
+        raise Exception(f"A dataset with the same {kind} already exists in uploads.")
 
     # Use the provided title if given, else keep old
     dataset_id = meta.get("id")
     filename = f"{dataset_id}.csv"
     file_path = os.path.join(uploads_dir, filename)
     df.to_csv(file_path, index=False)
+    # Parquet copy and precomputed metadata, so selecting the dataset later skips parsing
+    await run_in_thread(write_ingest_artifacts, file_path, df, df_hash, meta.get("column_hashes"))
     try:
         stats = compute_basic_statistics(df)
         summary = summarize_with_gpt(stats)
@@ -96,36 +167,20 @@ def save_session_dataset_to_uploads(
     )
     with open(summary_path, "w") as f:
         json.dump(new_meta, f)
+    await run_in_thread(catalog.index_file, filename)
     return new_meta
 
 
 def list_datasets_with_summaries(uploads_dir: str) -> list:
     """
-    Return list of datasets in uploads folder with their summary metadata.
+    Return list of datasets in uploads folder with their summary metadata, newest first.
     """
-    datasets = []
-    for fname in os.listdir(uploads_dir):
-        if fname.endswith((".csv", ".tsv", ".xlsx")):
-            base = os.path.splitext(fname)[0]
-            summary_path = os.path.join(uploads_dir, f"{base}.summary.json")
-            meta = {"filename": fname}
-            if os.path.exists(summary_path):
-                try:
-                    with open(summary_path, "r") as f:
-                        meta.update(json.load(f))
-                except Exception:
-                    pass
-            meta["size"] = os.path.getsize(os.path.join(uploads_dir, fname))
-            meta["created_at"] = datetime.fromtimestamp(
-                os.path.getctime(os.path.join(uploads_dir, fname))
-            ).isoformat()
-            datasets.append(meta)
+    datasets, _ = get_uploads_catalog(uploads_dir).list()
     return datasets
 
 
 def get_df_hash(df):
-    csv_bytes = df.to_csv(index=False).encode("utf-8")
-    return hashlib.sha256(csv_bytes).hexdigest()
+    return fingerprint_dataframe(df)[0]
 
 def create_session_dataset_meta(dataset_id: str, title: str, filename: str, df: pd.DataFrame, summary: str, created_at: str, size: int, df_hash: str) -> dict:
     return {
@@ -141,5 +196,5 @@ def create_session_dataset_meta(dataset_id: str, title: str, filename: str, df:
         "hash": df_hash,
     }
 
-def add_dataset_to_session(session_id: str, meta: dict, df: pd.DataFrame):
-    SessionCache.add_dataset(session_id, meta, df)
\ No newline at end of file
+async def add_dataset_to_session(session_id: str, meta: dict, df: pd.DataFrame):
+    await SessionCache.add_dataset(session_id, meta, df)
\ No newline at end of file
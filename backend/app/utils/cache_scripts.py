@@ -0,0 +1,315 @@
+# backend/app/utils/cache_scripts.py
+"""
+Server-side Lua scripts used by SessionCache so that multi-key operations run
+atomically and in a single round trip.
+
+The scripts read plain-text hash fields that SessionCache maintains next to its
+encoded values: "_ref" on session meta (the referenced dataset hash), and
+"num_row_groups" and "nbytes" on shared dataset meta. Keys are derived inside the
+scripts, so they assume a single (non-cluster) Redis deployment.
+
+Memory accounting lives in global keys: cache:dataset_bytes (hash of dataset
+hash -> stored bytes, including analysis results), cache:total_bytes (running sum
+of that hash, kept in step by every write and release), cache:reconcile_cursor
+(HSCAN position of the sweep for expired datasets) and cache:sessions (sorted set
+of session ids scored by last access time).
+"""
+
+# Helpers shared by the scripts below.
+# touch: refreshes the TTL of a dataset's meta, refs, analyses and every row group
+#   (also those served from a worker's frame cache or not read yet), and of the
+#   reading session's meta and key registry, so nothing the session may still read
+#   expires before the session does.
+# total_bytes: the running total of stored bytes (seeded once from
+#   cache:dataset_bytes for caches written before the counter existed).
+# track / untrack: set or forget a dataset's stored bytes, keeping the total in step.
+# release: drops a session's reference to a shared dataset; deletes the dataset, its
+#   row groups and analysis results with the last reference. Returns 1 if deleted.
+# drop_session: removes every key of a session and releases its dataset.
+#   Returns the old hash (or false) and the release flag.
+# reconcile: forgets datasets whose keys have expired, continuing an HSCAN of
+#   cache:dataset_bytes where the previous call stopped. Bounded to
+#   RECONCILE_MAX_SCANS batches of RECONCILE_SCAN_COUNT entries per call.
+# evict: forgets sessions not accessed since stale_before (their keys have expired).
+#   Only when stored bytes exceed high_bytes, it reconciles a batch of datasets and
+#   then drops the least recently used sessions (never `protect`) until usage is
+#   below low_bytes. Returns the total stored bytes and the number of sessions evicted.
+_HELPERS = """
+local RECONCILE_SCAN_COUNT = 100
+local RECONCILE_MAX_SCANS = 10
+
+local function total_bytes()
+  local total = redis.call('GET', 'cache:total_bytes')
+  if total then
+    return tonumber(total)
+  end
+  local sum = 0
+  for _, nbytes in ipairs(redis.call('HVALS', 'cache:dataset_bytes')) do
+    sum = sum + tonumber(nbytes)
+  end
+  redis.call('SET', 'cache:total_bytes', sum)
+  return sum
+end
+
+local function track(hash, nbytes)
+  total_bytes()
+  local old = tonumber(redis.call('HGET', 'cache:dataset_bytes', hash) or '0')
+  redis.call('HSET', 'cache:dataset_bytes', hash, nbytes)
+  redis.call('INCRBY', 'cache:total_bytes', nbytes - old)
+end
+
+local function untrack(hash)
+  total_bytes()
+  local old = redis.call('HGET', 'cache:dataset_bytes', hash)
+  if old then
+    redis.call('HDEL', 'cache:dataset_bytes', hash)
+    redis.call('DECRBY', 'cache:total_bytes', tonumber(old))
+  end
+end
+
+local function touch(hash, session_id, ttl)
+  local prefix = 'dataset:' .. hash .. ':'
+  local n = tonumber(redis.call('HGET', prefix .. 'meta', 'num_row_groups') or '0')
+  for i = 0, n - 1 do
+    redis.call('EXPIRE', prefix .. 'rg:' .. i, ttl)
+  end
+  redis.call('EXPIRE', prefix .. 'meta', ttl)
+  redis.call('EXPIRE', prefix .. 'refs', ttl)
+  redis.call('EXPIRE', prefix .. 'analyses', ttl)
+  redis.call('EXPIRE', 'session:' .. session_id .. ':dataset:meta', ttl)
+  local registry = 'session:' .. session_id .. ':keys'
+  if redis.call('TTL', registry) < tonumber(ttl) then  -- Never shorten it (see _queue_register)
+    redis.call('EXPIRE', registry, ttl)
+  end
+end
+
+local function release(hash, session_id)
+  local prefix = 'dataset:' .. hash .. ':'
+  redis.call('SREM', prefix .. 'refs', session_id)
+  if redis.call('SCARD', prefix .. 'refs') > 0 then
+    return 0
+  end
+  local n = tonumber(redis.call('HGET', prefix .. 'meta', 'num_row_groups') or '0')
+  for i = 0, n - 1 do
+    redis.call('UNLINK', prefix .. 'rg:' .. i)
+  end
+  for _, key in ipairs(redis.call('SMEMBERS', prefix .. 'analyses')) do
+    redis.call('UNLINK', key)
+  end
+  redis.call('UNLINK', prefix .. 'meta', prefix .. 'refs', prefix .. 'analyses')
+  untrack(hash)
+  return 1
+end
+
+local function drop_session(session_id)
+  local meta_key = 'session:' .. session_id .. ':dataset:meta'
+  local registry = 'session:' .. session_id .. ':keys'
+  local old = redis.call('HGET', meta_key, '_ref')
+  local released = 0
+  if old then
+    released = release(old, session_id)
+  end
+  for _, key in ipairs(redis.call('SMEMBERS', registry)) do
+    redis.call('UNLINK', key)
+  end
+  redis.call('UNLINK', meta_key, registry)
+  redis.call('ZREM', 'cache:sessions', session_id)
+  return old, released
+end
+
+local function reconcile()
+  local cursor = redis.call('GET', 'cache:reconcile_cursor') or '0'
+  for _ = 1, RECONCILE_MAX_SCANS do
+    local page = redis.call('HSCAN', 'cache:dataset_bytes', cursor, 'COUNT', RECONCILE_SCAN_COUNT)
+    cursor = page[1]
+    local entries = page[2]
+    for i = 1, #entries, 2 do
+      if redis.call('EXISTS', 'dataset:' .. entries[i] .. ':meta') == 0 then
+        untrack(entries[i])  -- Expired
+      end
+    end
+    if cursor == '0' then
+      break
+    end
+  end
+  redis.call('SET', 'cache:reconcile_cursor', cursor)
+end
+
+local function evict(high_bytes, low_bytes, protect, stale_before)
+  redis.call('ZREMRANGEBYSCORE', 'cache:sessions', '-inf', '(' .. stale_before)
+  if high_bytes <= 0 or total_bytes() <= high_bytes then
+    return total_bytes(), 0
+  end
+  -- Expired datasets may be what is over the watermark; forget them before evicting live sessions
+  reconcile()
+  local evicted, skip = 0, 0
+  while total_bytes() > low_bytes and evicted < 100 do
+    local coldest = redis.call('ZRANGE', 'cache:sessions', skip, skip)
+    if #coldest == 0 then
+      break
+    end
+    if coldest[1] == protect then
+      skip = skip + 1
+    else
+      drop_session(coldest[1])
+      evicted = evicted + 1
+    end
+  end
+  return total_bytes(), evicted
+end
+"""
+
+# KEYS: session meta, session key registry
+# ARGV: session id, new hash, ttl, reset ("1" drops all session keys first), now,
+#       quota bytes, high watermark bytes, low watermark bytes, stale-before time,
+#       then alternating meta field names and encoded values
+# The session meta also gets a copy of the stored manifest, which is returned.
+# Returns {0} if the shared dataset does not exist (caller must store it first),
+# {-1, dataset bytes} if it exceeds the quota, otherwise
+# {1, old hash or false, 1 if the old dataset was deleted, manifest, total bytes, evicted}.
+REPLACE_DATASET = _HELPERS + """
+local meta_key, registry = KEYS[1], KEYS[2]
+local session_id, new_hash, ttl = ARGV[1], ARGV[2], tonumber(ARGV[3])
+local quota = tonumber(ARGV[6])
+local prefix = 'dataset:' .. new_hash .. ':'
+if redis.call('EXISTS', prefix .. 'meta') == 0 then
+  return {0}
+end
+local nbytes = tonumber(redis.call('HGET', prefix .. 'meta', 'nbytes') or '0')
+if quota > 0 and nbytes > quota then
+  return {-1, nbytes}
+end
+
+local old = redis.call('HGET', meta_key, '_ref')
+local released = 0
+if old and old ~= new_hash then
+  released = release(old, session_id)
+end
+if ARGV[4] == '1' then
+  for _, key in ipairs(redis.call('SMEMBERS', registry)) do
+    redis.call('UNLINK', key)
+  end
+  redis.call('UNLINK', meta_key, registry)
+end
+
+redis.call('SADD', prefix .. 'refs', session_id)
+local n = tonumber(redis.call('HGET', prefix .. 'meta', 'num_row_groups') or '0')
+for i = 0, n - 1 do
+  redis.call('EXPIRE', prefix .. 'rg:' .. i, ttl)
+end
+redis.call('EXPIRE', prefix .. 'meta', ttl)
+redis.call('EXPIRE', prefix .. 'refs', ttl)
+redis.call('EXPIRE', prefix .. 'analyses', ttl)
+track(new_hash, nbytes)
+
+if #ARGV > 9 then
+  redis.call('HSET', meta_key, '_ref', new_hash, unpack(ARGV, 10))
+else
+  redis.call('HSET', meta_key, '_ref', new_hash)
+end
+local manifest = redis.call('HGET', prefix .. 'meta', 'manifest')
+redis.call('HSET', meta_key, 'manifest', manifest)
+redis.call('EXPIRE', meta_key, ttl)
+redis.call('SADD', registry, meta_key)
+redis.call('EXPIRE', registry, ttl)
+redis.call('ZADD', 'cache:sessions', ARGV[5], session_id)
+
+local total, evicted = evict(tonumber(ARGV[7]), tonumber(ARGV[8]), session_id, ARGV[9])
+return {1, old, released, manifest, total, evicted}
+"""
+
+# ARGV: session id
+# Returns {old hash or false, 1 if the old dataset was deleted}.
+REMOVE_DATASET = _HELPERS + """
+local old, released = drop_session(ARGV[1])
+return {old, released}
+"""
+
+# KEYS: session meta
+# ARGV: expected hash, ttl, session id, now, number of row groups, then per row group:
+#       group index, column count, column names...
+# Returns {0, encoded manifest or false} if the session no longer references the
+# expected hash, otherwise {1, {values of group 1}, {values of group 2}, ...}.
+READ_ROW_GROUPS = _HELPERS + """
+local ref = redis.call('HGET', KEYS[1], '_ref')
+if ref ~= ARGV[1] then
+  return {0, redis.call('HGET', KEYS[1], 'manifest')}
+end
+redis.call('ZADD', 'cache:sessions', ARGV[4], ARGV[3])
+touch(ref, ARGV[3], ARGV[2])
+local out = {1}
+local pos = 6
+for g = 1, tonumber(ARGV[5]) do
+  local key = 'dataset:' .. ref .. ':rg:' .. ARGV[pos]
+  local ncols = tonumber(ARGV[pos + 1])
+  out[#out + 1] = redis.call('HMGET', key, unpack(ARGV, pos + 2, pos + 1 + ncols))
+  pos = pos + 2 + ncols
+end
+return out
+"""
+
+# KEYS: session meta
+# ARGV: analysis type, ttl, session id, now
+# Returns the encoded result (refreshing its TTL and the dataset's) or false.
+GET_ANALYSIS = _HELPERS + """
+local ref = redis.call('HGET', KEYS[1], '_ref')
+if not ref then
+  return false
+end
+redis.call('ZADD', 'cache:sessions', ARGV[4], ARGV[3])
+touch(ref, ARGV[3], ARGV[2])
+local key = 'dataset:' .. ref .. ':analysis:' .. ARGV[1]
+local data = redis.call('GET', key)
+if data then
+  redis.call('EXPIRE', key, ARGV[2])
+end
+return data
+"""
+
+# KEYS: session meta
+# ARGV: analysis type, encoded result, ttl, index ttl, session id, now,
+#       quota bytes, high watermark bytes, low watermark bytes, stale-before time
+# Returns 0 if the session has no dataset, -1 if storing the result would exceed
+# the quota (nothing is written), 1 otherwise.
+SET_ANALYSIS = _HELPERS + """
+local ref = redis.call('HGET', KEYS[1], '_ref')
+if not ref then
+  return 0
+end
+local prefix = 'dataset:' .. ref .. ':'
+local key = prefix .. 'analysis:' .. ARGV[1]
+local delta = string.len(ARGV[2]) - redis.call('STRLEN', key)
+local nbytes = tonumber(redis.call('HGET', prefix .. 'meta', 'nbytes') or '0')
+local quota = tonumber(ARGV[7])
+if quota > 0 and nbytes + delta > quota then
+  return -1
+end
+redis.call('SET', key, ARGV[2], 'EX', ARGV[3])
+redis.call('SADD', prefix .. 'analyses', key)
+redis.call('EXPIRE', prefix .. 'analyses', ARGV[4])
+if redis.call('EXISTS', prefix .. 'meta') == 1 then
+  track(ref, redis.call('HINCRBY', prefix .. 'meta', 'nbytes', delta))
+end
+redis.call('ZADD', 'cache:sessions', ARGV[6], ARGV[5])
+evict(tonumber(ARGV[8]), tonumber(ARGV[9]), ARGV[5], ARGV[10])
+return 1
+"""
+
+# KEYS: session meta
+# ARGV: high watermark bytes, low watermark bytes, stale-before time
+# Returns {total bytes, sessions evicted, tracked sessions, tracked datasets,
+#          bytes of the session's dataset or false}.
+USAGE = _HELPERS + """
+local total, evicted = evict(tonumber(ARGV[1]), tonumber(ARGV[2]), '', ARGV[3])
+local ref = redis.call('HGET', KEYS[1], '_ref')
+local session_bytes = false
+if ref then
+  session_bytes = tonumber(redis.call('HGET', 'dataset:' .. ref .. ':meta', 'nbytes') or '0')
+end
+return {
+  total, evicted,
+  redis.call('ZCARD', 'cache:sessions'),
+  redis.call('HLEN', 'cache:dataset_bytes'),
+  session_bytes
+}
+"""
@@ -0,0 +1,111 @@
+# backend/app/utils/codecs.py
+
+import functools
+import os
+from typing import Callable, Dict, NamedTuple, Optional
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # Optional dependency
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+# Codec spec for every cache write: "none", "lz4", "zstd" or "zstd:<level>"
+CACHE_CODEC = os.getenv("CACHE_CODEC", "none")
+# Values smaller than this are stored uncompressed (still framed)
+CACHE_CODEC_MIN_SIZE = int(os.getenv("CACHE_CODEC_MIN_SIZE", 1024))
+
+# Every encoded value starts with MAGIC followed by a one-byte codec id
+MAGIC = b"\x00Z"
+HEADER_SIZE = len(MAGIC) + 1
+
+
+class CodecError(Exception):
+    """Custom exception for cache value encoding errors."""
+
+
+class Codec(NamedTuple):
+    name: str
+    codec_id: int
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+@functools.lru_cache(maxsize=None)
+def _lz4_codec() -> Codec:
+    if lz4_frame is None:
+        raise CodecError("Codec 'lz4' requires the 'lz4' package")
+    return Codec("lz4", 1, lz4_frame.compress, lz4_frame.decompress)
+
+
+@functools.lru_cache(maxsize=None)
+def _zstd_codec(level: int = 3) -> Codec:
+    if zstandard is None:
+        raise CodecError("Codec 'zstd' requires the 'zstandard' package")
+    # zstandard contexts are not thread-safe, so each call gets its own
+    return Codec(
+        f"zstd:{level}",
+        2,
+        lambda data: zstandard.ZstdCompressor(level=level).compress(data),
+        # Frames written by ZstdCompressor.compress always embed the content size
+        lambda data: zstandard.ZstdDecompressor().decompress(data)
+    )
+
+
+NONE_CODEC = Codec("none", 0, bytes, bytes)
+
+
+def get_codec(spec: str) -> Codec:
+    """
+    Resolve a codec spec such as "none", "lz4" or "zstd:9".
+    Raises CodecError for unknown or unavailable codecs.
+    """
+    name, _, level = spec.strip().lower().partition(":")
+    if name == "none":
+        return NONE_CODEC
+    if name == "lz4":
+        return _lz4_codec()
+    if name == "zstd":
+        try:
+            return _zstd_codec(int(level) if level else 3)
+        except ValueError:
+            raise CodecError(f"Invalid zstd level: {level}")
+    raise CodecError(f"Unknown codec: {spec}")
+
+
+_decoders: Dict[int, Callable[[], Codec]] = {
+    0: lambda: NONE_CODEC,
+    1: _lz4_codec,
+    2: _zstd_codec,
+}
+
+DEFAULT_CODEC = get_codec(CACHE_CODEC)
+
+
+def encode(data: bytes, codec: Optional[Codec] = None) -> bytes:
+    """Compress a value and prefix it with a header recording the codec used."""
+    codec = codec or DEFAULT_CODEC
+    if len(data) < CACHE_CODEC_MIN_SIZE:
+        codec = NONE_CODEC
+    try:
+        return MAGIC + bytes([codec.codec_id]) + codec.compress(data)
+    except Exception as e:
+        raise CodecError(f"Failed to encode value with {codec.name}: {e}")
+
+
+def decode(data: bytes) -> bytes:
+    """Decode a value written by encode; values without a header are returned as-is."""
+    if not data.startswith(MAGIC):
+        return data
+    codec_id = data[len(MAGIC)]
+    if codec_id not in _decoders:
+        raise CodecError(f"Unknown codec id: {codec_id}")
+    codec = _decoders[codec_id]()
+    try:
+        return codec.decompress(data[HEADER_SIZE:])
+    except Exception as e:
+        raise CodecError(f"Failed to decode value with {codec.name}: {e}")
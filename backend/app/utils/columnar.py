@@ -0,0 +1,44 @@
+# backend/app/utils/columnar.py
+
+import pickle
+from typing import Dict
+
+import pandas as pd
+import pyarrow as pa
+
+# One-byte tags prefixed to every serialized column
+ARROW_TAG = b"A"
+PICKLE_TAG = b"P"
+
+
+def serialize_column(series: pd.Series) -> bytes:
+    """
+    Serialize a single column as an Arrow IPC stream.
+    Falls back to pickle for columns Arrow cannot represent (e.g. mixed objects).
+    """
+    try:
+        table = pa.Table.from_pandas(series.to_frame(), preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return ARROW_TAG + sink.getvalue().to_pybytes()
+    except (pa.ArrowException, TypeError, ValueError):
+        return PICKLE_TAG + pickle.dumps(series)
+
+
+def deserialize_column(data: bytes) -> pd.Series:
+    """Inverse of serialize_column."""
+    tag, payload = data[:1], data[1:]
+    if tag == ARROW_TAG:
+        with pa.ipc.open_stream(pa.BufferReader(payload)) as reader:
+            frame = reader.read_all().to_pandas()
+        return frame.iloc[:, 0]
+    if tag == PICKLE_TAG:
+        return pickle.loads(payload)
+    raise ValueError(f"Unknown column encoding: {tag!r}")
+
+
+def serialize_columns(df: pd.DataFrame) -> Dict[str, bytes]:
+    """Serialize every column of a DataFrame, keyed by column name."""
+    return {str(col): serialize_column(df[col]) for col in df.columns}
+
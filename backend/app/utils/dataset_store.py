@@ -0,0 +1,170 @@
+# backend/app/utils/dataset_store.py
+
+import os
+import re
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+CACHE_DISK_DIR = os.getenv(
+    "CACHE_DISK_DIR", os.path.join(tempfile.gettempdir(), "ai-insights-cache")
+)
+
+_HASH_RE = re.compile(r"^[0-9A-Za-z_-]+$")
+
+
+class DatasetStore(ABC):
+    """
+    Local storage tier for dataset contents that SessionCache keeps out of Redis.
+    Redis then only holds the manifest, which points at the store by name.
+    Contents are content-addressed, so a stored hash is never rewritten.
+    """
+
+    name: str
+
+    @abstractmethod
+    def write(self, df_hash: str, df: pd.DataFrame) -> int:
+        """
+        Store a DataFrame under its content hash and return the stored size in bytes.
+        Raises ValueError if the frame cannot be stored as Arrow.
+        """
+
+    @abstractmethod
+    def read(
+        self,
+        df_hash: str,
+        columns: List[str],
+        start: int,
+        stop: int
+    ) -> Optional[pd.DataFrame]:
+        """Read rows [start, stop) of the given columns, or None if the hash is not stored."""
+
+    @abstractmethod
+    def delete(self, df_hash: str):
+        """Delete a stored dataset (no-op if missing)."""
+
+    @abstractmethod
+    def list_hashes(self, older_than: float = 0) -> List[str]:
+        """Hashes stored more than older_than seconds ago."""
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError) as e:
+        raise ValueError(f"Frame cannot be stored as Arrow: {e}")
+
+
+def _table_slice(table: pa.Table, columns: List[str], start: int, stop: int) -> pd.DataFrame:
+    # Selecting and slicing are zero-copy; only the requested cells are converted
+    return table.select(columns).slice(start, max(stop - start, 0)).to_pandas()
+
+
+class MemoryDatasetStore(DatasetStore):
+    """Arrow tables held in this process. Only meaningful with the in-memory cache backend."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._tables: Dict[str, Tuple[pa.Table, float]] = {}
+        self._lock = threading.Lock()
+
+    def write(self, df_hash: str, df: pd.DataFrame) -> int:
+        table = _to_table(df)
+        with self._lock:
+            self._tables[df_hash] = (table, time.time())
+        return table.nbytes
+
+    def read(self, df_hash, columns, start, stop):
+        entry = self._tables.get(df_hash)
+        if entry is None:
+            return None
+        return _table_slice(entry[0], columns, start, stop)
+
+    def delete(self, df_hash: str):
+        with self._lock:
+            self._tables.pop(df_hash, None)
+
+    def list_hashes(self, older_than: float = 0) -> List[str]:
+        cutoff = time.time() - older_than
+        with self._lock:
+            return [h for h, (_, created) in self._tables.items() if created <= cutoff]
+
+
+class DiskDatasetStore(DatasetStore):
+    """
+    Uncompressed Feather (Arrow IPC) files, read through a memory map so large
+    datasets are paged in by the OS instead of copied onto the Python heap.
+    Workers referencing the same Redis must share the directory.
+    """
+
+    name = "disk"
+    suffix = ".arrow"
+
+    def __init__(self, directory: str = CACHE_DISK_DIR):
+        self.directory = directory
+
+    def _path(self, df_hash: str) -> str:
+        if not _HASH_RE.match(df_hash):
+            raise ValueError(f"Invalid dataset hash: {df_hash!r}")
+        return os.path.join(self.directory, df_hash + self.suffix)
+
+    def write(self, df_hash: str, df: pd.DataFrame) -> int:
+        path = self._path(df_hash)
+        if not os.path.exists(path):
+            table = _to_table(df)
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so readers never map a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            os.close(fd)
+            try:
+                feather.write_feather(table, tmp_path, compression="uncompressed")
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return os.path.getsize(path)
+
+    def read(self, df_hash, columns, start, stop):
+        try:
+            table = feather.read_table(self._path(df_hash), columns=columns, memory_map=True)
+        except FileNotFoundError:
+            return None
+        return _table_slice(table, columns, start, stop)
+
+    def delete(self, df_hash: str):
+        try:
+            os.remove(self._path(df_hash))
+        except FileNotFoundError:
+            pass
+
+    def list_hashes(self, older_than: float = 0) -> List[str]:
+        cutoff = time.time() - older_than
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return []
+        return [
+            entry.name[:-len(self.suffix)]
+            for entry in entries
+            if entry.name.endswith(self.suffix) and entry.stat().st_mtime <= cutoff
+        ]
+
+
+STORES: Dict[str, DatasetStore] = {
+    store.name: store for store in (MemoryDatasetStore(), DiskDatasetStore())
+}
+
+
+def get_store(name: str) -> DatasetStore:
+    """Look up a local dataset store by the name recorded in a manifest."""
+    try:
+        return STORES[name]
+    except KeyError:
+        raise ValueError(f"Unknown dataset store: {name}")
@@ -0,0 +1,108 @@
+# backend/app/utils/dtypes.py
+
+import os
+import logging
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+INGEST_OPTIMIZE_DTYPES = os.getenv("INGEST_OPTIMIZE_DTYPES", "true").lower() == "true"
+CATEGORY_MAX_RATIO = float(os.getenv("CATEGORY_MAX_RATIO", 0.5))  # Max unique/rows for a string column to become category
+
+# Arrow-backed strings with NaN as the missing value (the pandas 3 "str" default)
+ARROW_STRING_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+
+
+def _downcast_numeric(series: pd.Series) -> pd.Series:
+    """Shrink an integer or float column to the smallest dtype that holds every value exactly."""
+    if pd.api.types.is_bool_dtype(series) or not isinstance(series.dtype, np.dtype):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        kind = "unsigned" if pd.api.types.is_unsigned_integer_dtype(series) else "integer"
+        return pd.to_numeric(series, downcast=kind)
+    if series.dtype == np.float64:
+        values = series.to_numpy()
+        with np.errstate(over="ignore"):
+            narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            return series.astype(np.float32)
+    return series
+
+
+def _is_string_column(series: pd.Series) -> bool:
+    if pd.api.types.is_string_dtype(series) and not pd.api.types.is_object_dtype(series):
+        return True
+    # Object columns qualify only if every non-null value is a str
+    return pd.api.types.is_object_dtype(series) and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty")
+
+
+def _convert_strings(series: pd.Series) -> pd.Series:
+    """Low-cardinality strings become category, the rest Arrow-backed strings."""
+    if len(series) and series.nunique(dropna=True) <= len(series) * CATEGORY_MAX_RATIO:
+        return series.astype(ARROW_STRING_DTYPE).astype("category")
+    if series.dtype != ARROW_STRING_DTYPE:
+        return series.astype(ARROW_STRING_DTYPE)
+    return series
+
+
+def optimize_dtypes(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Reduce the in-memory footprint of a freshly parsed DataFrame without changing
+    its values. Returns the optimized frame and a summary of the before/after
+    memory usage and the columns whose dtype changed.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    converted = {}
+    if INGEST_OPTIMIZE_DTYPES:
+        changed = {}
+        for i, col in enumerate(df.columns):
+            series = df.iloc[:, i]
+            if pd.api.types.is_numeric_dtype(series):
+                new = _downcast_numeric(series)
+            elif _is_string_column(series):
+                new = _convert_strings(series)
+            else:
+                new = series
+            if new.dtype != series.dtype:
+                converted[str(col)] = str(new.dtype)
+                changed[i] = new
+        if changed:
+            df = df.copy(deep=False)
+            for i, new in changed.items():
+                df.isetitem(i, new)
+
+    after = int(df.memory_usage(deep=True).sum())
+    if converted:
+        logger.info(f"Optimized {len(converted)} column dtypes: {before:,} -> {after:,} bytes")
+    return df, {"before_bytes": before, "after_bytes": after, "converted": converted}
+
+
+def _float_values(series: pd.Series) -> np.ndarray:
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy()
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)  # Nullable/Arrow floats
+
+
+def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replace +/-inf with NaN in float columns. Every column keeps its dtype and
+    only float columns that contain inf are rewritten; the rest are shared with
+    df, not copied. Missing values stay NaN/NA; they become None only when rows
+    are serialized (see helpers.dataframe_to_records).
+    """
+    changed = {}
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        if pd.api.types.is_float_dtype(series):
+            infinite = np.isinf(_float_values(series))
+            if infinite.any():
+                changed[i] = series.mask(infinite)
+    if not changed:
+        return df
+    df = df.copy(deep=False)
+    for i, series in changed.items():
+        df.isetitem(i, series)
+    return df
@@ -0,0 +1,55 @@
+# backend/app/utils/fingerprint.py
+
+import hashlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+FINGERPRINT_VERSION = b"fp2"  # Bump when the hashing scheme changes
+
+
+def column_fingerprint(series: pd.Series) -> str:
+    """
+    Digest of a column's values in row order, computed with pandas' vectorized
+    row hashing. Independent of the storage width chosen at ingest: int8/int64,
+    uint8/uint64, float32/float64 and str/object/category columns holding the
+    same values hash the same.
+    """
+    # pandas hashes numbers by their bit pattern, which for negative ints and
+    # floats depends on the width, so hash every width as its widest type
+    if isinstance(series.dtype, np.dtype) and not pd.api.types.is_bool_dtype(series):
+        if pd.api.types.is_signed_integer_dtype(series) and series.dtype != np.int64:
+            series = series.astype(np.int64)
+        elif pd.api.types.is_unsigned_integer_dtype(series) and series.dtype != np.uint64:
+            series = series.astype(np.uint64)
+        elif pd.api.types.is_float_dtype(series) and series.dtype != np.float64:
+            series = series.astype(np.float64)
+    row_hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+
+
+def combine_fingerprints(columns: List[Tuple[str, str]], num_rows: int) -> str:
+    """Stable dataset hash from ordered (column name, column fingerprint) pairs."""
+    digest = hashlib.sha256(FINGERPRINT_VERSION)
+    digest.update(str(num_rows).encode("utf-8"))
+    for name, fingerprint in columns:
+        digest.update(b"\0" + name.encode("utf-8") + b"\0" + fingerprint.encode("ascii"))
+    return digest.hexdigest()
+
+
+def fingerprint_dataframe(df: pd.DataFrame) -> Tuple[str, Dict[str, str]]:
+    """
+    Returns (dataset hash, {column name: column fingerprint}).
+    Columns are hashed one at a time, so only one 8-byte-per-row buffer is live.
+    """
+    columns = [
+        (str(col), column_fingerprint(df.iloc[:, i]))
+        for i, col in enumerate(df.columns)
+    ]
+    return combine_fingerprints(columns, len(df)), dict(columns)
+
+
+def changed_columns(old: Dict[str, str], new: Dict[str, str]) -> List[str]:
+    """Columns of new that are missing from old or whose values differ."""
+    return [name for name, fingerprint in new.items() if old.get(name) != fingerprint]
@@ -0,0 +1,67 @@
+# backend/app/utils/frame_cache.py
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Tuple
+
+import pandas as pd
+
+FRAME_CACHE_MAX_BYTES = int(os.getenv("FRAME_CACHE_MAX_BYTES", 256 * 1024 * 1024))  # 256MB default
+
+CacheKey = Tuple[str, Hashable]  # (dataset hash, part)
+
+
+class FrameCache:
+    """
+    Per-worker LRU of decoded dataset column parts, bounded by total byte size.
+    Entries are keyed by dataset content hash; since content-addressed data never
+    changes, an entry stays valid for as long as it is cached and is shared by
+    every session referencing the same dataset.
+    """
+
+    def __init__(self, max_bytes: int = FRAME_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[pd.Series, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, df_hash: str, parts: List[Hashable]) -> Dict[Hashable, pd.Series]:
+        """Return the cached parts of a dataset (missing ones are omitted)."""
+        found = {}
+        with self._lock:
+            for part in parts:
+                entry = self._entries.get((df_hash, part))
+                if entry is not None:
+                    self._entries.move_to_end((df_hash, part))
+                    found[part] = entry[0]
+        return found
+
+    def put(self, df_hash: str, part: Hashable, series: pd.Series):
+        """Insert a decoded part, evicting least recently used entries as needed."""
+        size = int(series.memory_usage(index=False, deep=True))
+        if size > self.max_bytes:
+            return
+        key = (df_hash, part)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (series, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def invalidate(self, df_hash: str):
+        """Drop all entries of a dataset (e.g. after its last reference is released)."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == df_hash]
+            for key in stale:
+                _, size = self._entries.pop(key)
+                self.current_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
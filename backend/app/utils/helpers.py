@@ -1,9 +1,11 @@
 # backend/app/utils/helpers.py
 
 import math
-from typing import Any, Dict
+import os
+from typing import Any, Dict, List
 from urllib.parse import urlparse
 
+import numpy as np
 import pandas as pd
 from fastapi import Request, HTTPException
 from app.utils.session_cache import SessionCache
@@ -20,8 +22,14 @@ APPROVED_DOMAINS = {
     "storage.googleapis.com"
 }
 
-# Supported file extensions
-SUPPORTED_EXTENSIONS = {".csv", ".tsv", ".xlsx"}
+# Supported file extensions (compressed variants are CSV/TSV only)
+SUPPORTED_EXTENSIONS = {
+    ".csv", ".tsv", ".xlsx",
+    ".parquet", ".feather", ".arrow",
+    ".jsonl", ".ndjson",
+    ".csv.gz", ".tsv.gz", ".csv.zst", ".tsv.zst"
+}
+COMPRESSION_SUFFIXES = (".gz", ".zst")
 
 
 def is_approved_domain(url: str) -> bool:
@@ -34,10 +42,15 @@ def is_approved_domain(url: str) -> bool:
 
 def get_file_extension(path_or_url: str) -> str:
     """
-    Extract the file extension from a filename or URL.
+    Extract the file extension from a filename or URL, including the format
+    extension of compressed files (e.g. ".csv.gz").
     """
-    path = urlparse(path_or_url).path
-    return path[path.rfind("."):].lower() if "." in path else ""
+    path = urlparse(path_or_url).path.lower()
+    root, ext = os.path.splitext(path)
+    if ext in COMPRESSION_SUFFIXES:
+        # Keep the inner extension, e.g. ".csv.gz"
+        ext = os.path.splitext(root)[1] + ext
+    return ext
 
 def is_supported_extension(ext: str) -> bool:
     """
@@ -45,13 +58,13 @@ def is_supported_extension(ext: str) -> bool:
     """
     return ext in SUPPORTED_EXTENSIONS
 
-def get_session_df(request: Request):
+async def get_session_df(request: Request):
     """
     Retrieve the DataFrame from the current user's session.
     Raises HTTP 400 if not found.
     """
     session_id = getattr(request.state, "session_id", None)
-    df = SessionCache.get_df(session_id) if session_id else None
+    df = await SessionCache.get_dataset_data(session_id) if session_id else None
     if df is None:
         raise HTTPException(
             status_code=400, 
@@ -60,16 +73,28 @@ def get_session_df(request: Request):
     return df
 
 
+def dataframe_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    JSON-safe row dicts: NaN, NA, NaT and +/-inf become None. Only the rows
+    passed in are boxed, so call this on the page being returned, not the dataset.
+    """
+    columns = []
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        values = np.array(series.astype(object), dtype=object)  # Native Python scalars
+        if pd.api.types.is_float_dtype(series):
+            missing = ~np.isfinite(series.to_numpy(dtype=np.float64, na_value=np.nan))
+        else:
+            missing = pd.isna(values)
+        values[missing] = None
+        columns.append(values)
+    names = list(df.columns)
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
 def get_dataframe_preview(df: pd.DataFrame, max_cols: int = 50, sample_rows: int = 10) -> Dict[str, Any]:
     columns = list(df.columns)[:max_cols]
-    sample = (
-        df[columns]
-        .head(sample_rows)
-        .where(pd.notnull(df[columns]), None)
-        .to_dict(orient="records")
-    )
-    return {"columns": columns, "sample_rows": sample}
-
+    return {"columns": columns, "sample_rows": dataframe_to_records(df[columns].head(sample_rows))}
 
 
 def sanitize_for_json(obj):
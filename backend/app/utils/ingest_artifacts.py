@@ -0,0 +1,135 @@
+# backend/app/utils/ingest_artifacts.py
+
+import os
+import json
+import time
+import logging
+import tempfile
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.utils.fingerprint import FINGERPRINT_VERSION, fingerprint_dataframe
+from app.utils.helpers import get_dataframe_preview, sanitize_for_json
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_DIRNAME = ".artifacts"  # Subfolder of the uploads folder, so the catalog does not list the copies
+ARTIFACTS_VERSION = 1  # Bump when the sidecar layout changes
+
+
+def artifact_paths(file_path: str) -> Tuple[str, str]:
+    """(Parquet copy, sidecar JSON) paths for a dataset file in the uploads folder."""
+    folder, filename = os.path.split(file_path)
+    base = os.path.splitext(filename)[0]
+    artifacts_dir = os.path.join(folder, ARTIFACTS_DIRNAME)
+    return os.path.join(artifacts_dir, f"{base}.parquet"), os.path.join(artifacts_dir, f"{base}.ingest.json")
+
+
+def _write_atomic(path: str, write: Callable[[str], None]):
+    """
+    Write a file through write(temp path) and rename it into place. Every writer
+    gets its own temp file, so concurrent writes of the same dataset (threads or
+    workers) never rename a partial file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _column_stats(series: pd.Series) -> Dict:
+    stats = {"dtype": str(series.dtype), "null_count": int(series.isna().sum())}
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.dropna()
+        if len(values):
+            stats["min"] = values.min().item()
+            stats["max"] = values.max().item()
+            stats["mean"] = float(values.mean())
+    elif isinstance(series.dtype, pd.CategoricalDtype):
+        stats["categories"] = len(series.cat.categories)
+    return stats
+
+
+def write_ingest_artifacts(
+    file_path: str,
+    df: pd.DataFrame,
+    df_hash: Optional[str] = None,
+    column_hashes: Optional[Dict[str, str]] = None
+) -> bool:
+    """
+    Store an already processed DataFrame next to its source file in the uploads
+    folder: a Parquet copy (dtypes preserved) and a sidecar with the hash,
+    preview, dtypes and per-column stats, tied to the source file's mtime and size.
+    Returns False, leaving no artifacts, if the frame cannot be stored as Parquet.
+    """
+    parquet_path, sidecar_path = artifact_paths(file_path)
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    if df_hash is None or column_hashes is None:
+        df_hash, column_hashes = fingerprint_dataframe(df)
+    source = os.stat(file_path)
+
+    start = time.perf_counter()
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        _write_atomic(parquet_path, lambda path: pq.write_table(table, path))
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        logger.warning(f"Cannot store ingest artifacts for {file_path}: {e}")
+        return False
+
+    sidecar = {
+        "version": ARTIFACTS_VERSION,
+        "fingerprint_version": FINGERPRINT_VERSION.decode("ascii"),
+        "source_mtime_ns": source.st_mtime_ns,
+        "source_size": source.st_size,
+        "hash": df_hash,
+        "column_hashes": column_hashes,
+        "num_rows": len(df),
+        "columns": [str(col) for col in df.columns],
+        "dtypes": {str(col): str(dtype) for col, dtype in df.dtypes.items()},
+        "column_stats": {str(col): _column_stats(df.iloc[:, i]) for i, col in enumerate(df.columns)},
+        "preview": get_dataframe_preview(df),
+        "memory_bytes": int(df.memory_usage(deep=True).sum())
+    }
+    encoded = json.dumps(sanitize_for_json(sidecar), default=str)
+
+    def write_sidecar(path: str):
+        with open(path, "w") as f:
+            f.write(encoded)
+
+    _write_atomic(sidecar_path, write_sidecar)
+    logger.info(f"Wrote ingest artifacts for {file_path} in {time.perf_counter() - start:.2f}s")
+    return True
+
+
+def load_ingest_artifacts(file_path: str) -> Optional[Tuple[pd.DataFrame, Dict]]:
+    """
+    (DataFrame, sidecar) from the artifacts of a dataset file, or None if they
+    are missing, were written by another version, or the source file changed since.
+    """
+    parquet_path, sidecar_path = artifact_paths(file_path)
+    try:
+        with open(sidecar_path, "r") as f:
+            sidecar = json.load(f)
+        source = os.stat(file_path)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if (
+        sidecar.get("version") != ARTIFACTS_VERSION
+        or sidecar.get("fingerprint_version") != FINGERPRINT_VERSION.decode("ascii")
+        or sidecar.get("source_mtime_ns") != source.st_mtime_ns
+        or sidecar.get("source_size") != source.st_size
+    ):
+        return None
+    try:
+        table = pq.read_table(parquet_path, memory_map=True)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning(f"Ignoring unreadable ingest artifacts for {file_path}: {e}")
+        return None
+    return table.to_pandas(split_blocks=True, self_destruct=True), sidecar
@@ -0,0 +1,267 @@
+# backend/app/utils/profiling.py
+
+import os
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+PROFILE_BATCH_BYTES = int(os.getenv("PROFILE_BATCH_BYTES", 64 * 1024 * 1024))  # Max size of one stacked block; peak use is a few times this
+NORMALTEST_MIN_ROWS = 8  # scipy's normaltest needs at least 8 values
+
+_QUANTILES = np.array([0.25, 0.5, 0.75])
+
+
+def _zero_out_fperr(values: np.ndarray) -> np.ndarray:
+    # As pandas does before its skew/kurtosis divisions, so constant columns give 0
+    return np.where(np.abs(values) < 1e-14, 0.0, values)
+
+
+def _stack(df: pd.DataFrame, columns: Sequence) -> np.ndarray:
+    """Columns as rows of one contiguous float64 block, NaN for missing values."""
+    block = np.empty((len(columns), len(df)), dtype=np.float64)
+    for j, col in enumerate(columns):
+        block[j] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return block
+
+
+def _normaltest_pvalue(mean: np.ndarray, m2: np.ndarray, m3: np.ndarray, m4: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """
+    D'Agostino-Pearson normality test p-values (scipy.stats.normaltest) from
+    already computed central moment sums, so the data is not scanned again.
+    NaN where the test does not apply (fewer than 8 values, constant column).
+    """
+    n = n.astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        variance = m2 / n
+        # Same precision check scipy applies before dividing by the variance
+        constant = variance <= (np.finfo(np.float64).eps * mean) ** 2
+        skewness = (m3 / n) / variance ** 1.5
+        kurtosis = (m4 / n) / variance ** 2
+
+        # skewtest
+        y = skewness * np.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+        beta2 = 3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3) / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9))
+        w2 = -1 + np.sqrt(2 * (beta2 - 1))
+        delta = 1 / np.sqrt(0.5 * np.log(w2))
+        alpha = np.sqrt(2.0 / (w2 - 1))
+        y = np.where(y == 0, 1, y)
+        z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+        # kurtosistest
+        expected = 3.0 * (n - 1) / (n + 1)
+        variance_b2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+        x = (kurtosis - expected) / np.sqrt(variance_b2)
+        sqrt_beta1 = 6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9)) * np.sqrt((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3)))
+        a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / (sqrt_beta1 ** 2)))
+        term1 = 1 - 2 / (9.0 * a)
+        denominator = 1 + x * np.sqrt(2 / (a - 4.0))
+        term2 = np.sign(denominator) * np.where(
+            denominator == 0.0, np.nan, np.power((1 - 2.0 / a) / np.abs(denominator), 1 / 3.0)
+        )
+        z_kurtosis = (term1 - term2) / np.sqrt(2 / (9.0 * a))
+
+        p_value = stats.chi2.sf(z_skew * z_skew + z_kurtosis * z_kurtosis, 2)
+    p_value[constant | (n < NORMALTEST_MIN_ROWS)] = np.nan
+    return p_value
+
+
+def _moment_sums(block: np.ndarray, valid: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Per-row mean and sums of 2nd/3rd/4th powers of deviations, skipping NaN."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.sum(block, axis=1, where=valid) / counts
+        # Two temporaries the size of the block; nulls contribute 0 to every sum
+        deviation = block - mean[:, None]
+        np.copyto(deviation, 0.0, where=~valid)
+        squared = deviation * deviation
+        m2 = squared.sum(axis=1)
+        m3 = np.multiply(squared, deviation, out=deviation).sum(axis=1)
+        m4 = np.multiply(squared, squared, out=squared).sum(axis=1)
+    return mean, m2, m3, m4
+
+
+def _moments(block: np.ndarray, valid: np.ndarray, counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """Mean, sample std and bias-corrected skewness/kurtosis, with pandas' conventions."""
+    mean, m2, m3, m4 = _moment_sums(block, valid, counts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(m2 / (counts - 1))
+        std[counts < 2] = np.nan
+
+        m2, m3 = _zero_out_fperr(m2), _zero_out_fperr(m3)
+        skewness = (counts * (counts - 1) ** 0.5 / (counts - 2)) * (m3 / m2 ** 1.5)
+        skewness = np.where(m2 == 0, 0.0, skewness)
+        skewness[counts < 3] = np.nan
+
+        numerator = _zero_out_fperr(counts * (counts + 1) * (counts - 1) * m4)
+        denominator = _zero_out_fperr((counts - 2) * (counts - 3) * m2 ** 2)
+        adjustment = 3 * (counts - 1) ** 2 / ((counts - 2) * (counts - 3))
+        kurtosis = np.where(denominator == 0, 0.0, numerator / denominator - adjustment)
+        kurtosis[counts < 4] = np.nan
+    return {"mean": mean, "std": std, "skewness": skewness, "kurtosis": kurtosis}
+
+
+def _normality(block: np.ndarray, valid: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """normaltest p-value of each row's non-null values."""
+    return _normaltest_pvalue(*_moment_sums(block, valid, counts), counts)
+
+
+def _order_statistics(block: np.ndarray, counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Min, quartiles and max from one sort of the block (NumPy's vectorized sort
+    beats repeated selection here). NaN sorts last, so the first n entries of a
+    row are its n non-null values in order.
+    """
+    ordered = np.sort(block, axis=1)
+    rows = np.arange(len(block))
+    last = np.maximum(counts - 1, 0)
+    position = _QUANTILES[:, None] * last
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    low, high = ordered[rows, lower], ordered[rows, upper]
+    quantiles = low + (high - low) * (position - lower)  # Linear interpolation, as pandas
+    return {
+        "min": ordered[:, 0],
+        "q1": quantiles[0],
+        "median": quantiles[1],
+        "q3": quantiles[2],
+        "max": ordered[rows, last]
+    }
+
+
+def _profile_block(block: np.ndarray, normality: bool, test_rows: Optional[np.ndarray]) -> Dict[str, np.ndarray]:
+    valid = ~np.isnan(block)
+    counts = valid.sum(axis=1)
+    profile = _moments(block, valid, counts)
+    profile.update(_order_statistics(block, counts))
+    profile["count"] = counts
+
+    if not normality:
+        profile["p_value"] = np.full(len(block), np.nan)
+    elif test_rows is None:
+        profile["p_value"] = _normality(block, valid, counts)
+    else:
+        sample = block[:, test_rows]
+        sample_valid = valid[:, test_rows]
+        profile["p_value"] = _normality(sample, sample_valid, sample_valid.sum(axis=1))
+
+    iqr = profile["q3"] - profile["q1"]
+    lower_bound = (profile["q1"] - 1.5 * iqr)[:, None]
+    upper_bound = (profile["q3"] + 1.5 * iqr)[:, None]
+    profile["iqr"] = iqr
+    profile["zero_count"] = (block == 0).sum(axis=1)
+    profile["outlier_count"] = ((block < lower_bound) | (block > upper_bound)).sum(axis=1)
+    return profile
+
+
+def numeric_profile(
+    df: pd.DataFrame,
+    columns: Sequence,
+    normality: bool = True,
+    test_rows: Optional[np.ndarray] = None
+) -> List[Dict]:
+    """
+    Summary statistics of numeric columns (the NumericSummaryResponse fields), in
+    column order; all-null columns are skipped. Columns are stacked into float64
+    blocks of at most PROFILE_BATCH_BYTES and each statistic is one vectorized
+    reduction over a block. Percentages are of all rows, nulls included.
+    test_rows, if given, are the row positions the normality test runs on
+    (see sample_rows); every other statistic is exact.
+    """
+    rows = len(df)
+    if rows == 0:
+        return []
+    batch = max(1, PROFILE_BATCH_BYTES // (rows * 8))
+    summaries = []
+    for start in range(0, len(columns), batch):
+        names = list(columns[start:start + batch])
+        profile = _profile_block(_stack(df, names), normality, test_rows)
+        for j, name in enumerate(names):
+            if profile["count"][j] == 0:
+                continue
+            summary = {
+                "name": name,
+                "mean": float(profile["mean"][j]),
+                "std": float(profile["std"][j]),
+                "min": float(profile["min"][j]),
+                "max": float(profile["max"][j]),
+                "median": float(profile["median"][j]),
+                "q1": float(profile["q1"][j]),
+                "q3": float(profile["q3"][j]),
+                "iqr": float(profile["iqr"][j]),
+                "skewness": float(profile["skewness"][j]),
+                "kurtosis": float(profile["kurtosis"][j]),
+                "zero_count": int(profile["zero_count"][j]),
+                "zero_percent": float(profile["zero_count"][j] / rows * 100),
+                "outlier_count": int(profile["outlier_count"][j]),
+                "outlier_percent": float(profile["outlier_count"][j] / rows * 100)
+            }
+            if normality and (rows if test_rows is None else len(test_rows)) >= NORMALTEST_MIN_ROWS:
+                # Too few non-null values or a constant column give a NaN p-value: not normal
+                summary["is_normal"] = bool(profile["p_value"][j] > 0.05)
+            summaries.append(summary)
+    return summaries
+
+
+def sample_rows(num_rows: int, sample_size: int, seed: int) -> Optional[np.ndarray]:
+    """
+    Sorted positions of a reproducible uniform sample of rows (without
+    replacement), or None if the frame has no more than sample_size rows.
+    """
+    if num_rows <= sample_size:
+        return None
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(num_rows, size=sample_size, replace=False))
+
+
+class ColumnProfile:
+    """
+    Per-column facts shared by the analysis sections, each computed on first use
+    and then memoized. For text and category columns the distinct count is read
+    off value_counts, so the column is hashed once.
+    """
+
+    def __init__(self, series: pd.Series):
+        self.series = series
+
+    @cached_property
+    def is_text(self) -> bool:
+        return (
+            isinstance(self.series.dtype, pd.CategoricalDtype)
+            or pd.api.types.is_object_dtype(self.series)
+            or pd.api.types.is_string_dtype(self.series)
+        )
+
+    @cached_property
+    def null_count(self) -> int:
+        return int(self.series.isnull().sum())
+
+    @cached_property
+    def value_counts(self) -> pd.Series:
+        """Counts of non-null values, most frequent first (unused categories included, with 0)."""
+        return self.series.value_counts()
+
+    @cached_property
+    def distinct_count(self) -> int:
+        if self.is_text or "value_counts" in self.__dict__:
+            return int((self.value_counts > 0).sum())
+        return int(self.series.nunique())
+
+    @cached_property
+    def sample_values(self) -> List[str]:
+        return self.series.dropna().head(5).astype(str).tolist()
+
+
+class DatasetProfile:
+    """ColumnProfiles of one DataFrame, created on first access and reused by every section."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.num_rows = len(df)
+        self._columns: Dict[Any, ColumnProfile] = {}
+
+    def __getitem__(self, column) -> ColumnProfile:
+        if column not in self._columns:
+            self._columns[column] = ColumnProfile(self.df[column])
+        return self._columns[column]
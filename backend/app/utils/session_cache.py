@@ -1,30 +1,95 @@
 import redis
+import redis.asyncio as aioredis
 import pandas as pd
+import pyarrow as pa
 import pickle
 import os
-from typing import Optional, Dict, Any
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
 from datetime import datetime
+from redis.commands.core import AsyncScript
+from app.utils import cache_scripts
+from app.utils.columnar import serialize_columns, deserialize_column
+from app.utils.codecs import CodecError, DEFAULT_CODEC, encode, decode
+from app.utils.frame_cache import FrameCache
+from app.utils.fingerprint import fingerprint_dataframe
+from app.utils.dataset_store import STORES, get_store
+from app.core.executor import run_in_thread
+from app.core.redis import CACHE_BACKEND, get_redis
+
+logger = logging.getLogger(__name__)
 
-REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
-REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
-REDIS_DB = int(os.getenv("REDIS_DB", 0))
 REDIS_TTL = 60 * 60 * 24  # 24 hours default TTL
+ROW_GROUP_SIZE = int(os.getenv("ROW_GROUP_SIZE", 50_000))  # Rows per stored chunk
+MANIFEST_HINTS_MAX = 10_000  # Sessions whose manifest this worker remembers
+SESSION_QUOTA_BYTES = int(os.getenv("SESSION_QUOTA_BYTES", 200 * 1024 * 1024))  # Per session, 0 disables
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 2 * 1024 * 1024 * 1024))  # All sessions, 0 disables eviction
+CACHE_HIGH_WATERMARK = float(os.getenv("CACHE_HIGH_WATERMARK", 0.9))  # Start evicting above this fraction
+CACHE_LOW_WATERMARK = float(os.getenv("CACHE_LOW_WATERMARK", 0.75))  # Evict until below this fraction
+CACHE_DISK_MIN_BYTES = int(os.getenv("CACHE_DISK_MIN_BYTES", 64 * 1024 * 1024))  # Frames this large go to disk, 0 disables
+LOCAL_SWEEP_GRACE = 60  # Seconds before an unreferenced local dataset may be swept
+JOB_TTL = int(os.getenv("JOB_TTL", 60 * 60))  # Seconds a background job's state is kept after its last update
 
 class RedisCacheError(Exception):
     """Custom exception for Redis cache operations."""
     pass
 
+class CacheQuotaError(RedisCacheError):
+    """Raised when a dataset does not fit in the per-session cache quota."""
+    def __init__(self, nbytes: int, quota: int):
+        super().__init__(f"Dataset needs {nbytes} bytes of cache, session quota is {quota} bytes")
+        self.nbytes = nbytes
+        self.quota = quota
+
+class _ManifestChanged(Exception):
+    """Raised by reads whose manifest hint no longer matches the session's dataset."""
+    def __init__(self, manifest: Optional[Dict]):
+        super().__init__("Session dataset changed")
+        self.manifest = manifest
+
+def _dumps(value: Any) -> bytes:
+    """Pickle and encode a value with the configured codec."""
+    return encode(pickle.dumps(value))
+
+def _loads(data: bytes) -> Any:
+    """Decode and unpickle a value written by _dumps."""
+    return pickle.loads(decode(data))
+
 class SessionCache:
-    """Thread-safe Redis cache manager for session data."""
+    """
+    Async Redis cache manager for session data, backed by the app-wide connection pool.
+
+    Dataset contents and analysis results are content-addressed: they are stored once
+    under dataset:{hash}:* and shared by every session that references that hash.
+    Sessions only own their metadata (session:{id}:*), which points at the hash.
+
+    Multi-key operations run as Lua scripts (see app.utils.cache_scripts), so each
+    common operation is atomic and costs a single round trip.
+
+    Stored bytes are tracked per dataset. A session may reference at most
+    SESSION_QUOTA_BYTES (dataset plus analysis results), and once all datasets
+    together exceed the high watermark of CACHE_MAX_BYTES, the least recently
+    accessed sessions are evicted down to the low watermark.
+
+    Contents live in one of three tiers, recorded as "store" in the manifest:
+    "redis" (encoded row groups, the default), "disk" (memory-mapped Feather files
+    for frames of at least CACHE_DISK_MIN_BYTES) or "memory" (Arrow tables in this
+    process, used with CACHE_BACKEND=memory). For the local tiers Redis only holds
+    the manifest pointing at them (see app.utils.dataset_store).
+    """
     
-    _redis = redis.Redis(
-        host=REDIS_HOST,
-        port=REDIS_PORT,
-        db=REDIS_DB,
-        decode_responses=False,  # Keep binary for pickle
-        socket_timeout=5,  # Add timeouts
-        socket_connect_timeout=5
-    )
+    # Decoded column parts kept in this worker, keyed by content hash
+    _frames = FrameCache()
+    # Last known manifest per session; only a hint, validated by every read
+    _manifests: "OrderedDict[str, Dict]" = OrderedDict()
+    _scripts: Dict[str, AsyncScript] = {}
+
+    @classmethod
+    def _client(cls) -> aioredis.Redis:
+        """Shared async Redis client (see app.core.redis)."""
+        return get_redis()
 
     @classmethod
     def _get_key(cls, session_id: str, key_type: str, subtype: Optional[str] = None) -> str:
@@ -33,154 +98,581 @@ class SessionCache:
         return f"{base}:{subtype}" if subtype else base
 
     @classmethod
-    def _safe_redis_op(cls, operation: str, *args, **kwargs) -> Any:
+    def _get_shared_key(cls, df_hash: str, key_type: str, subtype: Optional[str] = None) -> str:
+        """Generate key for content-addressed data shared across sessions."""
+        base = f"dataset:{df_hash}:{key_type}"
+        return f"{base}:{subtype}" if subtype else base
+
+    @classmethod
+    def _remember_manifest(cls, session_id: str, manifest: Optional[Dict]):
+        """Update this worker's manifest hint for a session."""
+        cls._manifests.pop(session_id, None)
+        if manifest is None:
+            return
+        cls._manifests[session_id] = manifest
+        while len(cls._manifests) > MANIFEST_HINTS_MAX:
+            cls._manifests.popitem(last=False)
+
+    @classmethod
+    async def _safe_pipeline(cls, pipe) -> List[Any]:
+        """Execute a pipeline with error handling."""
+        try:
+            return await pipe.execute()
+        except redis.RedisError as e:
+            raise RedisCacheError(f"Redis pipeline failed: {str(e)}")
+
+    @classmethod
+    async def _safe_redis_op(cls, operation: str, *args, **kwargs) -> Any:
         """Execute Redis operation with error handling."""
         try:
-            return getattr(cls._redis, operation)(*args, **kwargs)
+            return await getattr(cls._client(), operation)(*args, **kwargs)
         except redis.RedisError as e:
             raise RedisCacheError(f"Redis {operation} failed: {str(e)}")
         except Exception as e:
             raise RedisCacheError(f"Unexpected error in Redis {operation}: {str(e)}")
 
     @classmethod
-    def get_dataset_meta(cls, session_id: str) -> Optional[Dict]:
+    async def _run_script(cls, name: str, keys: List[str], args: List[Any]) -> Any:
+        """Run one of the cache Lua scripts (loaded once per client, then called by SHA)."""
+        client = cls._client()
+        script = cls._scripts.get(name)
+        if script is None or script.registered_client is not client:
+            script = cls._scripts[name] = client.register_script(getattr(cache_scripts, name))
+        try:
+            return await script(keys=keys, args=args)
+        except redis.RedisError as e:
+            raise RedisCacheError(f"Redis script {name} failed: {str(e)}")
+
+    @classmethod
+    def _eviction_args(cls) -> List[Any]:
+        """Quota, watermark and staleness arguments shared by the writing scripts."""
+        now = time.time()
+        return [
+            now,
+            SESSION_QUOTA_BYTES,
+            int(CACHE_MAX_BYTES * CACHE_HIGH_WATERMARK),
+            int(CACHE_MAX_BYTES * CACHE_LOW_WATERMARK),
+            now - REDIS_TTL
+        ]
+
+    @classmethod
+    def _queue_register(cls, pipe, session_id: str, keys: List[str], ttl: int = REDIS_TTL):
+        """Queue registration of keys in the session's key registry onto a pipeline."""
+        if not keys:
+            return
+        registry = cls._get_key(session_id, "keys")
+        pipe.sadd(registry, *keys)
+        # The registry must outlive every key it tracks
+        pipe.expire(registry, max(ttl, REDIS_TTL))
+
+    @classmethod
+    async def list_keys(cls, session_id: str) -> List[str]:
+        """
+        List the Redis keys owned by a session.
+        Uses the session's key registry, falling back to an incremental SCAN
+        for sessions written before the registry existed.
+        """
+        registry = cls._get_key(session_id, "keys")
+        members = await cls._safe_redis_op("smembers", registry)
+        if members:
+            return sorted([registry] + [m.decode() for m in members])
+        try:
+            keys = [
+                k async for k in cls._client().scan_iter(match=f"session:{session_id}:*", count=1000)
+            ]
+            return sorted(k.decode() for k in keys)
+        except redis.RedisError as e:
+            raise RedisCacheError(f"Redis scan failed: {str(e)}")
+
+    @classmethod
+    async def get_dataset_meta(cls, session_id: str) -> Optional[Dict]:
         """Get dataset metadata from cache."""
         key = cls._get_key(session_id, "dataset", "meta")
         try:
-            meta = cls._safe_redis_op("hgetall", key)
+            meta = await cls._safe_redis_op("hgetall", key)
             if not meta:
                 return None
-            return {k.decode(): pickle.loads(v) for k, v in meta.items()}
-        except pickle.UnpicklingError:
-            cls._safe_redis_op("delete", key)  # Clean up corrupted data
+            # Underscored fields are plain-text bookkeeping for the cache scripts
+            return {
+                k.decode(): _loads(v) for k, v in meta.items() if not k.startswith(b"_")
+            }
+        except (pickle.UnpicklingError, CodecError):
+            await cls._safe_redis_op("delete", key)  # Clean up corrupted data
             return None
 
     @classmethod
-    def set_dataset_meta(cls, session_id: str, meta: Dict, ttl: int = REDIS_TTL):
+    async def set_dataset_meta(cls, session_id: str, meta: Dict, ttl: int = REDIS_TTL):
         """Set dataset metadata with TTL."""
         key = cls._get_key(session_id, "dataset", "meta")
-        pickled = {k: pickle.dumps(v) for k, v in meta.items()}
-        cls._safe_redis_op("hset", key, mapping=pickled)
-        cls._safe_redis_op("expire", key, ttl)
+        pickled = {k: _dumps(v) for k, v in meta.items()}
+        pipe = cls._client().pipeline(transaction=True)
+        pipe.hset(key, mapping=pickled)
+        pipe.expire(key, ttl)
+        cls._queue_register(pipe, session_id, [key], ttl)
+        await cls._safe_pipeline(pipe)
 
     @classmethod
-    def update_dataset_meta(cls, session_id: str, updates: Dict):
+    async def update_dataset_meta(cls, session_id: str, updates: Dict):
         """Update specific metadata fields."""
         key = cls._get_key(session_id, "dataset", "meta")
-        pickled = {k: pickle.dumps(v) for k, v in updates.items()}
-        cls._safe_redis_op("hset", key, mapping=pickled)
-        cls._safe_redis_op("expire", key, REDIS_TTL)
+        pickled = {k: _dumps(v) for k, v in updates.items()}
+        pipe = cls._client().pipeline(transaction=True)
+        pipe.hset(key, mapping=pickled)
+        pipe.expire(key, REDIS_TTL)
+        cls._queue_register(pipe, session_id, [key])
+        await cls._safe_pipeline(pipe)
+
+    @classmethod
+    def _encode_row_groups(cls, df: pd.DataFrame) -> List[Dict[str, bytes]]:
+        """Split a DataFrame into fixed-size row groups of Arrow-encoded, compressed columns."""
+        chunks = [
+            df.iloc[start:start + ROW_GROUP_SIZE]
+            for start in range(0, len(df), ROW_GROUP_SIZE)
+        ]
+        # Keep one (empty) group so the column schema survives for empty frames
+        return [
+            {col: encode(data) for col, data in serialize_columns(chunk).items()}
+            for chunk in chunks or [df]
+        ]
+
+    @classmethod
+    def _build_manifest(
+        cls,
+        df: pd.DataFrame,
+        df_hash: str,
+        num_row_groups: int,
+        store: str = "redis"
+    ) -> Dict:
+        """Describe the stored layout of a dataset; copied into each referencing session's meta."""
+        return {
+            "store": store,
+            "hash": df_hash,
+            "columns": [str(col) for col in df.columns],
+            "dtypes": list(df.dtypes),  # Rebuilds empty reads without fetching a row group
+            "num_rows": len(df),
+            "row_group_size": ROW_GROUP_SIZE,
+            "num_row_groups": num_row_groups,
+            "codec": DEFAULT_CODEC.name
+        }
+
+    @classmethod
+    def _queue_store_shared(
+        cls,
+        pipe,
+        groups: List[Dict[str, bytes]],
+        manifest: Dict,
+        ttl: int,
+        nbytes: int = 0
+    ) -> int:
+        """
+        Queue the content-addressed row groups and manifest of a dataset onto a pipeline.
+        Returns the number of bytes stored, counting nbytes already stored in a local tier.
+        """
+        df_hash = manifest["hash"]
+        encoded_manifest = _dumps(manifest)
+        nbytes += len(encoded_manifest)
+        for i, encoded in enumerate(groups):
+            if not encoded:
+                continue
+            nbytes += sum(len(data) for data in encoded.values())
+            key = cls._get_shared_key(df_hash, "rg", str(i))
+            pipe.hset(key, mapping=encoded)
+            pipe.expire(key, ttl)
+        meta_key = cls._get_shared_key(df_hash, "meta")
+        # Plain-text fields are read by the cache scripts
+        pipe.hset(meta_key, mapping={
+            "manifest": encoded_manifest,
+            "num_row_groups": len(groups),
+            "nbytes": nbytes
+        })
+        pipe.expire(meta_key, ttl)
+        return nbytes
+
+    @classmethod
+    def _choose_store(cls, df: pd.DataFrame) -> str:
+        """Tiering policy: which store should hold a new dataset's contents."""
+        if CACHE_BACKEND == "memory":
+            return "memory"
+        if CACHE_DISK_MIN_BYTES and df.memory_usage(index=False, deep=True).sum() >= CACHE_DISK_MIN_BYTES:
+            return "disk"
+        return "redis"
 
     @classmethod
-    def set_dataset_data(cls, session_id: str, df: pd.DataFrame, ttl: int = REDIS_TTL):
-        """Cache DataFrame with compression."""
-        key = cls._get_key(session_id, "dataset", "data")
+    def _drop_local(cls, df_hash: str):
+        """Forget a released dataset in this worker's frame cache and local stores."""
+        cls._frames.invalidate(df_hash)
+        for store in STORES.values():
+            store.delete(df_hash)
+
+    @classmethod
+    async def sweep_local_stores(cls) -> int:
+        """
+        Delete locally stored datasets that Redis no longer references, e.g. after
+        they expired or were evicted by another worker. Returns the number deleted.
+        """
+        candidates = [
+            (store, df_hash)
+            for store in STORES.values()
+            for df_hash in store.list_hashes(older_than=LOCAL_SWEEP_GRACE)
+        ]
+        if not candidates:
+            return 0
+        pipe = cls._client().pipeline(transaction=False)
+        for _, df_hash in candidates:
+            pipe.exists(cls._get_shared_key(df_hash, "meta"))
+        alive = await cls._safe_pipeline(pipe)
+        dead = [candidate for candidate, exists in zip(candidates, alive) if not exists]
+        for store, df_hash in dead:
+            store.delete(df_hash)
+            cls._frames.invalidate(df_hash)
+        return len(dead)
+
+    @classmethod
+    async def _replace_dataset(
+        cls,
+        session_id: str,
+        df: pd.DataFrame,
+        df_hash: str,
+        fields: Dict[str, bytes],
+        reset: bool,
+        ttl: int
+    ) -> Dict:
+        """
+        Atomically point the session at a shared dataset and write its meta fields.
+        The old reference is released in the same script; with reset, all other
+        session keys are dropped too. Contents are only encoded and written when
+        no session has stored the same hash yet. Returns the stored manifest.
+        Raises CacheQuotaError (writing nothing) if the dataset exceeds the quota.
+        """
+        keys = [cls._get_key(session_id, "dataset", "meta"), cls._get_key(session_id, "keys")]
+        args = [session_id, df_hash, ttl, "1" if reset else "0", *cls._eviction_args()]
+        for field, value in fields.items():
+            args += [field, value]
+
+        result = await cls._run_script("REPLACE_DATASET", keys, args)
+        if result[0] == 0:
+            # Contents not stored yet: write and reference them in one transaction
+            store_name = cls._choose_store(df)
+            groups, nbytes = [], 0
+            if store_name != "redis":
+                try:
+                    nbytes = await run_in_thread(get_store(store_name).write, df_hash, df)
+                except ValueError:
+                    store_name = "redis"  # Not representable as a single Arrow table
+            if store_name == "redis":
+                groups = await run_in_thread(cls._encode_row_groups, df)
+            manifest = cls._build_manifest(df, df_hash, len(groups), store_name)
+            pipe = cls._client().pipeline(transaction=True)
+            nbytes = cls._queue_store_shared(pipe, groups, manifest, ttl, nbytes)
+            if SESSION_QUOTA_BYTES and nbytes > SESSION_QUOTA_BYTES:
+                if store_name != "redis":
+                    get_store(store_name).delete(df_hash)
+                raise CacheQuotaError(nbytes, SESSION_QUOTA_BYTES)
+            pipe.eval(cache_scripts.REPLACE_DATASET, len(keys), *keys, *args)
+            result = (await cls._safe_pipeline(pipe))[-1]
+            await cls.sweep_local_stores()
+        if result[0] == -1:
+            raise CacheQuotaError(result[1], SESSION_QUOTA_BYTES)
+
+        _, old_hash, released, manifest, total_bytes, evicted = result
+        if released:
+            cls._drop_local(old_hash.decode())
+        if evicted:
+            logger.info(f"Evicted {evicted} least recently used sessions ({total_bytes} bytes cached)")
+            await cls.sweep_local_stores()
+        manifest = _loads(manifest)
+        cls._remember_manifest(session_id, manifest)
+        return manifest
+
+    @classmethod
+    async def set_dataset_data(
+        cls,
+        session_id: str,
+        df: pd.DataFrame,
+        df_hash: Optional[str] = None,
+        ttl: int = REDIS_TTL
+    ):
+        """
+        Point the session at a DataFrame stored as shared, content-addressed row groups.
+        The hash is computed with fingerprint_dataframe when not given, the same
+        scheme as at ingest, so a frame is never stored under two hashes.
+        """
         try:
-            data = pickle.dumps(df)
-            cls._safe_redis_op("setex", key, ttl, data)
-        except pickle.PicklingError as e:
-            raise RedisCacheError(f"Failed to serialize DataFrame: {str(e)}")
+            if df_hash is None:
+                df_hash, _ = await run_in_thread(fingerprint_dataframe, df)
+            await cls._replace_dataset(session_id, df, df_hash, {
+                "columns": _dumps([str(col) for col in df.columns]),
+                "hash": _dumps(df_hash)
+            }, reset=False, ttl=ttl)
+        except (pickle.PicklingError, CodecError) as e:
+            raise RedisCacheError(f"Failed to cache DataFrame: {str(e)}")
+
+    @classmethod
+    async def get_dataset_manifest(cls, session_id: str) -> Optional[Dict]:
+        """Get the storage manifest (hash, columns, row groups) of the session's dataset."""
+        key = cls._get_key(session_id, "dataset", "meta")
+        data = await cls._safe_redis_op("hget", key, "manifest")
+        manifest = _loads(data) if data is not None else None
+        cls._remember_manifest(session_id, manifest)
+        return manifest
+
+    @classmethod
+    async def get_dataset_columns(cls, session_id: str) -> Optional[List[str]]:
+        """Get the ordered column names of the cached dataset."""
+        manifest = await cls.get_dataset_manifest(session_id)
+        return manifest["columns"] if manifest else None
+
+    @classmethod
+    async def get_dataset_data(
+        cls,
+        session_id: str,
+        columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get DataFrame from cache.
+        Only the requested columns are transferred and decoded; all columns if None.
+        """
+        return await cls.get_dataset_rows(session_id, 0, None, columns)
 
     @classmethod
-    def get_dataset_data(cls, session_id: str) -> Optional[pd.DataFrame]:
-        """Get DataFrame from cache."""
-        key = cls._get_key(session_id, "dataset", "data")
+    async def get_dataset_rows(
+        cls,
+        session_id: str,
+        start: int,
+        stop: Optional[int] = None,
+        columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get rows [start, stop) of the cached DataFrame.
+        Only the row groups covering that range are fetched, and row groups already
+        decoded by this worker (for any session) are reused. With a known manifest
+        this is a single round trip, even when every part is cached locally.
+        """
         try:
-            data = cls._safe_redis_op("get", key)
-            if data is None:
-                return None
-            cls._safe_redis_op("expire", key, REDIS_TTL)  # Refresh TTL
-            return pickle.loads(data)
-        except pickle.UnpicklingError:
-            cls._safe_redis_op("delete", key)  # Clean up corrupted data
+            manifest = cls._manifests.get(session_id)
+            if manifest is None:
+                manifest = await cls.get_dataset_manifest(session_id)
+            for _ in range(3):
+                if manifest is None:
+                    return None
+                try:
+                    return await cls._read_rows(session_id, manifest, start, stop, columns)
+                except _ManifestChanged as changed:
+                    manifest = changed.manifest
+                    cls._remember_manifest(session_id, manifest)
+            raise RedisCacheError("Dataset kept changing while it was being read")
+        except (pickle.UnpicklingError, CodecError, ValueError, pa.ArrowException):
+            await cls.remove_dataset(session_id)  # Clean up corrupted data
             return None
 
     @classmethod
-    def add_dataset(cls, session_id: str, meta: Dict, df: pd.DataFrame):
-        """Atomic operation to cache both metadata and data."""
+    async def _read_rows(
+        cls,
+        session_id: str,
+        manifest: Dict,
+        start: int,
+        stop: Optional[int],
+        columns: Optional[List[str]]
+    ) -> Optional[pd.DataFrame]:
+        """Read a row range as described by a manifest (see get_dataset_rows)."""
+        if columns is None:
+            columns = manifest["columns"]
+        else:
+            columns = [col for col in columns if col in manifest["columns"]]
+
+        num_rows = manifest["num_rows"]
+        stop = num_rows if stop is None else min(stop, num_rows)
+        if not columns or start >= stop:
+            groups = range(0)
+        else:
+            size = manifest["row_group_size"]
+            groups = range(start // size, (stop - 1) // size + 1)
+
+        store = manifest.get("store", "redis")
+        if store != "redis" or not groups:
+            # Nothing to fetch from Redis; the round trip only checks the session still references the dataset
+            await cls._read_row_groups(session_id, manifest["hash"], columns, range(0))
+            if not groups:
+                return cls._empty_frame(manifest, columns)
+            return await run_in_thread(
+                get_store(store).read, manifest["hash"], columns, start, stop
+            )
+
+        frame = await cls._read_row_groups(session_id, manifest["hash"], columns, groups)
+        if frame is None:
+            return frame
+        offset = groups.start * manifest["row_group_size"]
+        return frame.iloc[start - offset:stop - offset].reset_index(drop=True)
+
+    @classmethod
+    def _empty_frame(cls, manifest: Dict, columns: List[str]) -> pd.DataFrame:
+        """An empty frame of the given columns with the dtypes recorded in the manifest."""
+        dtypes = dict(zip(manifest["columns"], manifest.get("dtypes") or []))
+        return pd.DataFrame(
+            {col: pd.Series(dtype=dtypes.get(col, object)) for col in columns},
+            columns=columns
+        )
+
+    @classmethod
+    async def _read_row_groups(
+        cls,
+        session_id: str,
+        df_hash: str,
+        columns: List[str],
+        groups: range
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch and decode the given shared row groups, reusing locally cached parts.
+        The same round trip checks the session still references df_hash, raising
+        _ManifestChanged with the current manifest if it does not.
+        """
+        parts = [(col, i) for i in groups for col in columns]
+        # Content-addressed parts never change, so no freshness check is needed
+        found = cls._frames.get_many(df_hash, parts)
+
+        missing: Dict[int, List[str]] = {}
+        for col, i in parts:
+            if (col, i) not in found:
+                missing.setdefault(i, []).append(col)
+
+        args = [df_hash, REDIS_TTL, session_id, time.time(), len(missing)]
+        for i, cols in missing.items():
+            args += [i, len(cols), *cols]
+        result = await cls._run_script(
+            "READ_ROW_GROUPS", [cls._get_key(session_id, "dataset", "meta")], args
+        )
+        if result[0] == 0:
+            raise _ManifestChanged(_loads(result[1]) if result[1] is not None else None)
+
+        if not groups:
+            return pd.DataFrame(columns=columns)
+        if not missing:
+            return cls._assemble_row_groups(df_hash, columns, groups, found, {}, [])
+        # Decoding and concatenating a large frame is CPU-bound; keep it off the event loop
+        return await run_in_thread(
+            cls._assemble_row_groups, df_hash, columns, groups, found, missing, result[1:]
+        )
+
+    @classmethod
+    def _assemble_row_groups(
+        cls,
+        df_hash: str,
+        columns: List[str],
+        groups: range,
+        found: Dict,
+        missing: Dict[int, List[str]],
+        encoded_groups: List
+    ) -> Optional[pd.DataFrame]:
+        """Decode the fetched parts (caching them locally) and join all parts into one frame."""
+        for (i, cols), encoded in zip(missing.items(), encoded_groups):
+            for col, data in zip(cols, encoded):
+                if data is None:
+                    return None  # Shared data expired
+                series = deserialize_column(decode(data)).reset_index(drop=True)
+                cls._frames.put(df_hash, (col, i), series)
+                found[(col, i)] = series
+
+        return pd.DataFrame({
+            col: pd.concat([found[(col, i)] for i in groups], ignore_index=True)
+            for col in columns
+        }, columns=columns)
+
+    @classmethod
+    async def add_dataset(cls, session_id: str, meta: Dict, df: pd.DataFrame):
+        """
+        Replace the session's dataset: drop its old keys, cache the metadata and
+        reference the shared contents, all in one atomic script.
+        """
+        df_hash = meta.get("hash")
+        if not df_hash:
+            raise RedisCacheError("Dataset meta has no content hash")
         try:
-            # Use pipeline for atomic operation
-            pipe = cls._redis.pipeline()
-            
-            # Remove existing data first
-            cls.remove_dataset(session_id)
-            
-            # Set new data
-            meta_key = cls._get_key(session_id, "dataset", "meta")
-            data_key = cls._get_key(session_id, "dataset", "data")
-            
-            # Prepare metadata
-            pickled_meta = {k: pickle.dumps(v) for k, v in meta.items()}
-            pipe.hset(meta_key, mapping=pickled_meta)
-            pipe.expire(meta_key, REDIS_TTL)
-            
-            # Prepare DataFrame
-            pickled_df = pickle.dumps(df)
-            pipe.setex(data_key, REDIS_TTL, pickled_df)
-            
-            # Execute atomic operation
-            pipe.execute()
-            
-        except (redis.RedisError, pickle.PicklingError) as e:
+            fields = {k: _dumps(v) for k, v in meta.items()}
+            fields["columns"] = _dumps([str(col) for col in df.columns])
+            await cls._replace_dataset(session_id, df, df_hash, fields, reset=True, ttl=REDIS_TTL)
+        except (pickle.PicklingError, CodecError) as e:
             raise RedisCacheError(f"Failed to cache dataset: {str(e)}")
 
     @classmethod
-    def remove_dataset(cls, session_id: str):
-        """Remove all dataset-related keys."""
+    async def remove_dataset(cls, session_id: str):
+        """Remove all session keys and release the session's reference to shared data."""
+        cls._remember_manifest(session_id, None)
         try:
-            # Get all keys for this session
-            pattern = f"session:{session_id}:*"
-            keys = cls._safe_redis_op("keys", pattern)
-            if keys:
-                cls._safe_redis_op("delete", *keys)
+            old_hash, released = await cls._run_script("REMOVE_DATASET", [], [session_id])
+            if released:
+                cls._drop_local(old_hash.decode())
         except RedisCacheError:
             pass  # Best effort cleanup
 
     @classmethod
-    def set_analysis_result(
+    async def _get_dataset_hash(cls, session_id: str) -> Optional[str]:
+        """Get the content hash of the session's dataset."""
+        data = await cls._safe_redis_op("hget", cls._get_key(session_id, "dataset", "meta"), "_ref")
+        return data.decode() if data is not None else None
+
+    @classmethod
+    async def set_analysis_result(
         cls,
         session_id: str,
         analysis_type: str,
         result: Dict,
         ttl: int = REDIS_TTL
     ):
-        """Cache analysis result with type-specific key."""
-        key = cls._get_key(session_id, "analysis", analysis_type)
+        """
+        Cache analysis result for the session's dataset with type-specific key.
+        Results are shared by every session holding the same dataset hash.
+        Does nothing if the session has no dataset to attach the result to, or
+        if storing the result would exceed the session quota.
+        """
         try:
-            data = pickle.dumps(result)
-            cls._safe_redis_op("setex", key, ttl, data)
-        except pickle.PicklingError as e:
+            stored = await cls._run_script(
+                "SET_ANALYSIS",
+                [cls._get_key(session_id, "dataset", "meta")],
+                [
+                    analysis_type, _dumps(result), ttl, max(ttl, REDIS_TTL),
+                    session_id, *cls._eviction_args()
+                ]
+            )
+            if stored == -1:
+                logger.warning(f"Analysis {analysis_type} not cached: session {session_id} is over quota")
+        except (pickle.PicklingError, CodecError) as e:
             raise RedisCacheError(f"Failed to cache analysis result: {str(e)}")
 
     @classmethod
-    def get_analysis_result(cls, session_id: str, analysis_type: str) -> Optional[Dict]:
-        """Get cached analysis result."""
-        key = cls._get_key(session_id, "analysis", analysis_type)
+    async def get_analysis_result(cls, session_id: str, analysis_type: str) -> Optional[Dict]:
+        """Get cached analysis result for the session's dataset, refreshing its TTL."""
+        data = await cls._run_script(
+            "GET_ANALYSIS",
+            [cls._get_key(session_id, "dataset", "meta")],
+            [analysis_type, REDIS_TTL, session_id, time.time()]
+        )
+        if data is None:
+            return None
         try:
-            data = cls._safe_redis_op("get", key)
-            if data is None:
-                return None
-            cls._safe_redis_op("expire", key, REDIS_TTL)  # Refresh TTL
-            return pickle.loads(data)
-        except pickle.UnpicklingError:
-            cls._safe_redis_op("delete", key)
+            return _loads(data)
+        except (pickle.UnpicklingError, CodecError):
+            df_hash = await cls._get_dataset_hash(session_id)
+            if df_hash:
+                await cls._safe_redis_op(
+                    "delete", cls._get_shared_key(df_hash, "analysis", analysis_type)
+                )
             return None
 
     @classmethod
-    def has_dataset(cls, session_id: str) -> bool:
+    async def has_dataset(cls, session_id: str) -> bool:
         """Check if session has an active dataset."""
         key = cls._get_key(session_id, "dataset", "meta")
-        return bool(cls._safe_redis_op("exists", key))
+        return bool(await cls._safe_redis_op("exists", key))
 
     @classmethod
-    def has_duplicate_dataset(
+    async def has_duplicate_dataset(
         cls,
         session_id: str,
         df_hash: str,
         title: Optional[str] = None
     ) -> Optional[str]:
         """Check for duplicate dataset by hash or title."""
-        meta = cls.get_dataset_meta(session_id)
+        meta = await cls.get_dataset_meta(session_id)
         if not meta:
             return None
         if meta.get("hash") == df_hash:
@@ -188,3 +680,54 @@ class SessionCache:
         if title and meta.get("title") == title:
             return "title"
         return None
+
+    @classmethod
+    async def get_usage(cls, session_id: Optional[str] = None) -> Dict:
+        """
+        Report cache memory usage, running an eviction pass (and a sweep of the
+        local stores) if it is due. Includes the given session's own usage when a
+        session id is passed.
+        """
+        _, quota, high_bytes, low_bytes, stale_before = cls._eviction_args()
+        total_bytes, evicted, sessions, datasets, session_bytes = await cls._run_script(
+            "USAGE",
+            [cls._get_key(session_id or "", "dataset", "meta")],
+            [high_bytes, low_bytes, stale_before]
+        )
+        swept = await cls.sweep_local_stores()
+        coldest = await cls._safe_redis_op("zrange", "cache:sessions", 0, 9, withscores=True)
+        usage = {
+            "total_bytes": total_bytes,
+            "max_bytes": CACHE_MAX_BYTES,
+            "high_watermark_bytes": high_bytes,
+            "low_watermark_bytes": low_bytes,
+            "sessions": sessions,
+            "datasets": datasets,
+            "evicted_sessions": evicted,
+            "local_datasets": {name: len(store.list_hashes()) for name, store in STORES.items()},
+            "swept_local_datasets": swept,
+            "coldest_sessions": [
+                {"session_id": member.decode(), "last_access": datetime.fromtimestamp(score).isoformat()}
+                for member, score in coldest
+            ]
+        }
+        if session_id:
+            usage["session"] = {"bytes": session_bytes or 0, "quota_bytes": quota}
+        return usage
+
+    @classmethod
+    async def set_job_state(cls, job_id: str, updates: Dict, ttl: int = JOB_TTL):
+        """Create or update fields of a background job's state (readable by every worker)."""
+        key = f"job:{job_id}"
+        pipe = cls._client().pipeline(transaction=True)
+        pipe.hset(key, mapping={k: _dumps(v) for k, v in updates.items()})
+        pipe.expire(key, ttl)
+        await cls._safe_pipeline(pipe)
+
+    @classmethod
+    async def get_job_state(cls, job_id: str) -> Optional[Dict]:
+        """Get a background job's state, or None if unknown or expired."""
+        state = await cls._safe_redis_op("hgetall", f"job:{job_id}")
+        if not state:
+            return None
+        return {k.decode(): _loads(v) for k, v in state.items()}
@@ -0,0 +1,235 @@
+# backend/app/utils/uploads_catalog.py
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.helpers import get_file_extension, is_supported_extension
+
+logger = logging.getLogger(__name__)
+
+UPLOADS_CATALOG_PATH = os.getenv("UPLOADS_CATALOG_PATH")  # Defaults to .catalog/uploads.sqlite3 in the uploads folder
+CATALOG_RESCAN_INTERVAL = float(os.getenv("CATALOG_RESCAN_INTERVAL", 30))  # Max seconds between mtime checks of every file
+
+SUMMARY_SUFFIX = ".summary.json"
+SORT_COLUMNS = ("created_at", "title", "filename", "size")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    filename TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    title TEXT,
+    hash TEXT,
+    size INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    file_mtime_ns INTEGER NOT NULL,
+    summary_mtime_ns INTEGER,
+    meta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS datasets_hash ON datasets (hash);
+CREATE INDEX IF NOT EXISTS datasets_title ON datasets (title);
+CREATE INDEX IF NOT EXISTS datasets_created_at ON datasets (created_at);
+CREATE TABLE IF NOT EXISTS catalog_state (
+    key TEXT PRIMARY KEY,
+    value NOT NULL
+);
+"""
+
+
+class UploadsCatalog:
+    """
+    SQLite index of the datasets saved in the uploads folder and their
+    .summary.json metadata, so listing and duplicate checks do not rescan the folder.
+
+    The folder stays the source of truth. Before each query the catalog checks
+    the folder's mtime (which changes when files are added, removed or renamed)
+    and, at most every CATALOG_RESCAN_INTERVAL seconds, every file's mtime;
+    only new or changed files are re-read. Writers in this app call
+    index_file() right after saving, so their changes show up immediately.
+    The database may be shared by several workers.
+    """
+
+    def __init__(self, uploads_dir: str, db_path: Optional[str] = None):
+        self.uploads_dir = uploads_dir
+        # Kept in a subfolder: SQLite's journal files would otherwise bump the uploads folder's mtime
+        self.db_path = db_path or os.path.join(uploads_dir, ".catalog", "uploads.sqlite3")
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _state(self, key: str) -> Optional[float]:
+        row = self._conn.execute("SELECT value FROM catalog_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: float):
+        self._conn.execute("INSERT OR REPLACE INTO catalog_state (key, value) VALUES (?, ?)", (key, value))
+
+    def _read_summary(self, base: str) -> Tuple[Dict, Optional[int]]:
+        """(summary metadata, summary mtime_ns); ({}, None) if missing or unreadable."""
+        path = os.path.join(self.uploads_dir, base + SUMMARY_SUFFIX)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with open(path, "r") as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}, None
+        return (meta if isinstance(meta, dict) else {}), mtime_ns
+
+    def _row(self, filename: str, stat: os.stat_result) -> tuple:
+        base = filename[:-len(get_file_extension(filename))]
+        meta, summary_mtime_ns = self._read_summary(base)
+        created_at = meta.get("created_at") or datetime.fromtimestamp(stat.st_ctime).isoformat()
+        return (
+            filename,
+            str(meta.get("id") or base),
+            meta.get("title"),
+            meta.get("hash"),
+            stat.st_size,
+            created_at,
+            stat.st_mtime_ns,
+            summary_mtime_ns,
+            json.dumps(meta)
+        )
+
+    def _upsert(self, rows: List[tuple]):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO datasets (filename, id, title, hash, size, created_at, "
+            "file_mtime_ns, summary_mtime_ns, meta) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def refresh(self, force: bool = False) -> bool:
+        """Bring the catalog up to date with the folder if it may be stale; returns whether it scanned."""
+        with self._lock:
+            try:
+                dir_mtime_ns = os.stat(self.uploads_dir).st_mtime_ns
+            except FileNotFoundError:
+                dir_mtime_ns = 0
+            now = time.time()
+            if (
+                not force
+                and self._state("dir_mtime_ns") == dir_mtime_ns
+                and now - (self._state("scanned_at") or 0) < CATALOG_RESCAN_INTERVAL
+            ):
+                return False
+
+            files: Dict[str, os.stat_result] = {}
+            summaries: Dict[str, int] = {}
+            try:
+                entries = list(os.scandir(self.uploads_dir))
+            except FileNotFoundError:
+                entries = []
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    if entry.name.endswith(SUMMARY_SUFFIX):
+                        summaries[entry.name[:-len(SUMMARY_SUFFIX)]] = entry.stat().st_mtime_ns
+                    elif is_supported_extension(get_file_extension(entry.name)):
+                        files[entry.name] = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+            known = {
+                filename: (file_mtime_ns, size, summary_mtime_ns)
+                for filename, file_mtime_ns, size, summary_mtime_ns in self._conn.execute(
+                    "SELECT filename, file_mtime_ns, size, summary_mtime_ns FROM datasets"
+                )
+            }
+            changed = []
+            for filename, stat in files.items():
+                base = filename[:-len(get_file_extension(filename))]
+                if known.get(filename) != (stat.st_mtime_ns, stat.st_size, summaries.get(base)):
+                    changed.append(self._row(filename, stat))
+            removed = [(filename,) for filename in known.keys() - files.keys()]
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._upsert(changed)
+                self._conn.executemany("DELETE FROM datasets WHERE filename = ?", removed)
+                self._set_state("dir_mtime_ns", dir_mtime_ns)
+                self._set_state("scanned_at", now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if changed or removed:
+                logger.info(f"Uploads catalog: {len(changed)} files indexed, {len(removed)} removed")
+            return True
+
+    def index_file(self, filename: str):
+        """Re-index one dataset file (e.g. right after it and its summary were written)."""
+        with self._lock:
+            try:
+                stat = os.stat(os.path.join(self.uploads_dir, filename))
+            except FileNotFoundError:
+                self._conn.execute("DELETE FROM datasets WHERE filename = ?", (filename,))
+                return
+            self._upsert([self._row(filename, stat)])
+
+    @staticmethod
+    def _entry(row: tuple) -> Dict:
+        filename, dataset_id, size, created_at, meta = row
+        return {**json.loads(meta), "id": dataset_id, "filename": filename, "size": size, "created_at": created_at}
+
+    def list(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        sort: str = "created_at",
+        descending: bool = True
+    ) -> Tuple[List[Dict], int]:
+        """Return (one page of dataset metadata, total number of datasets)."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort}")
+        self.refresh()
+        direction = "DESC" if descending else "ASC"
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM datasets").fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT filename, id, size, created_at, meta FROM datasets "
+                f"ORDER BY {sort} {direction}, filename {direction} LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, max(offset, 0))
+            ).fetchall()
+        return [self._entry(row) for row in rows], total
+
+    def find_duplicate(
+        self,
+        df_hash: Optional[str] = None,
+        title: Optional[str] = None
+    ) -> Optional[Tuple[str, str]]:
+        """("hash" or "title", filename) of a saved dataset with the same content or title, if any."""
+        self.refresh()
+        with self._lock:
+            for column, value in (("hash", df_hash), ("title", title)):
+                if value:
+                    row = self._conn.execute(
+                        f"SELECT filename FROM datasets WHERE {column} = ? LIMIT 1", (value,)
+                    ).fetchone()
+                    if row:
+                        return column, row[0]
+        return None
+
+
+_catalogs: Dict[str, UploadsCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_uploads_catalog(uploads_dir: str) -> UploadsCatalog:
+    """The shared catalog of an uploads folder, created on first use."""
+    uploads_dir = os.path.abspath(uploads_dir)
+    with _catalogs_lock:
+        if uploads_dir not in _catalogs:
+            _catalogs[uploads_dir] = UploadsCatalog(uploads_dir, UPLOADS_CATALOG_PATH)
+        return _catalogs[uploads_dir]
@@ -0,0 +1,103 @@
+# backend/benchmarks/bench_codecs.py
+"""
+Compare cache codecs on representative session payloads.
+
+Run from the backend directory:
+    python -m benchmarks.bench_codecs [--rows 200000] [--repeat 3]
+
+For every codec it reports the compression ratio and the encode/decode time of
+the same payloads SessionCache writes: Arrow-encoded row groups and pickled
+analysis results.
+"""
+
+import argparse
+import pickle
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from app.services.analysis_service import AnalysisService
+from app.utils.codecs import CodecError, decode, encode, get_codec
+from app.utils.columnar import serialize_columns
+
+CODECS = ["none", "lz4", "zstd:1", "zstd:3", "zstd:9", "zstd:19"]
+
+
+def make_frames(rows: int) -> Dict[str, pd.DataFrame]:
+    """Build frames resembling typical uploads."""
+    rng = np.random.default_rng(42)
+    numeric = pd.DataFrame({
+        f"num_{i}": rng.normal(100, 15, rows).round(2) for i in range(10)
+    })
+    numeric["count"] = rng.integers(0, 1000, rows)
+    mixed = pd.DataFrame({
+        "id": np.arange(rows),
+        "price": rng.lognormal(3, 1, rows).round(2),
+        "quantity": rng.integers(1, 20, rows),
+        "category": rng.choice(["books", "games", "music", "garden", "toys"], rows),
+        "country": rng.choice(["US", "DE", "FR", "JP", "BR", "IN"], rows),
+        "comment": [f"user comment {i % 5000}" for i in range(rows)],
+    })
+    return {"numeric": numeric, "mixed": mixed}
+
+
+def row_group_payloads(df: pd.DataFrame) -> List[bytes]:
+    return list(serialize_columns(df).values())
+
+
+def time_codec(spec: str, payloads: List[bytes], repeat: int) -> Dict[str, float]:
+    codec = get_codec(spec)
+    raw_size = sum(len(p) for p in payloads)
+
+    encode_times, decode_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = [encode(p, codec) for p in payloads]
+        encode_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for e in encoded:
+            decode(e)
+        decode_times.append(time.perf_counter() - start)
+
+    stored_size = sum(len(e) for e in encoded)
+    return {
+        "raw_kb": raw_size / 1e3,
+        "stored_kb": stored_size / 1e3,
+        "ratio": raw_size / stored_size,
+        "encode_ms": min(encode_times) * 1000,
+        "decode_ms": min(decode_times) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    payloads = {}
+    for name, df in make_frames(args.rows).items():
+        payloads[f"{name} frame"] = row_group_payloads(df)
+        payloads[f"{name} analysis"] = [pickle.dumps(AnalysisService().run_full_analysis(df))]
+
+    header = f"{'payload':<18} {'codec':<8} {'raw KB':>10} {'stored KB':>10} {'ratio':>7} {'encode ms':>10} {'decode ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, items in payloads.items():
+        for spec in CODECS:
+            try:
+                r = time_codec(spec, items, args.repeat)
+            except CodecError as e:
+                print(f"{name:<18} {spec:<8} skipped: {e}")
+                continue
+            print(
+                f"{name:<18} {spec:<8} {r['raw_kb']:>10.1f} {r['stored_kb']:>10.1f} "
+                f"{r['ratio']:>7.2f} {r['encode_ms']:>10.1f} {r['decode_ms']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
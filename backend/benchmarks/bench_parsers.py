@@ -0,0 +1,99 @@
+# backend/benchmarks/bench_parsers.py
+"""
+Compare CSV parsing engines on a generated file.
+
+Run from the backend directory:
+    python -m benchmarks.bench_parsers [--rows 1000000] [--repeat 3]
+
+For each engine it reports wall time, rows/sec and the peak RSS growth of a
+fresh process running parse_dataframe_from_path on the same CSV file (Arrow
+allocates outside the Python heap, so tracemalloc would under-report it).
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.utils import parsers
+from benchmarks.bench_codecs import make_frames
+
+ENGINES = ["pandas", "arrow"]
+
+
+def write_csv(rows: int, path: str):
+    frame = make_frames(rows)["mixed"]
+    frame["date"] = pd.date_range("2020-01-01", periods=rows, freq="min").strftime("%Y-%m-%d %H:%M")
+    frame["score"] = np.where(np.arange(rows) % 10 == 0, np.nan, frame["price"])
+    frame.to_csv(path, index=False)
+
+
+def _peak_rss_mb(engine: Optional[str], path: str) -> float:
+    """Peak RSS of this process after parsing (or just importing, if engine is None)."""
+    if engine is not None:
+        parsers.CSV_ENGINE = engine
+        parsers.parse_dataframe_from_path(path, ".csv")
+    try:
+        # VmHWM starts fresh with the new address space; ru_maxrss survives exec on Linux
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM")) / 1024
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def peak_rss_growth_mb(engine: str, path: str) -> float:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        baseline = pool.submit(_peak_rss_mb, None, path).result()
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_peak_rss_mb, engine, path).result() - baseline
+
+
+def time_engine(engine: str, path: str, repeat: int, track_memory: bool) -> dict:
+    parsers.CSV_ENGINE = engine
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = parsers.parse_dataframe_from_path(path, ".csv")
+        times.append(time.perf_counter() - start)
+        used = df.attrs["parse_stats"]["engine"]
+        rows = len(df)
+        del df
+
+    peak_mb = peak_rss_growth_mb(engine, path) if track_memory else float("nan")
+    best = min(times)
+    return {"used": used, "rows": rows, "seconds": best, "rows_per_sec": rows / best, "peak_mb": peak_mb}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory runs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.csv")
+        write_csv(args.rows, path)
+        print(f"CSV file: {os.path.getsize(path) / 1e6:.1f} MB, {args.rows} rows")
+
+        header = f"{'engine':<8} {'used':<8} {'seconds':>8} {'rows/s':>12} {'peak MB':>9}"
+        print(header)
+        print("-" * len(header))
+        for engine in ENGINES:
+            r = time_engine(engine, path, args.repeat, not args.no_memory)
+            print(
+                f"{engine:<8} {r['used']:<8} {r['seconds']:>8.2f} "
+                f"{r['rows_per_sec']:>12,.0f} {r['peak_mb']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
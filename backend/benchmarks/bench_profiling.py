@@ -0,0 +1,122 @@
+# backend/benchmarks/bench_profiling.py
+"""
+Compare the vectorized numeric profiling engine with per-column pandas calls.
+
+Run from the backend directory:
+    python -m benchmarks.bench_profiling [--rows 100000] [--columns 10 50 100 500] [--repeat 3]
+
+For each frame width it reports the time of the previous per-column summary
+(pandas mean/std/quantile/skew/kurtosis and a normaltest per column) and of
+numeric_profile, and checks both produce the same values.
+"""
+
+import argparse
+import math
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from app.utils.profiling import numeric_profile
+
+
+def make_frame(rows: int, columns: int) -> pd.DataFrame:
+    """Numeric columns as ingest leaves them: float64, float32 and downcast ints, some with nulls."""
+    rng = np.random.default_rng(42)
+    data = {}
+    for i in range(columns):
+        kind = i % 4
+        if kind == 0:
+            data[f"normal_{i}"] = rng.normal(100, 15, rows)
+        elif kind == 1:
+            data[f"skewed_{i}"] = rng.lognormal(3, 1, rows).astype(np.float32)
+        elif kind == 2:
+            data[f"count_{i}"] = rng.integers(0, 100, rows).astype(np.int8)
+        else:
+            values = rng.exponential(5, rows)
+            values[rng.random(rows) < 0.1] = np.nan
+            data[f"sparse_{i}"] = values
+    return pd.DataFrame(data)
+
+
+def per_column_summary(df: pd.DataFrame) -> List[Dict]:
+    """The per-column implementation numeric_profile replaces."""
+    summaries = []
+    for col in df.select_dtypes(include=np.number).columns:
+        series = df[col].astype(np.float64)
+        if series.isnull().all():
+            continue
+        summary = {
+            "name": col,
+            "mean": float(series.mean()),
+            "std": float(series.std()),
+            "min": float(series.min()),
+            "max": float(series.max()),
+            "median": float(series.median()),
+            "q1": float(series.quantile(0.25)),
+            "q3": float(series.quantile(0.75)),
+            "iqr": float(series.quantile(0.75) - series.quantile(0.25)),
+            "skewness": float(series.skew()),
+            "kurtosis": float(series.kurtosis()),
+            "zero_count": int((series == 0).sum()),
+            "zero_percent": float((series == 0).mean() * 100)
+        }
+        lower_bound = summary["q1"] - 1.5 * summary["iqr"]
+        upper_bound = summary["q3"] + 1.5 * summary["iqr"]
+        outliers = (series < lower_bound) | (series > upper_bound)
+        summary["outlier_count"] = int(outliers.sum())
+        summary["outlier_percent"] = float(outliers.mean() * 100)
+        if len(series) >= 8:
+            _, p_value = stats.normaltest(series.dropna())
+            summary["is_normal"] = float(p_value) > 0.05
+        summaries.append(summary)
+    return summaries
+
+
+def same_results(expected: List[Dict], actual: List[Dict]) -> bool:
+    if [s["name"] for s in expected] != [s["name"] for s in actual]:
+        return False
+    for a, b in zip(expected, actual):
+        if a.keys() != b.keys():
+            return False
+        for key, value in a.items():
+            if isinstance(value, float):
+                if not (math.isnan(value) and math.isnan(b[key])) and not math.isclose(value, b[key], rel_tol=1e-9, abs_tol=1e-9):
+                    return False
+            elif value != b[key]:
+                return False
+    return True
+
+
+def best_time(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, nargs="+", default=[10, 50, 100, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    header = f"{'columns':>8} {'per-column s':>13} {'vectorized s':>13} {'speedup':>8} {'same':>5}"
+    print(header)
+    print("-" * len(header))
+    for columns in args.columns:
+        df = make_frame(args.rows, columns)
+        numeric_cols = df.select_dtypes(include=np.number).columns
+        same = same_results(per_column_summary(df), numeric_profile(df, numeric_cols))
+        before = best_time(lambda: per_column_summary(df), args.repeat)
+        after = best_time(lambda: numeric_profile(df, numeric_cols), args.repeat)
+        print(f"{columns:>8} {before:>13.3f} {after:>13.3f} {before / after:>7.1f}x {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# backend/tests/conftest.py
+
+import pytest
+
+import app.core.redis as core_redis
+import app.utils.session_cache as session_cache
+from app.utils.frame_cache import FrameCache
+from app.utils.session_cache import SessionCache
+
+
+@pytest.fixture
+def anyio_backend():
+    """Run async tests (marked with pytest.mark.anyio) on asyncio only, like the app."""
+    return "asyncio"
+
+
+@pytest.fixture
+async def redis(monkeypatch):
+    """An in-process Redis (fakeredis) behind SessionCache, storing every dataset in Redis."""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.aioredis.FakeRedis()
+    monkeypatch.setattr(core_redis, "_client", client)
+    monkeypatch.setattr(SessionCache, "_frames", FrameCache())
+    monkeypatch.setattr(SessionCache, "_manifests", type(SessionCache._manifests)())
+    monkeypatch.setattr(session_cache, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(session_cache, "CACHE_DISK_MIN_BYTES", 0)
+    yield client
+    await client.aclose()
@@ -0,0 +1,121 @@
+# backend/tests/test_analysis_service.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from app.services.analysis_service import AnalysisConfig, AnalysisService
+from app.utils.profiling import sample_rows
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    n = 2000
+    values = rng.normal(size=n)
+    values[:50] = np.nan
+    return pd.DataFrame({
+        "x": values,
+        "y": rng.exponential(size=n).astype(np.float32),
+        "z": rng.integers(0, 5, n).astype(np.int8),
+        "label": pd.Series(rng.choice(["a", "b", "c"], n), dtype="category"),
+        "city": pd.Series(rng.choice(["north", "south", None], n), dtype=object),
+        "code": pd.Series([f"id{i}" for i in range(n)], dtype="str")
+    })
+
+
+def test_shared_profile_gives_the_same_sections(df):
+    service = AnalysisService()
+    results = service.run_full_analysis(df)
+    cleaned = service._clean_dataframe(df)
+    assert results["column_info"] == service._get_column_info(cleaned)
+    assert results["categorical_summary"] == service._get_categorical_summary(cleaned)
+    assert results["missing_data"] == service._get_missing_data(cleaned)
+
+
+def test_text_columns_are_counted_once(df, monkeypatch):
+    calls = []
+    value_counts = pd.Series.value_counts
+
+    def counting(self, *args, **kwargs):
+        calls.append(self.name)
+        return value_counts(self, *args, **kwargs)
+
+    monkeypatch.setattr(pd.Series, "value_counts", counting)
+    AnalysisService().run_full_analysis(df)
+    assert sorted(calls) == sorted(set(calls))
+
+
+def _sampled_config(**kwargs) -> AnalysisConfig:
+    return AnalysisConfig(sample_size_for_tests=500, sampling_threshold_rows=1000, **kwargs)
+
+
+def _without_estimates(results):
+    """Results with the sampled fields removed."""
+    return {
+        "numeric_summary": [
+            {k: v for k, v in s.items() if k != "is_normal"} for s in results["numeric_summary"]
+        ],
+        "categorical_summary": [
+            {k: v for k, v in s.items() if k != "is_uniform"} for s in results["categorical_summary"]
+        ],
+        "column_info": results["column_info"],
+        "missing_data": results["missing_data"]
+    }
+
+
+@pytest.mark.parametrize("rows,approximate,expected", [
+    (500, None, False),  # Not more rows than the sample
+    (500, True, False),
+    (1000, None, False),  # At the threshold
+    (1001, None, True),
+    (1001, False, False),
+    (600, True, True)
+])
+def test_when_sampling_applies(rows, approximate, expected):
+    assert _sampled_config(approximate=approximate).use_sampling(rows) is expected
+
+
+def test_small_datasets_are_tested_on_every_row(df):
+    results = AnalysisService().run_full_analysis(df)
+    assert results["sampling"] == {
+        "enabled": False, "num_rows": len(df), "sample_size": len(df), "seed": None, "estimated_fields": []
+    }
+
+
+def test_sampled_tests_are_reproducible_and_reported(df):
+    results = AnalysisService(_sampled_config()).run_full_analysis(df)
+    assert results["sampling"] == {
+        "enabled": True,
+        "num_rows": len(df),
+        "sample_size": 500,
+        "seed": 0,
+        "estimated_fields": ["numeric_summary.is_normal", "categorical_summary.is_uniform"]
+    }
+    assert AnalysisService(_sampled_config()).run_full_analysis(df) == results
+
+    exact = AnalysisService(_sampled_config(approximate=False)).run_full_analysis(df)
+    assert exact["sampling"]["enabled"] is False
+    assert _without_estimates(results) == _without_estimates(exact)
+
+
+def test_uniformity_is_tested_on_the_sample(df):
+    service = AnalysisService(_sampled_config())
+    results = service.run_full_analysis(df)
+    test_rows = sample_rows(len(df), 500, seed=0)
+    cleaned = service._clean_dataframe(df)
+    for summary in results["categorical_summary"]:
+        full_counts = cleaned[summary["name"]].value_counts()
+        observed = cleaned[summary["name"]].iloc[test_rows].value_counts().reindex(full_counts.index, fill_value=0)
+        assert summary["is_uniform"] == (stats.chisquare(observed.values).pvalue > 0.05)
+
+
+def test_seed_and_mode_are_part_of_the_cache_key():
+    keys = {
+        AnalysisConfig().cache_key(),
+        AnalysisConfig(approximate=True).cache_key(),
+        AnalysisConfig(approximate=False).cache_key(),
+        AnalysisConfig(sample_seed=1).cache_key()
+    }
+    assert len(keys) == 4
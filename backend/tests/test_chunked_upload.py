@@ -0,0 +1,144 @@
+# backend/tests/test_chunked_upload.py
+
+import fcntl
+import hashlib
+import json
+import os
+import threading
+
+import pytest
+
+import app.services.chunked_upload_service as chunked
+from app.services.chunked_upload_service import (
+    ChunkedUploadError,
+    abort_upload,
+    append_chunk,
+    finalize_upload,
+    get_upload,
+    start_upload
+)
+
+pytestmark = pytest.mark.anyio
+
+SESSION = "session-1"
+DATA = b"a,b\n" + b"1,2\n" * 5000
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunked, "CHUNKED_UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+async def _body(data: bytes, part_size: int = 1024):
+    for start in range(0, len(data), part_size):
+        yield data[start:start + part_size]
+
+
+async def _append(upload_id: str, offset: int, data: bytes, checksum=None):
+    return await append_chunk(SESSION, upload_id, offset, _body(data), checksum=checksum)
+
+
+async def test_chunks_assemble_into_the_file():
+    upload = start_upload(SESSION, "data.csv", title="Data", size=len(DATA))
+    upload_id = upload["upload_id"]
+    half = len(DATA) // 2
+    first = await _append(upload_id, 0, DATA[:half], checksum=hashlib.sha256(DATA[:half]).hexdigest())
+    assert first["offset"] == half and first["chunks"] == 1
+    await _append(upload_id, half, DATA[half:])
+    assert get_upload(SESSION, upload_id)["offset"] == len(DATA)
+
+    result = finalize_upload(SESSION, upload_id, checksum=hashlib.sha256(DATA).hexdigest())
+    assert result["path"].endswith(".csv") and result["size"] == len(DATA)
+    with open(result["path"], "rb") as f:
+        assert f.read() == DATA
+    with pytest.raises(ChunkedUploadError) as excinfo:
+        get_upload(SESSION, upload_id)
+    assert excinfo.value.code == "UPLOAD_NOT_FOUND"
+
+
+async def test_wrong_offset_reports_the_server_offset():
+    upload_id = start_upload(SESSION, "data.csv")["upload_id"]
+    await _append(upload_id, 0, DATA[:100])
+    with pytest.raises(ChunkedUploadError) as excinfo:
+        await _append(upload_id, 0, DATA[:100])
+    assert excinfo.value.status_code == 409
+    assert excinfo.value.details == {"offset": 100}
+
+
+async def test_rejected_chunks_leave_nothing_behind(upload_dir):
+    upload_id = start_upload(SESSION, "data.csv", size=len(DATA))["upload_id"]
+    with pytest.raises(ChunkedUploadError) as excinfo:
+        await _append(upload_id, 0, DATA[:100], checksum="0" * 64)
+    assert excinfo.value.code == "CHECKSUM_MISMATCH"
+    with pytest.raises(ChunkedUploadError) as excinfo:
+        await _append(upload_id, 0, DATA + b"extra")
+    assert excinfo.value.code == "CHUNK_TOO_LARGE"
+    status = get_upload(SESSION, upload_id)
+    assert status["offset"] == 0 and status["chunks"] == 0
+
+
+async def test_chunk_size_cap(monkeypatch):
+    monkeypatch.setattr(chunked, "CHUNK_MAX_SIZE", 1000)
+    upload_id = start_upload(SESSION, "data.csv")["upload_id"]
+    with pytest.raises(ChunkedUploadError) as excinfo:
+        await _append(upload_id, 0, DATA[:1001])
+    assert excinfo.value.status_code == 413
+    assert (await _append(upload_id, 0, DATA[:1000]))["offset"] == 1000
+
+
+async def test_locked_upload_is_busy(upload_dir):
+    upload_id = start_upload(SESSION, "data.csv")["upload_id"]
+    with open(os.path.join(upload_dir, f"{upload_id}.part"), "rb") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        with pytest.raises(ChunkedUploadError) as excinfo:
+            await _append(upload_id, 0, DATA[:100])
+        assert excinfo.value.code == "UPLOAD_BUSY"
+
+
+async def test_finalize_requires_the_declared_size():
+    upload_id = start_upload(SESSION, "data.csv", size=len(DATA))["upload_id"]
+    await _append(upload_id, 0, DATA[:100])
+    with pytest.raises(ChunkedUploadError) as excinfo:
+        finalize_upload(SESSION, upload_id)
+    assert excinfo.value.code == "UPLOAD_INCOMPLETE"
+    assert excinfo.value.details == {"offset": 100, "size": len(DATA)}
+
+
+async def test_uploads_are_private_to_their_session(upload_dir):
+    upload_id = start_upload(SESSION, "data.csv")["upload_id"]
+    with pytest.raises(ChunkedUploadError) as excinfo:
+        await append_chunk("other", upload_id, 0, _body(DATA[:10]))
+    assert excinfo.value.status_code == 404
+    abort_upload(SESSION, upload_id)
+    assert os.listdir(upload_dir) == []
+
+
+def test_unsupported_file_type():
+    with pytest.raises(ChunkedUploadError) as excinfo:
+        start_upload(SESSION, "data.exe")
+    assert excinfo.value.code == "INVALID_FILE_TYPE"
+
+
+def test_concurrent_manifest_writes_do_not_share_a_temp_file(upload_dir):
+    path = str(upload_dir / "manifest.json")
+    start = threading.Barrier(8)
+    errors = []
+
+    def write(i: int):
+        start.wait()
+        try:
+            for j in range(50):
+                chunked._write_manifest(path, {"writer": i, "n": j})
+        except OSError as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    assert errors == []
+    with open(path) as f:
+        assert json.load(f)["n"] == 49
+    assert os.listdir(upload_dir) == ["manifest.json"]
@@ -0,0 +1,135 @@
+# backend/tests/test_dataset_store.py
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import app.utils.dataset_store as dataset_store
+import app.utils.session_cache as session_cache
+from app.utils.dataset_store import DiskDatasetStore, MemoryDatasetStore
+from app.utils.session_cache import SessionCache
+
+pytestmark = pytest.mark.anyio
+
+
+def _frame(n: int = 1000) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": np.arange(n, dtype="int64"),
+        "value": np.linspace(0, 1, n),
+        "label": pd.Series([f"row {i}" for i in range(n)], dtype="str"),
+        "kind": pd.Categorical(["a", "b"] * (n // 2))
+    })
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """Fresh local stores (the disk one in a temp directory) for SessionCache."""
+    disk, memory = DiskDatasetStore(str(tmp_path)), MemoryDatasetStore()
+    monkeypatch.setitem(dataset_store.STORES, "disk", disk)
+    monkeypatch.setitem(dataset_store.STORES, "memory", memory)
+    monkeypatch.setattr(session_cache, "LOCAL_SWEEP_GRACE", 0)
+    return disk, memory
+
+
+@pytest.mark.parametrize("store", ["disk", "memory"])
+def test_round_trip_keeps_values_and_dtypes(stores, store):
+    store = dataset_store.get_store(store)
+    df = _frame()
+    assert store.write("h", df) > 0
+    pd.testing.assert_frame_equal(store.read("h", list(df.columns), 0, len(df)), df)
+    assert store.list_hashes() == ["h"]
+    assert store.list_hashes(older_than=60) == []
+
+    store.delete("h")
+    assert store.read("h", ["id"], 0, 10) is None
+    assert store.list_hashes() == []
+    store.delete("h")  # Missing is fine
+
+
+@pytest.mark.parametrize("store", ["disk", "memory"])
+def test_projected_slices(stores, store):
+    store = dataset_store.get_store(store)
+    df = _frame()
+    store.write("h", df)
+    part = store.read("h", ["label", "id"], 250, 260)
+    expected = df[["label", "id"]].iloc[250:260].reset_index(drop=True)
+    pd.testing.assert_frame_equal(part, expected)
+    assert len(store.read("h", ["id"], 990, 2000)) == 10
+
+
+def test_disk_reads_are_memory_mapped(tmp_path):
+    store = DiskDatasetStore(str(tmp_path))
+    store.write("h", pd.DataFrame({"a": np.arange(2_000_000), "b": np.zeros(2_000_000)}))
+    before = pa.total_allocated_bytes()
+    part = store.read("h", ["b"], 100, 110)
+    # Only the ten requested cells are copied; the 16MB file is not read onto the heap
+    assert pa.total_allocated_bytes() - before < 1024 * 1024
+    assert part["b"].tolist() == [0.0] * 10
+
+
+def test_disk_store_rejects_unsafe_hashes(tmp_path):
+    with pytest.raises(ValueError):
+        DiskDatasetStore(str(tmp_path)).write("../escape", _frame(10))
+
+
+def test_frames_arrow_cannot_hold_are_rejected(stores):
+    df = pd.DataFrame({"mixed": [1, "a", 2.5]}, dtype=object)
+    for store in stores:
+        with pytest.raises(ValueError):
+            store.write("h", df)
+
+
+async def test_placement_by_size(redis, stores, monkeypatch):
+    disk, _ = stores
+    small, large = _frame(100), _frame(10_000)
+    monkeypatch.setattr(session_cache, "CACHE_DISK_MIN_BYTES", int(large.memory_usage(index=False, deep=True).sum()))
+
+    await SessionCache.add_dataset("small", {"hash": "h-small"}, small)
+    await SessionCache.add_dataset("large", {"hash": "h-large"}, large)
+    assert (await SessionCache.get_dataset_manifest("small"))["store"] == "redis"
+    assert (await SessionCache.get_dataset_manifest("large"))["store"] == "disk"
+    assert await redis.exists("dataset:h-small:rg:0") and not await redis.exists("dataset:h-large:rg:0")
+    assert disk.list_hashes() == ["h-large"]
+
+    rows = await SessionCache.get_dataset_rows("large", 5000, 5005, ["label"])
+    assert rows["label"].tolist() == [f"row {i}" for i in range(5000, 5005)]
+
+
+async def test_memory_backend_keeps_contents_in_process(redis, stores, monkeypatch):
+    _, memory = stores
+    monkeypatch.setattr(session_cache, "CACHE_BACKEND", "memory")
+    df = _frame()
+    await SessionCache.add_dataset("s", {"hash": "h"}, df)
+    assert (await SessionCache.get_dataset_manifest("s"))["store"] == "memory"
+    assert memory.list_hashes() == ["h"]
+    pd.testing.assert_frame_equal(await SessionCache.get_dataset_data("s"), df)
+
+
+async def test_release_deletes_local_contents(redis, stores, monkeypatch):
+    disk, _ = stores
+    monkeypatch.setattr(session_cache, "CACHE_DISK_MIN_BYTES", 1)
+    await SessionCache.add_dataset("a", {"hash": "h"}, _frame())
+    await SessionCache.add_dataset("b", {"hash": "h"}, _frame())
+    await SessionCache.remove_dataset("a")
+    assert disk.list_hashes() == ["h"]  # Still referenced by b
+    await SessionCache.remove_dataset("b")
+    assert disk.list_hashes() == []
+
+
+async def test_sweep_removes_expired_and_foreign_released_hashes(redis, stores, monkeypatch):
+    disk, _ = stores
+    monkeypatch.setattr(session_cache, "CACHE_DISK_MIN_BYTES", 1)
+    for name in ("kept", "expired", "released"):
+        await SessionCache.add_dataset(name, {"hash": f"h-{name}"}, _frame())
+    await redis.delete("dataset:h-expired:meta")  # As if its TTL ran out
+    # Released by another worker, which cannot delete this worker's files
+    await SessionCache._run_script("REMOVE_DATASET", [], ["released"])
+
+    monkeypatch.setattr(session_cache, "LOCAL_SWEEP_GRACE", 3600)
+    assert await SessionCache.sweep_local_stores() == 0  # Too recent to sweep
+
+    monkeypatch.setattr(session_cache, "LOCAL_SWEEP_GRACE", 0)
+    assert await SessionCache.sweep_local_stores() == 2
+    assert disk.list_hashes() == ["h-kept"]
+    assert len(await SessionCache.get_dataset_data("kept")) == 1000
@@ -0,0 +1,130 @@
+# backend/tests/test_dtypes.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.utils.dtypes as dtypes
+from app.utils.dtypes import ARROW_STRING_DTYPE, clean_dataframe, optimize_dtypes
+
+
+def _assert_round_trip(original: pd.DataFrame, optimized: pd.DataFrame):
+    """Every value survives the dtype change (compared as Python objects)."""
+    assert list(optimized.columns) == list(original.columns)
+    for i in range(original.shape[1]):
+        before = original.iloc[:, i].astype(object).where(original.iloc[:, i].notna(), None).tolist()
+        after = optimized.iloc[:, i].astype(object).where(optimized.iloc[:, i].notna(), None).tolist()
+        assert after == before, original.columns[i]
+
+
+def test_integers_shrink_to_the_smallest_exact_width():
+    df = pd.DataFrame({
+        "small": np.array([-3, 0, 100], dtype=np.int64),
+        "medium": np.array([-40000, 0, 40000], dtype=np.int64),
+        "unsigned": np.array([0, 200, 255], dtype=np.uint64),
+        "large": np.array([0, 1, 2 ** 40], dtype=np.int64)
+    })
+    optimized, memory = optimize_dtypes(df)
+    assert optimized.dtypes.to_dict() == {
+        "small": np.int8, "medium": np.int32, "unsigned": np.uint8, "large": np.int64
+    }
+    assert memory["converted"] == {"small": "int8", "medium": "int32", "unsigned": "uint8"}
+    assert memory["after_bytes"] < memory["before_bytes"]
+    _assert_round_trip(df, optimized)
+
+
+def test_floats_narrow_only_when_exact():
+    df = pd.DataFrame({
+        "exact": [0.5, 1.25, np.nan, np.inf, -np.inf],
+        "inexact": [0.1, 1.0, 2.0, 3.0, np.nan],
+        "huge": [1e300, 0.0, 1.0, 2.0, 3.0]
+    })
+    optimized, _ = optimize_dtypes(df)
+    assert optimized["exact"].dtype == np.float32
+    assert optimized["inexact"].dtype == np.float64
+    assert optimized["huge"].dtype == np.float64
+    _assert_round_trip(df, optimized)
+
+
+def test_strings_become_category_or_arrow_strings():
+    n = 100
+    df = pd.DataFrame({
+        "few": pd.Series(["a", "b", None, "a"] * (n // 4), dtype=object),
+        "many": pd.Series([f"v{i}" for i in range(n)], dtype=object),
+        "mixed": pd.Series(["a", 1] * (n // 2), dtype=object)
+    })
+    optimized, memory = optimize_dtypes(df)
+    assert isinstance(optimized["few"].dtype, pd.CategoricalDtype)
+    assert optimized["few"].cat.categories.dtype == ARROW_STRING_DTYPE
+    assert optimized["many"].dtype == ARROW_STRING_DTYPE
+    assert optimized["mixed"].dtype == object  # Not all strings: left alone
+    assert "mixed" not in memory["converted"]
+    _assert_round_trip(df, optimized)
+
+
+def test_other_dtypes_are_left_alone():
+    df = pd.DataFrame({
+        "flag": [True, False, True],
+        "nullable": pd.array([1, None, 3], dtype="Int64"),
+        "when": pd.to_datetime(["2024-01-01", "2024-01-02", None])
+    })
+    optimized, memory = optimize_dtypes(df)
+    pd.testing.assert_frame_equal(optimized, df)
+    assert memory["converted"] == {}
+
+
+def test_input_frame_is_not_modified():
+    df = pd.DataFrame({"x": np.arange(10, dtype=np.int64), "s": ["a"] * 10})
+    original = df.copy()
+    optimize_dtypes(df)
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_duplicate_column_names():
+    df = pd.DataFrame([[1, 2.5], [3, 4.5]], columns=["x", "x"])
+    optimized, _ = optimize_dtypes(df)
+    assert [str(t) for t in optimized.dtypes] == ["int8", "float32"]
+    _assert_round_trip(df, optimized)
+
+
+def test_disabled_by_setting(monkeypatch):
+    monkeypatch.setattr(dtypes, "INGEST_OPTIMIZE_DTYPES", False)
+    df = pd.DataFrame({"x": np.arange(10, dtype=np.int64)})
+    optimized, memory = optimize_dtypes(df)
+    assert optimized is df
+    assert memory["converted"] == {}
+    assert memory["before_bytes"] == memory["after_bytes"]
+
+
+@pytest.mark.parametrize("values", [[np.nan] * 4, []])
+def test_empty_and_all_null_columns(values):
+    df = pd.DataFrame({"x": pd.Series(values, dtype=np.float64)})
+    optimized, _ = optimize_dtypes(df)
+    _assert_round_trip(df, optimized)
+
+
+def test_clean_dataframe_replaces_inf_and_keeps_dtypes():
+    df = pd.DataFrame({
+        "wide": np.array([1.0, np.inf, -np.inf, np.nan]),
+        "narrow": np.array([np.inf, 2.0, 3.0, 4.0], dtype=np.float32),
+        "nullable": pd.array([1.5, np.inf, None, 2.0], dtype="Float64"),
+        "finite": np.array([1.0, 2.0, 3.0, 4.0]),
+        "ints": np.arange(4, dtype=np.int8),
+        "text": ["a", "inf", None, "b"]
+    })
+    original = df.copy()
+    cleaned = clean_dataframe(df)
+
+    assert cleaned.dtypes.to_dict() == df.dtypes.to_dict()
+    assert cleaned["wide"].isna().tolist() == [False, True, True, True]
+    assert cleaned["narrow"].isna().tolist() == [True, False, False, False]
+    assert cleaned["nullable"].isna().tolist() == [False, True, True, False]
+    pd.testing.assert_frame_equal(df, original)  # Input untouched
+    # Columns without inf are shared, not copied
+    assert np.shares_memory(cleaned["finite"].to_numpy(), df["finite"].to_numpy())
+    assert np.shares_memory(cleaned["ints"].to_numpy(), df["ints"].to_numpy())
+
+
+def test_clean_dataframe_without_inf_returns_the_frame():
+    df = pd.DataFrame({"x": [1.0, np.nan], "s": ["a", None]})
+    assert clean_dataframe(df) is df
@@ -0,0 +1,92 @@
+# backend/tests/test_executor.py
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import app.core.executor as executor
+from app.core.executor import ExecutorError, _BoundedPool, run_in_process, run_in_thread
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def threads(monkeypatch):
+    """A thread pool admitting one running and one waiting task."""
+    monkeypatch.setattr(executor, "EXECUTOR_QUEUE_SIZE", 1)
+    pool = _BoundedPool("threads", 1, lambda: ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(executor, "_threads", pool)
+    yield pool
+    pool.reset()
+
+
+@pytest.fixture
+def processes(monkeypatch):
+    monkeypatch.setattr(executor, "EXECUTOR_PROCESSES", 1)
+    pool = _BoundedPool(
+        "processes", 1,
+        lambda: ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    )
+    monkeypatch.setattr(executor, "_processes", pool)
+    yield pool
+    pool.reset()
+
+
+async def test_runs_off_the_event_loop(threads):
+    assert await run_in_thread(threading.current_thread) is not threading.current_thread()
+    assert await run_in_thread(int, "7", base=8) == 7
+
+
+async def test_rejects_tasks_beyond_capacity(threads):
+    release = threading.Event()
+    first = threads.submit(release.wait)
+    second = threads.submit(release.wait)
+    with pytest.raises(ExecutorError) as exc:
+        await run_in_thread(abs, -1)
+    assert exc.value.status_code == 503 and exc.value.code == "SERVER_BUSY"
+    assert exc.value.details == {"pool": "threads", "pending": 2}
+
+    release.set()
+    first.result(5)
+    second.result(5)
+    assert await run_in_thread(abs, -1) == 1
+    assert threads.stats() == {"pending": 0, "capacity": 2}
+
+
+async def test_timed_out_tasks_keep_their_slot_until_they_finish(threads):
+    release = threading.Event()
+    with pytest.raises(ExecutorError) as exc:
+        await run_in_thread(release.wait, timeout=0.05)
+    assert exc.value.status_code == 504 and exc.value.code == "TASK_TIMEOUT"
+    assert exc.value.details == {"timeout_seconds": 0.05}
+    assert threads.stats()["pending"] == 1
+
+    release.set()
+    for _ in range(100):
+        if threads.stats()["pending"] == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert threads.stats()["pending"] == 0
+
+
+async def test_task_errors_propagate_and_release_the_slot(threads):
+    with pytest.raises(ValueError):
+        await run_in_thread(int, "x")
+    assert threads.stats()["pending"] == 0
+
+
+async def test_crashed_process_pool_is_replaced(processes):
+    with pytest.raises(ExecutorError) as exc:
+        await run_in_process(os._exit, 1, timeout=60)
+    assert exc.value.status_code == 500 and exc.value.code == "WORKER_CRASHED"
+    assert processes._executor is None
+    assert await run_in_process(abs, -3, timeout=60) == 3
+
+
+async def test_without_processes_runs_on_the_thread_pool(threads, monkeypatch):
+    monkeypatch.setattr(executor, "EXECUTOR_PROCESSES", 0)
+    assert await run_in_process(threading.current_thread) is not threading.current_thread()
@@ -0,0 +1,94 @@
+# backend/tests/test_fingerprint.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.utils.dtypes as dtypes
+from app.services.dataset_service import process_dataframe
+from app.utils.dtypes import ARROW_STRING_DTYPE, optimize_dtypes
+from app.utils.fingerprint import changed_columns, column_fingerprint, fingerprint_dataframe
+
+
+@pytest.mark.parametrize("dtype", ["int8", "int16", "int32", "int64"])
+def test_signed_int_width_does_not_change_fingerprint(dtype):
+    values = [-128, -1, 0, 2, 127]
+    assert column_fingerprint(pd.Series(values, dtype=dtype)) == column_fingerprint(pd.Series(values))
+
+
+@pytest.mark.parametrize("dtype", ["uint8", "uint16", "uint32", "uint64"])
+def test_unsigned_int_width_does_not_change_fingerprint(dtype):
+    values = [0, 1, 255]
+    expected = column_fingerprint(pd.Series(values, dtype="uint64"))
+    assert column_fingerprint(pd.Series(values, dtype=dtype)) == expected
+    # Non-negative values hash the same whether stored signed or unsigned
+    assert column_fingerprint(pd.Series(values, dtype="int64")) == expected
+
+
+def test_float_width_does_not_change_fingerprint():
+    values = [-1.5, 0.0, 0.25, np.nan, np.inf]
+    assert column_fingerprint(pd.Series(values, dtype="float32")) == column_fingerprint(pd.Series(values))
+
+
+def test_string_representation_does_not_change_fingerprint():
+    values = pd.Series(["a", None, "b", "a"], dtype=object)
+    expected = column_fingerprint(values)
+    assert column_fingerprint(values.astype(ARROW_STRING_DTYPE)) == expected
+    assert column_fingerprint(values.astype(ARROW_STRING_DTYPE).astype("category")) == expected
+    assert column_fingerprint(values.astype("category")) == expected
+
+
+def test_values_and_order_change_fingerprint():
+    base = column_fingerprint(pd.Series([1, 2, 3]))
+    assert column_fingerprint(pd.Series([1, 2, 4])) != base
+    assert column_fingerprint(pd.Series([3, 2, 1])) != base
+    assert column_fingerprint(pd.Series([-1, 2, 3], dtype="int8")) != column_fingerprint(pd.Series([255, 2, 3], dtype="uint8"))
+
+
+def _frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 1000
+    return pd.DataFrame({
+        "small_int": rng.integers(-100, 100, n),
+        "wide_int": rng.integers(-2 ** 40, 2 ** 40, n),
+        "unsigned": rng.integers(0, 200, n).astype(np.uint64),
+        "halves": rng.integers(-1000, 1000, n) / 2,
+        "real": rng.normal(size=n),
+        "label": pd.Series(rng.choice(["x", "y", "z"], n), dtype=object),
+        "text": pd.Series([f"row {i}" for i in range(n)], dtype=object)
+    })
+
+
+def test_optimize_dtypes_does_not_change_fingerprints():
+    df = _frame()
+    optimized, memory = optimize_dtypes(df)
+    assert {"small_int", "unsigned", "halves", "label", "text"} <= memory["converted"].keys()
+    assert fingerprint_dataframe(optimized) == fingerprint_dataframe(df)
+
+
+def test_dataset_hash_is_independent_of_the_ingest_setting(monkeypatch):
+    df = _frame()
+    monkeypatch.setattr(dtypes, "INGEST_OPTIMIZE_DTYPES", True)
+    optimized_df, optimized_meta, optimized_hash = process_dataframe(df, "data.csv")
+    monkeypatch.setattr(dtypes, "INGEST_OPTIMIZE_DTYPES", False)
+    plain_df, plain_meta, plain_hash = process_dataframe(df, "data.csv")
+
+    assert optimized_meta["memory"]["converted"] and not plain_meta["memory"]["converted"]
+    assert optimized_hash == plain_hash
+    assert optimized_meta["column_hashes"] == plain_meta["column_hashes"]
+
+
+def test_changed_columns():
+    df = _frame()
+    old_hash, old = fingerprint_dataframe(df)
+    edited = df.copy()
+    edited.loc[0, "real"] += 1
+    edited["extra"] = 1
+    new_hash, new = fingerprint_dataframe(edited)
+    assert new_hash != old_hash
+    assert changed_columns(old, new) == ["real", "extra"]
+
+
+def test_dataset_hash_depends_on_column_names():
+    df = _frame()
+    assert fingerprint_dataframe(df)[0] != fingerprint_dataframe(df.rename(columns={"real": "other"}))[0]
@@ -0,0 +1,54 @@
+# backend/tests/test_helpers.py
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.utils.dtypes import ARROW_STRING_DTYPE
+from app.utils.helpers import dataframe_to_records, get_dataframe_preview
+
+
+def test_records_box_missing_and_infinite_values_as_none():
+    df = pd.DataFrame({
+        "float": [1.5, np.nan, np.inf, -np.inf],
+        "float32": np.array([0.5, np.nan, np.inf, 1.0], dtype=np.float32),
+        "nullable_int": pd.array([1, None, 3, 4], dtype="Int64"),
+        "nullable_float": pd.array([1.0, None, np.inf, 2.0], dtype="Float64"),
+        "text": pd.Series(["a", None, "c", "d"], dtype=ARROW_STRING_DTYPE),
+        "category": pd.Series(["x", "y", None, "x"], dtype="category"),
+        "when": pd.to_datetime(["2024-01-01", None, "2024-01-03", "2024-01-04"]),
+        "object": [1, "two", None, 4.0]
+    })
+    records = dataframe_to_records(df)
+    assert [row["float"] for row in records] == [1.5, None, None, None]
+    assert [row["float32"] for row in records] == [0.5, None, None, 1.0]
+    assert [row["nullable_int"] for row in records] == [1, None, 3, 4]
+    assert [row["nullable_float"] for row in records] == [1.0, None, None, 2.0]
+    assert [row["text"] for row in records] == ["a", None, "c", "d"]
+    assert [row["category"] for row in records] == ["x", "y", None, "x"]
+    assert records[1]["when"] is None and records[0]["when"] == pd.Timestamp("2024-01-01")
+    assert [row["object"] for row in records] == [1, "two", None, 4.0]
+    json.dumps(records, default=str, allow_nan=False)  # No NaN/inf left
+
+
+def test_records_hold_native_python_scalars():
+    df = pd.DataFrame({"i": np.array([1], dtype=np.int8), "f": np.array([0.25], dtype=np.float32), "b": [True]})
+    record = dataframe_to_records(df)[0]
+    assert [type(record[key]) for key in ("i", "f", "b")] == [int, float, bool]
+
+
+def test_records_of_empty_and_small_frames():
+    assert dataframe_to_records(pd.DataFrame({"x": []})) == []
+    df = pd.DataFrame([[1, 2]], columns=["x", "y"])
+    assert dataframe_to_records(df) == [{"x": 1, "y": 2}]
+
+
+def test_preview_limits_rows_and_columns():
+    df = pd.DataFrame({f"c{i}": np.arange(20.0) for i in range(60)})
+    df.iloc[0, 0] = np.nan
+    preview = get_dataframe_preview(df)
+    assert preview["columns"] == [f"c{i}" for i in range(50)]
+    assert len(preview["sample_rows"]) == 10
+    assert preview["sample_rows"][0]["c0"] is None
+
@@ -0,0 +1,123 @@
+# backend/tests/test_ingest_artifacts.py
+
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.utils.ingest_artifacts as ingest_artifacts
+from app.services.dataset_service import load_saved_dataset
+from app.utils.ingest_artifacts import artifact_paths, load_ingest_artifacts, write_ingest_artifacts
+
+
+@pytest.fixture
+def source(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "id": np.arange(500),
+        "value": rng.normal(size=500),
+        "label": rng.choice(["a", "b"], 500)
+    })
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _leftovers(file_path):
+    return [name for name in os.listdir(os.path.dirname(artifact_paths(file_path)[0])) if name.endswith(".tmp")]
+
+
+def test_saved_dataset_is_loaded_from_artifacts_the_second_time(source):
+    first_df, first_meta, first_hash = load_saved_dataset(source, "data.csv", "Data")
+    assert first_meta["parse_stats"]["engine"] != "artifacts"
+    assert all(os.path.exists(path) for path in artifact_paths(source))
+
+    df, meta, df_hash = load_saved_dataset(source, "data.csv", "Data")
+    assert meta["parse_stats"]["engine"] == "artifacts"
+    assert df_hash == first_hash
+    assert meta["column_hashes"] == first_meta["column_hashes"]
+    assert meta["preview"] == first_meta["preview"]
+    pd.testing.assert_frame_equal(df, first_df)  # Dtypes chosen at ingest included
+
+
+def test_changed_source_makes_artifacts_stale(source):
+    load_saved_dataset(source, "data.csv")
+    with open(source, "a") as f:
+        f.write("500,0.5,c\n")
+    assert load_ingest_artifacts(source) is None
+    df, meta, _ = load_saved_dataset(source, "data.csv")
+    assert meta["parse_stats"]["engine"] != "artifacts"
+    assert len(df) == 501
+    assert load_ingest_artifacts(source) is not None  # Rewritten
+
+
+def test_touched_source_makes_artifacts_stale(source):
+    load_saved_dataset(source, "data.csv")
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_ingest_artifacts(source) is None
+
+
+@pytest.mark.parametrize("field,value", [("version", 0), ("fingerprint_version", "fp0")])
+def test_other_versions_are_stale(source, field, value):
+    load_saved_dataset(source, "data.csv")
+    sidecar_path = artifact_paths(source)[1]
+    with open(sidecar_path) as f:
+        sidecar = json.load(f)
+    sidecar[field] = value
+    with open(sidecar_path, "w") as f:
+        json.dump(sidecar, f)
+    assert load_ingest_artifacts(source) is None
+
+
+def test_missing_or_corrupt_artifacts(source):
+    assert load_ingest_artifacts(source) is None
+    load_saved_dataset(source, "data.csv")
+    parquet_path, sidecar_path = artifact_paths(source)
+    with open(parquet_path, "wb") as f:
+        f.write(b"not parquet")
+    assert load_ingest_artifacts(source) is None
+    with open(sidecar_path, "w") as f:
+        f.write("{")
+    assert load_ingest_artifacts(source) is None
+
+
+def test_frames_arrow_cannot_store_leave_no_artifacts(source):
+    df = pd.DataFrame({"mixed": pd.Series([1, "a"], dtype=object)})
+    assert write_ingest_artifacts(source, df) is False
+    assert not any(os.path.exists(path) for path in artifact_paths(source))
+    assert _leftovers(source) == []
+
+
+def test_concurrent_writers_never_publish_a_partial_file(source, monkeypatch):
+    df, meta, df_hash = load_saved_dataset(source, "data.csv")
+    real_replace = os.replace
+    barrier = threading.Barrier(4)
+
+    def replace(src, dst):
+        # Let every writer finish its temp files before any of them is renamed
+        barrier.wait(timeout=10)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(ingest_artifacts.os, "replace", replace)
+    errors = []
+
+    def write():
+        try:
+            assert write_ingest_artifacts(source, df, df_hash, meta["column_hashes"])
+        except Exception as e:  # Reported below; threads swallow exceptions
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    loaded, sidecar = load_ingest_artifacts(source)
+    pd.testing.assert_frame_equal(loaded, df)
+    assert sidecar["hash"] == df_hash
+    assert _leftovers(source) == []
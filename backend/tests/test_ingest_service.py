@@ -0,0 +1,124 @@
+# backend/tests/test_ingest_service.py
+
+import asyncio
+
+import pytest
+
+import app.services.ingest_service as ingest
+from app.services.ingest_service import IngestJob, IngestJobError, enqueue_ingest_job, get_ingest_job
+from app.utils.session_cache import RedisCacheError, SessionCache
+
+pytestmark = pytest.mark.anyio
+
+SESSION = "session-1"
+
+
+@pytest.fixture
+async def workers(redis, monkeypatch):
+    monkeypatch.setattr(ingest, "INGEST_ANALYZE", False)
+    monkeypatch.setattr(ingest, "_queue", None)
+    monkeypatch.setattr(ingest, "_workers", [])
+    yield
+    await ingest.close_ingest_workers()
+
+
+@pytest.fixture
+def statuses(monkeypatch):
+    """Every status written to a job's state, in order."""
+    seen = []
+    set_job_state = SessionCache.set_job_state
+
+    async def record(job_id, updates, *args, **kwargs):
+        if "status" in updates:
+            seen.append(updates["status"])
+        return await set_job_state(job_id, updates, *args, **kwargs)
+
+    monkeypatch.setattr(SessionCache, "set_job_state", record)
+    return seen
+
+
+def _spooled(tmp_path, content: bytes, name: str = "data.csv") -> IngestJob:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return IngestJob(session_id=SESSION, filename=name, path=str(path), delete_path=True)
+
+
+async def _finished(job_id: str):
+    for _ in range(500):
+        state = await get_ingest_job(job_id, SESSION)
+        if state["status"] in ("done", "failed"):
+            return state
+        await asyncio.sleep(0.01)
+    raise AssertionError("Job did not finish")
+
+
+async def test_job_runs_to_done(workers, statuses, tmp_path):
+    job = _spooled(tmp_path, b"a,b\n1,x\n2,y\n")
+    state = await _finished(await enqueue_ingest_job(job))
+    assert statuses == ["queued", "running", "done"]
+    assert state["percent"] == 100 and state["result"]["num_rows"] == 2
+    assert (await SessionCache.get_dataset_data(SESSION))["a"].tolist() == [1, 2]
+    assert not (tmp_path / "data.csv").exists()
+
+
+async def test_job_records_its_failure(workers, statuses, tmp_path):
+    job = _spooled(tmp_path, b"\x00\x01", name="data.xyz")
+    state = await _finished(await enqueue_ingest_job(job))
+    assert statuses == ["queued", "running", "failed"]
+    assert state["error"]["status_code"] == 422 and state["result"] is None
+    assert not (tmp_path / "data.xyz").exists()
+
+
+async def test_other_sessions_cannot_see_a_job(workers, tmp_path):
+    job_id = await enqueue_ingest_job(_spooled(tmp_path, b"a\n1\n"))
+    await _finished(job_id)
+    assert await get_ingest_job(job_id, "someone-else") is None
+
+
+async def test_full_queue_rejects_and_removes_the_upload(workers, monkeypatch, tmp_path):
+    monkeypatch.setattr(ingest, "INGEST_QUEUE_SIZE", 1)
+    monkeypatch.setattr(ingest, "INGEST_CONCURRENCY", 0)  # Nothing drains the queue
+    await enqueue_ingest_job(_spooled(tmp_path, b"a\n1\n", name="first.csv"))
+    job = _spooled(tmp_path, b"a\n1\n", name="second.csv")
+    with pytest.raises(IngestJobError) as exc:
+        await enqueue_ingest_job(job)
+    assert exc.value.status_code == 503
+    assert not (tmp_path / "second.csv").exists()
+    assert await get_ingest_job(job.job_id, SESSION) is None
+
+
+async def test_queue_filling_during_the_state_write_marks_the_job_failed(workers, monkeypatch, tmp_path):
+    monkeypatch.setattr(ingest, "INGEST_QUEUE_SIZE", 1)
+    monkeypatch.setattr(ingest, "INGEST_CONCURRENCY", 0)
+    job = _spooled(tmp_path, b"a\n1\n")
+    set_job_state = SessionCache.set_job_state
+
+    async def racing(job_id, updates, *args, **kwargs):
+        await set_job_state(job_id, updates, *args, **kwargs)
+        if updates.get("status") == "queued":
+            ingest._queue.put_nowait(IngestJob(session_id=SESSION, filename="other.csv"))
+
+    monkeypatch.setattr(SessionCache, "set_job_state", racing)
+    with pytest.raises(IngestJobError):
+        await enqueue_ingest_job(job)
+    state = await get_ingest_job(job.job_id, SESSION)
+    assert state["status"] == "failed" and state["error"]["status_code"] == 503
+    assert not (tmp_path / "data.csv").exists()
+
+
+async def test_failed_state_write_removes_the_upload(workers, monkeypatch, tmp_path):
+    async def unavailable(*args, **kwargs):
+        raise RedisCacheError("Redis is down")
+
+    monkeypatch.setattr(SessionCache, "set_job_state", unavailable)
+    with pytest.raises(RedisCacheError):
+        await enqueue_ingest_job(_spooled(tmp_path, b"a\n1\n"))
+    assert not (tmp_path / "data.csv").exists()
+    assert ingest._queue.empty()
+
+
+async def test_closing_stops_workers_mid_job(workers, tmp_path):
+    await enqueue_ingest_job(_spooled(tmp_path, b"a\n1\n"))
+    await asyncio.sleep(0)  # A worker picks the job up
+    await asyncio.wait_for(ingest.close_ingest_workers(), 10)
+    assert not ingest._workers
@@ -0,0 +1,170 @@
+# backend/tests/test_parsers.py
+
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+import zstandard
+
+import app.utils.parsers as parsers
+from app.utils.parsers import parse_dataframe_from_bytes, parse_dataframe_from_file, parse_dataframe_from_path
+
+
+def _csv(df: pd.DataFrame, sep: str = ",") -> bytes:
+    return df.to_csv(index=False, sep=sep).encode()
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "id": np.arange(2000),
+        "value": rng.normal(size=2000),
+        "label": rng.choice(["a", "b", "c"], 2000),
+        "sparse": np.where(rng.random(2000) < 0.2, np.nan, rng.random(2000))
+    })
+
+
+def _assert_same_values(actual: pd.DataFrame, expected: pd.DataFrame):
+    # Engines may pick different (equivalent) dtypes; the values must match
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("ext,sep", [(".csv", ","), (".tsv", "\t")])
+def test_arrow_matches_pandas(frame, ext, sep):
+    data = _csv(frame, sep)
+    df = parse_dataframe_from_bytes(data, ext)
+    assert df.attrs["parse_stats"]["engine"] == "arrow"
+    assert df.attrs["parse_stats"]["rows"] == len(frame)
+    _assert_same_values(df, pd.read_csv(io.BytesIO(data), sep=sep))
+
+
+def test_type_change_after_sample_falls_back_to_pandas(frame, monkeypatch):
+    monkeypatch.setattr(parsers, "CSV_SAMPLE_BYTES", 1024)
+    frame["id"] = frame["id"].astype(object)
+    frame.loc[len(frame) - 1, "id"] = "not a number"
+    data = _csv(frame)
+    df = parse_dataframe_from_bytes(data, ".csv")
+    assert df.attrs["parse_stats"]["engine"] == "pandas"
+    _assert_same_values(df, pd.read_csv(io.BytesIO(data)))
+
+
+def test_quoted_newlines_across_blocks(monkeypatch):
+    monkeypatch.setattr(parsers, "CSV_BLOCK_SIZE", 256)
+    data = b"name,notes\n" + b"x,plain\n" * 100 + b'y,"line one\nline two"\n' + b"z,plain\n" * 100
+    df = parse_dataframe_from_bytes(data, ".csv")
+    assert len(df) == 201
+    assert df["notes"].iloc[100] == "line one\nline two"
+    _assert_same_values(df, pd.read_csv(io.BytesIO(data)))
+
+
+def test_fallback_rewinds_file_objects(frame, monkeypatch):
+    monkeypatch.setattr(parsers, "CSV_SAMPLE_BYTES", 1024)
+    frame["id"] = frame["id"].astype(object)
+    frame.loc[len(frame) - 1, "id"] = "x"
+    df = parse_dataframe_from_file(io.BytesIO(_csv(frame)), ".csv")
+    assert df.attrs["parse_stats"]["engine"] == "pandas"
+    assert len(df) == len(frame)
+
+
+def test_duplicate_column_names_fall_back_to_pandas():
+    df = parse_dataframe_from_bytes(b"a,a,b\n1,2,3\n", ".csv")
+    assert df.attrs["parse_stats"]["engine"] == "pandas"
+    assert list(df.columns) == ["a", "a.1", "b"]
+
+
+def test_sample_schema_applies_to_whole_file(monkeypatch):
+    # Integers in the sample, floats later: the column must not be cut to the sample's type silently
+    monkeypatch.setattr(parsers, "CSV_SAMPLE_BYTES", 64)
+    data = b"x\n" + b"1\n" * 100 + b"2.5\n"
+    df = parse_dataframe_from_bytes(data, ".csv")
+    assert df["x"].iloc[-1] == 2.5
+    assert df["x"].iloc[0] == 1
+
+
+def test_temporal_columns_stay_strings():
+    df = parse_dataframe_from_bytes(b"when,n\n2024-01-01,1\n2024-02-01,2\n", ".csv")
+    assert df.attrs["parse_stats"]["engine"] == "arrow"
+    assert pd.api.types.is_string_dtype(df["when"])
+    assert df["when"].tolist() == ["2024-01-01", "2024-02-01"]
+
+
+def test_empty_sample_columns_are_left_to_the_reader():
+    df = parse_dataframe_from_bytes(b"a,b\n1,\n2,\n", ".csv")
+    assert df["a"].tolist() == [1, 2]
+    assert df["b"].isna().all()
+
+
+def test_pandas_engine_setting(frame, monkeypatch):
+    monkeypatch.setattr(parsers, "CSV_ENGINE", "pandas")
+    data = _csv(frame)
+    df = parse_dataframe_from_bytes(data, ".csv")
+    assert df.attrs["parse_stats"]["engine"] == "pandas"
+    _assert_same_values(df, pd.read_csv(io.BytesIO(data)))
+
+
+def test_path_and_file_object_agree(frame, tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(_csv(frame))
+    from_path = parse_dataframe_from_path(str(path), ".csv")
+    with open(path, "rb") as f:
+        from_file = parse_dataframe_from_file(f, ".csv")
+    pd.testing.assert_frame_equal(from_path, from_file)
+
+
+def test_unparseable_file_raises_parse_error():
+    with pytest.raises(parsers.DataFrameParseError):
+        parse_dataframe_from_bytes(b"\x00\x01", ".xlsx")
+
+
+def _encode(df: pd.DataFrame, ext: str) -> bytes:
+    """The frame written in the format of ext."""
+    buffer = io.BytesIO()
+    if ext == ".parquet":
+        df.to_parquet(buffer, index=False)
+    elif ext in (".feather", ".arrow"):
+        df.to_feather(buffer)
+    elif ext in (".jsonl", ".ndjson"):
+        buffer.write(df.to_json(orient="records", lines=True).encode())
+    else:
+        base, _, codec = ext.rpartition(".")
+        data = _csv(df, parsers.DELIMITERS[base])
+        if codec == "gz":
+            return gzip.compress(data)
+        return zstandard.ZstdCompressor().compress(data)
+    return buffer.getvalue()
+
+
+FORMATS = [".parquet", ".feather", ".arrow", ".jsonl", ".ndjson", ".csv.gz", ".tsv.gz", ".csv.zst", ".tsv.zst"]
+
+
+@pytest.mark.parametrize("ext", FORMATS)
+def test_formats_round_trip(frame, ext, tmp_path):
+    data = _encode(frame, ext)
+    _assert_same_values(parse_dataframe_from_bytes(data, ext), frame)
+    path = tmp_path / f"data{ext}"
+    path.write_bytes(data)
+    _assert_same_values(parse_dataframe_from_path(str(path), ext), frame)
+
+
+@pytest.mark.parametrize("ext", FORMATS + [".csv", ".tsv"])
+def test_column_projection(frame, ext, tmp_path):
+    data = _encode(frame, ext) if ext in FORMATS else _csv(frame, parsers.DELIMITERS[ext])
+    columns = ["label", "id"]
+    df = parse_dataframe_from_bytes(data, ext, columns=columns)
+    assert sorted(df.columns) == sorted(columns)
+    _assert_same_values(df[columns], frame[columns])
+
+
+def test_compressed_file_objects_are_left_open(frame):
+    source = io.BytesIO(_encode(frame, ".csv.gz"))
+    parse_dataframe_from_file(source, ".csv.gz")
+    assert not source.closed
+
+
+@pytest.mark.parametrize("ext", [".parquet.gz", ".jsonl.zst", ".txt"])
+def test_unsupported_extensions(ext):
+    with pytest.raises(parsers.DataFrameParseError, match="Unsupported file extension"):
+        parse_dataframe_from_bytes(b"a\n1\n", ext)
@@ -0,0 +1,179 @@
+# backend/tests/test_profiling.py
+
+import math
+import warnings
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import app.utils.profiling as profiling
+from app.utils.profiling import ColumnProfile, DatasetProfile, numeric_profile, sample_rows
+
+
+def reference_summary(df: pd.DataFrame) -> List[Dict]:
+    """The per-column pandas/SciPy summary that numeric_profile replaced."""
+    summaries = []
+    for col in df.columns:
+        series = df[col].astype(np.float64)
+        if series.isnull().all():
+            continue
+        q1, q3 = float(series.quantile(0.25)), float(series.quantile(0.75))
+        iqr = q3 - q1
+        outliers = (series < q1 - 1.5 * iqr) | (series > q3 + 1.5 * iqr)
+        summary = {
+            "name": col,
+            "mean": float(series.mean()),
+            "std": float(series.std()),
+            "min": float(series.min()),
+            "max": float(series.max()),
+            "median": float(series.median()),
+            "q1": q1,
+            "q3": q3,
+            "iqr": iqr,
+            "skewness": float(series.skew()),
+            "kurtosis": float(series.kurtosis()),
+            "zero_count": int((series == 0).sum()),
+            "zero_percent": float((series == 0).mean() * 100),
+            "outlier_count": int(outliers.sum()),
+            "outlier_percent": float(outliers.mean() * 100)
+        }
+        if len(series) >= 8:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                _, p_value = stats.normaltest(series.dropna())
+            summary["is_normal"] = float(p_value) > 0.05
+        summaries.append(summary)
+    return summaries
+
+
+def assert_same_summaries(actual: List[Dict], expected: List[Dict]):
+    assert [s["name"] for s in actual] == [s["name"] for s in expected]
+    for a, b in zip(actual, expected):
+        assert a.keys() == b.keys(), a["name"]
+        for key, value in b.items():
+            if isinstance(value, float) and math.isnan(value):
+                assert math.isnan(a[key]), (a["name"], key)
+            elif isinstance(value, float):
+                assert a[key] == pytest.approx(value, rel=1e-9, abs=1e-9), (a["name"], key)
+            else:
+                assert a[key] == value, (a["name"], key)
+
+
+def mixed_frame(rows: int) -> pd.DataFrame:
+    """Numeric columns as ingest leaves them: downcast widths, nulls, skew, constants and ties."""
+    rng = np.random.default_rng(7)
+    sparse = rng.exponential(5, rows)
+    sparse[rng.random(rows) < 0.3] = np.nan
+    return pd.DataFrame({
+        "normal": rng.normal(100, 15, rows),
+        "skewed": rng.lognormal(3, 1, rows).astype(np.float32),
+        "counts": rng.integers(-5, 100, rows).astype(np.int8),
+        "unsigned": rng.integers(0, 60000, rows).astype(np.uint16),
+        "sparse": sparse,
+        "zeros": np.where(rng.random(rows) < 0.5, 0.0, rng.normal(size=rows)),
+        "constant": np.full(rows, 3.0),
+        "all_null": np.full(rows, np.nan),
+        "flag": rng.random(rows) < 0.5
+    })
+
+
+@pytest.mark.parametrize("rows", [1, 2, 3, 4, 7, 8, 9, 50, 5000])
+def test_matches_per_column_reference(rows):
+    df = mixed_frame(rows)
+    columns = df.select_dtypes(include=np.number).columns
+    assert_same_summaries(numeric_profile(df, columns), reference_summary(df[columns]))
+
+
+def test_batches_give_the_same_results(monkeypatch):
+    df = mixed_frame(1000)
+    columns = df.select_dtypes(include=np.number).columns
+    whole = numeric_profile(df, columns)
+    monkeypatch.setattr(profiling, "PROFILE_BATCH_BYTES", 1000 * 8 * 2)  # Two columns per batch
+    assert_same_summaries(numeric_profile(df, columns), whole)
+
+
+def test_normaltest_p_values_match_scipy():
+    rng = np.random.default_rng(3)
+    block = np.vstack([
+        rng.normal(size=500),
+        rng.exponential(size=500),
+        rng.uniform(size=500),
+        np.concatenate([rng.normal(size=400), np.full(100, np.nan)])
+    ])
+    profile = profiling._profile_block(block, normality=True, test_rows=None)
+    for row, p_value in zip(block, profile["p_value"]):
+        expected = stats.normaltest(row[~np.isnan(row)]).pvalue
+        assert p_value == pytest.approx(expected, rel=1e-9)
+
+
+def test_column_selection_and_order():
+    df = mixed_frame(100)
+    summaries = numeric_profile(df, ["sparse", "normal"])
+    assert [s["name"] for s in summaries] == ["sparse", "normal"]
+
+
+def test_without_normality():
+    df = mixed_frame(100)
+    assert all("is_normal" not in s for s in numeric_profile(df, ["normal"], normality=False))
+
+
+def test_empty_frame():
+    df = mixed_frame(10).iloc[:0]
+    assert numeric_profile(df, df.columns) == []
+
+
+def test_column_profile_facts_are_computed_once():
+    series = pd.Series(["a", "b", None, "a"], dtype="category")
+    column = ColumnProfile(series)
+    assert column.is_text
+    assert column.value_counts is column.value_counts
+    assert column.null_count == 1
+    assert column.sample_values == ["a", "b", "a"]
+
+
+def test_distinct_count_matches_nunique():
+    text = pd.Series(["a", "b", None, "a"], dtype=object)
+    unused_category = pd.Series(pd.Categorical(["a", "a", None], categories=["a", "b", "c"]))
+    numbers = pd.Series([1.0, 2.0, 2.0, np.nan])
+    for series in (text, unused_category, numbers):
+        assert ColumnProfile(series).distinct_count == series.nunique()
+    # Text columns read it off value_counts, numbers do not need them
+    column = ColumnProfile(text)
+    column.distinct_count
+    assert "value_counts" in column.__dict__
+    column = ColumnProfile(numbers)
+    column.distinct_count
+    assert "value_counts" not in column.__dict__
+
+
+def test_dataset_profile_reuses_column_profiles():
+    df = mixed_frame(10)
+    profile = DatasetProfile(df)
+    assert profile["normal"] is profile["normal"]
+    assert np.shares_memory(profile["normal"].series.to_numpy(), df["normal"].to_numpy())
+    assert profile.num_rows == 10
+
+
+def test_sample_rows_is_reproducible():
+    sample = sample_rows(1000, 100, seed=1)
+    assert len(sample) == 100 and len(np.unique(sample)) == 100
+    assert np.all(np.diff(sample) > 0) and sample[0] >= 0 and sample[-1] < 1000
+    np.testing.assert_array_equal(sample, sample_rows(1000, 100, seed=1))
+    assert not np.array_equal(sample, sample_rows(1000, 100, seed=2))
+    assert sample_rows(100, 100, seed=1) is None
+
+
+def test_normality_on_test_rows_uses_only_the_sample():
+    df = mixed_frame(5000)
+    columns = ["normal", "skewed", "sparse", "constant"]
+    test_rows = sample_rows(len(df), 200, seed=0)
+    sampled = numeric_profile(df, columns, test_rows=test_rows)
+    exact = numeric_profile(df, columns)
+    expected = reference_summary(df[columns].iloc[test_rows])
+    for s, e, x in zip(sampled, expected, exact):
+        assert s["is_normal"] == e["is_normal"], s["name"]
+        # Everything else is still computed on every row
+        assert {k: v for k, v in s.items() if k != "is_normal"} == {k: v for k, v in x.items() if k != "is_normal"}
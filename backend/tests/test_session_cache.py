@@ -0,0 +1,277 @@
+# backend/tests/test_session_cache.py
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.utils.session_cache as session_cache
+from app.utils.fingerprint import fingerprint_dataframe
+from app.utils.frame_cache import FrameCache
+from app.utils.session_cache import SessionCache
+
+pytestmark = pytest.mark.anyio
+
+
+def _frame(i: int) -> pd.DataFrame:
+    return pd.DataFrame({"x": np.arange(1000) + i})
+
+
+async def _assert_total_matches(redis):
+    tracked = await redis.hvals("cache:dataset_bytes")
+    assert int(await redis.get("cache:total_bytes")) == sum(int(v) for v in tracked)
+
+
+async def test_running_total_follows_writes_and_releases(redis):
+    for i in range(5):
+        await SessionCache.add_dataset(f"s{i}", {"hash": f"h{i}"}, _frame(i))
+    await _assert_total_matches(redis)
+    await SessionCache.add_dataset("s1", {"hash": "h2"}, _frame(2))  # h1 released, h2 shared
+    await SessionCache.set_analysis_result("s2", "overview", {"v": "x" * 100})
+    await SessionCache.remove_dataset("s3")
+    await _assert_total_matches(redis)
+    assert sorted(await redis.hkeys("cache:dataset_bytes")) == [b"h0", b"h2", b"h4"]
+
+
+async def test_expired_datasets_are_reconciled_before_evicting_sessions(redis, monkeypatch):
+    await SessionCache.add_dataset("s0", {"hash": "h0"}, _frame(0))
+    one = int(await redis.hget("cache:dataset_bytes", "h0"))
+    for i in range(1, 30):
+        await SessionCache.add_dataset(f"s{i}", {"hash": f"h{i}"}, _frame(i))
+    for i in range(2, 30):
+        await redis.delete(f"dataset:h{i}:meta")  # As if their TTL ran out
+
+    monkeypatch.setattr(session_cache, "CACHE_MAX_BYTES", one * 5)
+    await SessionCache.add_dataset("new", {"hash": "h-new"}, _frame(99))
+    await _assert_total_matches(redis)
+    assert sorted(await redis.hkeys("cache:dataset_bytes")) == [b"h-new", b"h0", b"h1"]
+    assert await SessionCache.has_dataset("s0") and await SessionCache.has_dataset("s1")
+
+
+async def test_writes_below_the_watermark_do_not_scan(redis):
+    await SessionCache.add_dataset("s0", {"hash": "h0"}, _frame(0))
+    await redis.delete("dataset:h0:meta")
+    await SessionCache.add_dataset("s1", {"hash": "h1"}, _frame(1))
+    # Far below CACHE_MAX_BYTES: the expired entry is left for a later pass
+    assert await redis.hexists("cache:dataset_bytes", "h0")
+    assert await redis.get("cache:reconcile_cursor") is None
+
+
+async def test_counter_is_seeded_for_existing_caches(redis):
+    await SessionCache.add_dataset("s0", {"hash": "h0"}, _frame(0))
+    await redis.delete("cache:total_bytes")
+    await SessionCache.add_dataset("s1", {"hash": "h1"}, _frame(1))
+    await _assert_total_matches(redis)
+
+
+async def test_reads_refresh_the_dataset_and_session_keys(redis):
+    await SessionCache.add_dataset("s", {"hash": "h"}, _frame(0))
+    await SessionCache.set_analysis_result("s", "overview", {"v": 1})
+    keys = ["dataset:h:meta", "dataset:h:refs", "dataset:h:analyses", "session:s:dataset:meta", "session:s:keys"]
+
+    for key in keys:
+        await redis.expire(key, 5)
+    SessionCache._frames = FrameCache()  # Force a read from Redis
+    await SessionCache.get_dataset_data("s")
+    assert [await redis.ttl(key) > 5 for key in keys] == [True] * len(keys)
+
+    for key in keys:
+        await redis.expire(key, 5)
+    assert await SessionCache.get_analysis_result("s", "overview") == {"v": 1}
+    assert [await redis.ttl(key) > 5 for key in keys] == [True] * len(keys)
+
+
+async def test_reads_refresh_row_groups_that_were_not_fetched(redis, monkeypatch):
+    monkeypatch.setattr(session_cache, "ROW_GROUP_SIZE", 100)
+    await SessionCache.add_dataset("s", {"hash": "h"}, _frame(0))
+    assert await redis.exists(*[f"dataset:h:rg:{i}" for i in range(10)]) == 10
+
+    for key in await redis.keys("dataset:h:*"):
+        await redis.expire(key, 5)
+    await SessionCache.get_dataset_rows("s", 0, 100)
+    for key in await redis.keys("dataset:h:*"):
+        if await redis.ttl(key) <= 5:
+            await redis.delete(key)  # As if its TTL ran out
+
+    SessionCache._frames = FrameCache()  # Another worker
+    last = await SessionCache.get_dataset_rows("s", 900, 1000)
+    assert last["x"].tolist() == list(range(900, 1000))
+
+
+def _mixed(n: int = 1000) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": np.arange(n, dtype="int32"),
+        "value": np.linspace(0, 1, n),
+        "label": pd.Series([f"row {i}" for i in range(n)], dtype="str"),
+        "kind": pd.Categorical(["a", "b"] * (n // 2)),
+        "when": pd.date_range("2024-01-01", periods=n, freq="h")
+    })
+
+
+async def test_round_trip_keeps_values_and_dtypes(redis):
+    df = _mixed()
+    await SessionCache.add_dataset("s", {"hash": "h"}, df)
+    SessionCache._frames = FrameCache()
+    pd.testing.assert_frame_equal(await SessionCache.get_dataset_data("s"), df)
+
+
+async def test_projected_reads_fetch_only_the_requested_columns(redis):
+    await SessionCache.add_dataset("s", {"hash": "h"}, _mixed())
+    SessionCache._frames = FrameCache()
+    part = await SessionCache.get_dataset_data("s", columns=["label", "missing", "id"])
+    assert list(part.columns) == ["label", "id"]
+    assert part["id"].tolist() == list(range(1000))
+    assert SessionCache._frames.get_many("h", [("value", 0), ("kind", 0), ("when", 0)]) == {}
+
+
+@pytest.mark.parametrize("start", [0, 5000])
+async def test_empty_reads_keep_the_dtypes(redis, start):
+    df = _mixed(0) if start == 0 else _mixed()
+    await SessionCache.add_dataset("s", {"hash": "h"}, df)
+    empty = await SessionCache.get_dataset_rows("s", start, start + 10)
+    assert len(empty) == 0
+    assert empty.dtypes.to_dict() == df.dtypes.to_dict()
+    assert list((await SessionCache.get_dataset_rows("s", start, None, ["when"])).dtypes) == [df["when"].dtype]
+
+
+async def test_range_reads_fetch_only_the_covering_row_groups(redis, monkeypatch):
+    monkeypatch.setattr(session_cache, "ROW_GROUP_SIZE", 100)
+    await SessionCache.add_dataset("s", {"hash": "h"}, _frame(0))
+    manifest = await SessionCache.get_dataset_manifest("s")
+    assert manifest["num_row_groups"] == 10 and manifest["row_group_size"] == 100
+    assert await redis.hlen("dataset:h:rg:9") == 1
+
+    SessionCache._frames = FrameCache()
+    rows = await SessionCache.get_dataset_rows("s", 95, 205)
+    assert rows["x"].tolist() == list(range(95, 205))
+    cached = SessionCache._frames.get_many("h", [("x", i) for i in range(10)])
+    assert sorted(i for _, i in cached) == [0, 1, 2]
+
+    assert (await SessionCache.get_dataset_rows("s", 990, 5000))["x"].tolist() == list(range(990, 1000))
+    assert (await SessionCache.get_dataset_rows("s", 300, 300)).empty
+
+
+async def test_range_reads_combine_cached_and_fetched_groups(redis, monkeypatch):
+    monkeypatch.setattr(session_cache, "ROW_GROUP_SIZE", 100)
+    await SessionCache.add_dataset("s", {"hash": "h"}, _frame(0))
+    SessionCache._frames = FrameCache()
+    await SessionCache.get_dataset_rows("s", 100, 200)
+    await redis.delete("dataset:h:rg:1")  # Must now come from the frame cache
+    rows = await SessionCache.get_dataset_rows("s", 0, 300)
+    assert rows["x"].tolist() == list(range(300))
+
+
+async def test_set_dataset_data_hashes_like_ingest(redis):
+    df = _mixed()
+    df_hash, _ = fingerprint_dataframe(df)
+    await SessionCache.add_dataset("ingested", {"hash": df_hash}, df)
+    await SessionCache.set_dataset_data("direct", df.astype({"id": "int64"}))
+    assert (await SessionCache.get_dataset_manifest("direct"))["hash"] == df_hash
+    assert sorted(await redis.smembers(f"dataset:{df_hash}:refs")) == [b"direct", b"ingested"]
+
+
+async def test_sessions_share_contents_by_hash(redis, monkeypatch):
+    encodes = []
+    encode_row_groups = SessionCache._encode_row_groups.__func__
+
+    def counting(cls, df):
+        encodes.append(len(df))
+        return encode_row_groups(cls, df)
+
+    monkeypatch.setattr(SessionCache, "_encode_row_groups", classmethod(counting))
+    df = _mixed()
+    await SessionCache.add_dataset("a", {"hash": "h", "title": "A"}, df)
+    await SessionCache.add_dataset("b", {"hash": "h", "title": "B"}, df.copy())
+    assert encodes == [1000]  # Stored once
+    assert sorted(await redis.smembers("dataset:h:refs")) == [b"a", b"b"]
+    assert (await SessionCache.get_dataset_meta("b"))["title"] == "B"
+
+    await SessionCache.set_analysis_result("a", "overview", {"v": 1})
+    assert await SessionCache.get_analysis_result("b", "overview") == {"v": 1}
+
+
+async def test_last_reference_releases_the_contents(redis):
+    await SessionCache.add_dataset("a", {"hash": "h"}, _frame(0))
+    await SessionCache.add_dataset("b", {"hash": "h"}, _frame(0))
+    await SessionCache.set_analysis_result("a", "overview", {"v": 1})
+
+    await SessionCache.remove_dataset("a")
+    assert await redis.exists("dataset:h:meta", "dataset:h:rg:0", "dataset:h:analysis:overview") == 3
+    assert len(await SessionCache.get_dataset_data("b")) == 1000
+
+    await SessionCache.add_dataset("b", {"hash": "other"}, _frame(1))  # Replacing releases too
+    assert await redis.keys("dataset:h:*") == []
+    assert await redis.hkeys("cache:dataset_bytes") == [b"other"]
+    assert SessionCache._frames.get_many("h", [("x", 0)]) == {}
+
+
+async def test_reads_with_a_stale_manifest_follow_a_replacement(redis):
+    await SessionCache.add_dataset("s", {"hash": "old"}, _frame(0))
+    stale = await SessionCache.get_dataset_manifest("s")
+    await SessionCache.add_dataset("s", {"hash": "new"}, _frame(1))
+    SessionCache._manifests["s"] = stale  # As remembered by another worker
+
+    result = await SessionCache._run_script(
+        "READ_ROW_GROUPS", ["session:s:dataset:meta"], ["old", 60, "s", 0, 1, 0, 1, "x"]
+    )
+    assert result[0] == 0
+    assert session_cache._loads(result[1])["hash"] == "new"
+
+    rows = await SessionCache.get_dataset_rows("s", 0, 3)
+    assert rows["x"].tolist() == [1, 2, 3]
+    assert SessionCache._manifests["s"]["hash"] == "new"
+
+
+async def test_replacing_with_unstored_contents_asks_for_them_first(redis):
+    result = await SessionCache._run_script(
+        "REPLACE_DATASET",
+        ["session:s:dataset:meta", "session:s:keys"],
+        ["s", "h", 60, "1", *SessionCache._eviction_args()]
+    )
+    assert result == [0]
+    assert await redis.keys("*") == []
+
+
+async def test_concurrent_replacements_leave_one_consistent_dataset(redis):
+    frames = [_frame(i) for i in range(5)]
+    await asyncio.gather(*[
+        SessionCache.add_dataset("s", {"hash": f"h{i}"}, df) for i, df in enumerate(frames)
+    ])
+    manifest = await SessionCache.get_dataset_manifest("s")
+    winner = int(manifest["hash"][1:])
+    assert (await SessionCache.get_dataset_meta("s"))["hash"] == manifest["hash"]
+    pd.testing.assert_frame_equal(await SessionCache.get_dataset_data("s"), frames[winner])
+    # Every losing dataset was released
+    assert await redis.hkeys("cache:dataset_bytes") == [manifest["hash"].encode()]
+    await _assert_total_matches(redis)
+
+
+async def test_remove_dataset_clears_the_session(redis):
+    await SessionCache.add_dataset("s", {"hash": "h"}, _frame(0))
+    await SessionCache.update_dataset_meta("s", {"title": "T"})
+    extra = SessionCache._get_key("s", "dataset", "extra")
+    pipe = redis.pipeline()
+    pipe.set(extra, b"1")
+    SessionCache._queue_register(pipe, "s", [extra])
+    await pipe.execute()
+    assert await SessionCache.list_keys("s") == [extra, "session:s:dataset:meta", "session:s:keys"]
+
+    await SessionCache.remove_dataset("s")
+    assert await redis.keys("*") == [b"cache:total_bytes"]
+    assert await redis.zcard("cache:sessions") == 0
+    assert await SessionCache.get_dataset_data("s") is None
+    assert "s" not in SessionCache._manifests
+
+
+async def test_replacing_drops_the_previous_session_keys(redis):
+    await SessionCache.add_dataset("s", {"hash": "h", "title": "Old"}, _frame(0))
+    extra = SessionCache._get_key("s", "dataset", "extra")
+    pipe = redis.pipeline()
+    pipe.set(extra, b"1")
+    SessionCache._queue_register(pipe, "s", [extra])
+    await pipe.execute()
+
+    await SessionCache.add_dataset("s", {"hash": "h2"}, _frame(1))
+    assert not await redis.exists(extra)
+    assert "title" not in await SessionCache.get_dataset_meta("s")
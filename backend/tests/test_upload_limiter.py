@@ -0,0 +1,106 @@
+# backend/tests/test_upload_limiter.py
+
+import json
+from typing import Dict, List, Optional
+
+import pytest
+
+from app.middleware.upload_limiter import UploadLimiterMiddleware
+
+pytestmark = pytest.mark.anyio
+
+LIMIT = 1000
+
+
+class EchoApp:
+    """Reads the whole body like a route would, then answers with its size."""
+
+    def __init__(self, catch: bool = False):
+        self.catch = catch
+        self.called = False
+
+    async def __call__(self, scope, receive, send):
+        self.called = True
+        size = 0
+        try:
+            while True:
+                message = await receive()
+                size += len(message.get("body", b""))
+                if not message.get("more_body"):
+                    break
+        except Exception:
+            if not self.catch:
+                raise
+            # Like a route turning any read error into its own error response
+            await send({"type": "http.response.start", "status": 400, "headers": []})
+            await send({"type": "http.response.body", "body": b"read failed"})
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": str(size).encode()})
+
+
+async def _call(
+    app,
+    chunks: List[bytes],
+    content_length: Optional[int] = None,
+    method: str = "POST",
+    path: str = "/upload/session-file"
+) -> Dict:
+    """Send a request body in chunks through the limiter; returns the response and chunks read."""
+    headers = [] if content_length is None else [(b"content-length", str(content_length).encode())]
+    scope = {"type": "http", "method": method, "path": path, "headers": headers}
+    pending = list(chunks)
+    read = 0
+    sent = []
+
+    async def receive():
+        nonlocal read
+        read += 1
+        body = pending.pop(0) if pending else b""
+        return {"type": "http.request", "body": body, "more_body": bool(pending)}
+
+    async def send(message):
+        sent.append(message)
+
+    await UploadLimiterMiddleware(app, max_file_size=LIMIT)(scope, receive, send)
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    return {"status": start["status"], "body": body, "read": read}
+
+
+async def test_under_the_limit_passes_through():
+    response = await _call(EchoApp(), [b"x" * 400, b"x" * 400], content_length=800)
+    assert response["status"] == 200 and response["body"] == b"800"
+
+
+async def test_declared_length_over_the_limit_is_rejected_unread():
+    app = EchoApp()
+    response = await _call(app, [b"x" * 10], content_length=LIMIT + 1)
+    assert response["status"] == 413 and not app.called and response["read"] == 0
+    error = json.loads(response["body"])
+    assert error["code"] == "FILE_TOO_LARGE"
+    assert error["details"] == {"max_size": LIMIT, "content_length": str(LIMIT + 1)}
+
+
+async def test_streamed_body_is_cut_off_once_it_crosses_the_limit():
+    response = await _call(EchoApp(), [b"x" * 300] * 10)  # Chunked, no Content-Length
+    assert response["status"] == 413
+    assert response["read"] == 4  # Stopped at the chunk that crossed the limit
+    assert json.loads(response["body"])["details"] == {"max_size": LIMIT, "body_size": 1200}
+
+
+async def test_understated_length_is_still_counted():
+    response = await _call(EchoApp(), [b"x" * 600] * 3, content_length=10)
+    assert response["status"] == 413
+
+
+async def test_the_app_error_response_is_replaced():
+    response = await _call(EchoApp(catch=True), [b"x" * 600] * 3)
+    assert response["status"] == 413
+    assert json.loads(response["body"])["code"] == "FILE_TOO_LARGE"
+
+
+@pytest.mark.parametrize("method,path", [("GET", "/upload/session-file"), ("POST", "/analyze/overview")])
+async def test_other_requests_are_not_limited(method, path):
+    response = await _call(EchoApp(), [b"x" * 600] * 3, method=method, path=path)
+    assert response["status"] == 200 and response["body"] == b"1800"
@@ -0,0 +1,145 @@
+# backend/tests/test_uploads_catalog.py
+
+import json
+import os
+
+import pytest
+
+import app.utils.uploads_catalog as uploads_catalog
+from app.utils.uploads_catalog import UploadsCatalog
+
+
+def _save(folder, base: str, meta=None, ext: str = ".csv", content: bytes = b"a\n1\n"):
+    (folder / f"{base}{ext}").write_bytes(content)
+    if meta is not None:
+        (folder / f"{base}.summary.json").write_text(json.dumps(meta))
+
+
+def _bump_mtime(path):
+    """Move a file's or folder's mtime forward, for filesystems with coarse timestamps."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def folder(tmp_path):
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    _save(uploads, "alpha", {"id": "alpha", "title": "Alpha", "hash": "h-a", "created_at": "2024-01-03T00:00:00"})
+    _save(uploads, "beta", {"id": "beta", "title": "Beta", "hash": "h-b", "created_at": "2024-01-01T00:00:00"},
+          content=b"a\n" + b"1\n" * 100)
+    _save(uploads, "gamma", {"id": "gamma", "title": "Gamma", "hash": "h-c", "created_at": "2024-01-02T00:00:00"},
+          ext=".parquet", content=b"x" * 10)
+    return uploads
+
+
+@pytest.fixture
+def catalog(folder):
+    catalog = UploadsCatalog(str(folder))
+    yield catalog
+    catalog.close()
+
+
+def _titles(entries):
+    return [entry["title"] for entry in entries]
+
+
+def test_lists_datasets_with_their_metadata(catalog):
+    entries, total = catalog.list()
+    assert total == 3
+    assert _titles(entries) == ["Alpha", "Gamma", "Beta"]  # Newest first
+    assert entries[0]["filename"] == "alpha.csv"
+    assert entries[0]["hash"] == "h-a"
+    assert entries[0]["size"] == len(b"a\n1\n")
+
+
+@pytest.mark.parametrize("sort,descending,expected", [
+    ("title", False, ["Alpha", "Beta", "Gamma"]),
+    ("title", True, ["Gamma", "Beta", "Alpha"]),
+    ("created_at", False, ["Beta", "Gamma", "Alpha"]),
+    ("size", True, ["Beta", "Gamma", "Alpha"]),
+    ("filename", False, ["Alpha", "Beta", "Gamma"])
+])
+def test_sort(catalog, sort, descending, expected):
+    entries, _ = catalog.list(sort=sort, descending=descending)
+    assert _titles(entries) == expected
+
+
+def test_pages(catalog):
+    entries, total = catalog.list(offset=1, limit=1, sort="title", descending=False)
+    assert total == 3
+    assert _titles(entries) == ["Beta"]
+    assert catalog.list(offset=5, limit=10)[0] == []
+
+
+def test_unsupported_sort_column(catalog):
+    with pytest.raises(ValueError):
+        catalog.list(sort="meta; DROP TABLE datasets")
+
+
+def test_files_without_summary_and_other_files(folder, catalog):
+    _save(folder, "plain")
+    (folder / "notes.txt").write_text("not a dataset")
+    (folder / ".artifacts").mkdir()
+    (folder / ".artifacts" / "alpha.parquet").write_bytes(b"copy")
+    _bump_mtime(folder)
+    entries, total = catalog.list(sort="filename", descending=False)
+    assert total == 4
+    plain = entries[-1]
+    assert plain["filename"] == "plain.csv" and plain["id"] == "plain" and plain.get("title") is None
+
+
+def test_added_and_removed_files_show_up_on_the_next_query(folder, catalog):
+    catalog.list()
+    _save(folder, "delta", {"title": "Delta", "created_at": "2024-01-04T00:00:00"})
+    os.remove(folder / "beta.csv")
+    _bump_mtime(folder)
+    entries, total = catalog.list()
+    assert total == 3
+    assert _titles(entries) == ["Delta", "Alpha", "Gamma"]
+
+
+def test_edited_summaries_wait_for_the_rescan_interval(folder, catalog, monkeypatch):
+    catalog.list()
+    _save(folder, "alpha", {"title": "Renamed", "created_at": "2024-01-03T00:00:00"})
+    _bump_mtime(folder / "alpha.summary.json")  # Rewritten in place: the folder's mtime is unchanged
+    assert catalog.refresh() is False
+    monkeypatch.setattr(uploads_catalog, "CATALOG_RESCAN_INTERVAL", 0)
+    assert catalog.refresh() is True
+    assert "Renamed" in _titles(catalog.list()[0])
+
+
+def test_index_file_applies_writes_immediately(folder, catalog):
+    catalog.list()
+    _save(folder, "alpha", {"title": "Alpha v2", "hash": "h-a2", "created_at": "2024-01-03T00:00:00"})
+    catalog.index_file("alpha.csv")
+    assert catalog.find_duplicate(df_hash="h-a2") == ("hash", "alpha.csv")
+    os.remove(folder / "alpha.csv")
+    catalog.index_file("alpha.csv")
+    assert catalog.find_duplicate(df_hash="h-a2") is None
+
+
+def test_find_duplicate(catalog):
+    assert catalog.find_duplicate(df_hash="h-b") == ("hash", "beta.csv")
+    assert catalog.find_duplicate(df_hash="unknown", title="Gamma") == ("title", "gamma.parquet")
+    assert catalog.find_duplicate(df_hash="h-b", title="Gamma") == ("hash", "beta.csv")
+    assert catalog.find_duplicate(df_hash="unknown", title="Unknown") is None
+    assert catalog.find_duplicate() is None
+
+
+def test_index_is_shared_through_the_database(folder, catalog):
+    catalog.list()
+    other = UploadsCatalog(str(folder))
+    try:
+        assert other.refresh() is False  # Already scanned by the first worker
+        assert other.list()[1] == 3
+    finally:
+        other.close()
+
+
+def test_missing_folder(tmp_path):
+    catalog = UploadsCatalog(str(tmp_path / "missing"), db_path=str(tmp_path / "catalog.sqlite3"))
+    try:
+        assert catalog.list() == ([], 0)
+    finally:
+        catalog.close()
@@ -0,0 +1,133 @@
+# backend/tests/test_url_download.py
+
+import asyncio
+import socket
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import app.core.http as http
+from app.services.upload_service import UrlDownloadError, download_to_tempfile
+
+pytestmark = pytest.mark.anyio
+
+BODY = b"a,b\n" + b"1,2\n" * 1000
+
+
+async def _full(request):
+    return web.Response(body=BODY, content_type="text/csv")
+
+
+async def _chunked(request):
+    # No Content-Length: the size is only known while streaming
+    resp = web.StreamResponse(headers={"Content-Type": "text/csv"})
+    resp.enable_chunked_encoding()
+    await resp.prepare(request)
+    for _ in range(10):
+        await resp.write(BODY)
+    await resp.write_eof()
+    return resp
+
+
+async def _stalled(request):
+    resp = web.StreamResponse(headers={"Content-Type": "text/csv"})
+    resp.content_length = len(BODY) * 2
+    await resp.prepare(request)
+    await resp.write(BODY)
+    await asyncio.sleep(5)
+    return resp
+
+
+@pytest.fixture
+async def server(monkeypatch):
+    monkeypatch.setattr(http, "HTTP_READ_TIMEOUT", 0.2)
+    app = web.Application()
+    app.router.add_get("/data.csv", _full)
+    app.router.add_get("/chunked.csv", _chunked)
+    app.router.add_get("/stalled.csv", _stalled)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    yield test_server
+    await http.close_http()
+    await test_server.close()
+
+
+async def _close_delimited_server(payload: bytes):
+    """Raw HTTP/1.0 server whose body has no Content-Length and ends when the connection closes."""
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: text/csv\r\n\r\n" + payload)
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def test_download_returns_file_and_meta(server):
+    received = []
+
+    async def progress(size, total):
+        received.append((size, total))
+
+    tmp, meta = await download_to_tempfile(str(server.make_url("/data.csv")), progress=progress)
+    with tmp:
+        assert tmp.read() == BODY
+    assert meta == {"filename": "data.csv", "size": len(BODY), "mime_type": "text/csv"}
+    assert received[-1] == (len(BODY), len(BODY))
+
+
+async def test_content_length_over_cap_is_rejected_before_reading(server):
+    received = []
+
+    async def progress(size, total):
+        received.append(size)
+
+    with pytest.raises(UrlDownloadError) as excinfo:
+        await download_to_tempfile(str(server.make_url("/data.csv")), max_bytes=len(BODY) - 1, progress=progress)
+    assert excinfo.value.status_code == 413
+    assert excinfo.value.details == {"max_size": len(BODY) - 1}
+    assert received == []
+
+
+async def test_cap_is_enforced_while_streaming_without_content_length(server):
+    with pytest.raises(UrlDownloadError) as excinfo:
+        await download_to_tempfile(str(server.make_url("/chunked.csv")), max_bytes=len(BODY) * 3)
+    assert excinfo.value.status_code == 413
+
+
+async def test_cap_is_enforced_on_close_delimited_body():
+    raw = await _close_delimited_server(BODY * 10)
+    port = raw.sockets[0].getsockname()[1]
+    try:
+        with pytest.raises(UrlDownloadError) as excinfo:
+            await download_to_tempfile(f"http://127.0.0.1:{port}/data.csv", max_bytes=len(BODY) * 3)
+        assert excinfo.value.status_code == 413
+    finally:
+        raw.close()
+        await raw.wait_closed()
+        await http.close_http()
+
+
+async def test_stalled_body_times_out(server):
+    with pytest.raises(UrlDownloadError) as excinfo:
+        await download_to_tempfile(str(server.make_url("/stalled.csv")))
+    assert excinfo.value.status_code == 504
+
+
+async def test_refused_connection_is_a_bad_gateway():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    try:
+        with pytest.raises(UrlDownloadError) as excinfo:
+            await download_to_tempfile(f"http://127.0.0.1:{port}/data.csv")
+        assert excinfo.value.status_code == 502
+    finally:
+        await http.close_http()
+
+
+async def test_error_status_is_reported(server):
+    with pytest.raises(UrlDownloadError) as excinfo:
+        await download_to_tempfile(str(server.make_url("/missing.csv")))
+    assert "HTTP 404" in excinfo.value.message